@@ -2,32 +2,240 @@
 """
 Skill Packager - Creates a distributable .skill file of a skill folder
 
+Files are compressed in parallel and written in sorted order with fixed
+timestamps and permissions, so packaging the same folder twice gives
+byte-identical .skill files.
+
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--quiet] [--workers N]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+    python utils/package_skill.py skills/public/my-skill ./dist --quiet
 """
 
+import argparse
+import os
+import shutil
+import struct
 import sys
-import zipfile
+import tempfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from quick_validate import validate_skill
 
+# Already-compressed formats, stored as-is instead of deflated again
+STORED_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.pdf',
+    '.zip', '.skill', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.zst',
+    '.mp3', '.mp4', '.woff', '.woff2',
+}
+
+# Every entry gets this timestamp (the earliest a zip can hold) unless
+# SOURCE_DATE_EPOCH is set, as in other reproducible builds
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+# Files are read and deflated this many bytes at a time; deflated data up to
+# SPOOL_SIZE per file stays in memory, larger output goes to a temporary file
+CHUNK_SIZE = 1024 * 1024
+SPOOL_SIZE = 4 * 1024 * 1024
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+ZIP_MAX = 0xFFFFFFFF
+
+
+def _zip_timestamp():
+    """DOS (time, date) fields for every entry."""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        year, month, day, hour, minute, second = time.gmtime(int(epoch))[:6]
+        if year < 1980:
+            year, month, day, hour, minute, second = ZIP_EPOCH
+    else:
+        year, month, day, hour, minute, second = ZIP_EPOCH
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+def _collect_files(skill_path):
+    """(arcname, path) of every file under skill_path, sorted by arcname."""
+    files = []
+    for root, dirs, names in os.walk(skill_path):
+        dirs.sort()
+        for name in names:
+            path = Path(root) / name
+            if path.is_file():
+                files.append((path.relative_to(skill_path.parent).as_posix(), path))
+    files.sort()
+    return files
+
+
+def _compress(path):
+    """
+    Read and compress one file in CHUNK_SIZE pieces.
+
+    Deflated data goes to a spooled temporary file that stays in memory for
+    small files and moves to disk for large ones, so no file is ever held
+    whole. Files that are already compressed, or that do not shrink when
+    deflated, are stored: only their CRC is computed here, and their bytes
+    are copied from the source when the entry is written.
 
-def package_skill(skill_path, output_dir=None):
+    Returns:
+        (method, crc, size, spool or None, executable)
+    """
+    executable = os.access(path, os.X_OK)
+    crc = size = 0
+    deflate = path.suffix.lower() not in STORED_EXTENSIONS
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) if deflate else None
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            if spool is not None:
+                spool.write(compressor.compress(chunk))
+    if spool is not None:
+        spool.write(compressor.flush())
+        if spool.tell() < size:
+            spool.seek(0)
+            return ZIP_DEFLATED, crc, size, spool, executable
+        spool.close()
+    return ZIP_STORED, crc, size, None, executable
+
+
+def _copy_stored(path, size, out):
+    """Copy a stored file into the archive, checking it did not change since its CRC was taken."""
+    with open(path, 'rb') as f:
+        remaining = size
+        while remaining:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            out.write(chunk)
+            remaining -= len(chunk)
+        if remaining or f.read(1):
+            raise ValueError(f"{path} changed while it was being packaged")
+
+
+def _release_spool(future):
+    """Close the spool of a compression whose entry will not be written."""
+    if not future.cancelled() and future.exception() is None and future.result()[3] is not None:
+        future.result()[3].close()
+
+
+def write_archive(files, destination, workers=None, on_entry=None):
+    """
+    Write files into a zip archive deterministically.
+
+    Entries are compressed by a thread pool (zlib releases the GIL) and
+    written in the order given as soon as each is ready. Files are read and
+    compressed in chunks, and at most two per worker are in flight, so
+    memory stays bounded whatever the file sizes. Every entry gets the same
+    timestamp, 0644 permissions (0755 if executable) and no extra fields.
+
+    Args:
+        files: (arcname, path) pairs, in archive order
+        destination: Path of the archive to write
+        workers: Compression threads (defaults to the CPU count)
+        on_entry: Optional callback(arcname, method, size, compressed_size)
+
+    Returns:
+        (total size, total compressed size) of the entries
+
+    Raises:
+        ValueError: For more than 65535 files or more than 4 GiB, which need ZIP64
+    """
+    if len(files) > 0xFFFF:
+        raise ValueError(f"{len(files)} files: archives over 65535 entries are not supported")
+    workers = workers or os.cpu_count() or 1
+    dos_time, dos_date = _zip_timestamp()
+    central = []
+    offset = total = compressed = 0
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    queue = iter(files)
+
+    def submit():
+        entry = next(queue, None)
+        if entry is not None:
+            pending.append((entry[0], entry[1], pool.submit(_compress, entry[1])))
+
+    try:
+        with open(destination, 'wb') as out:
+            for _ in range(workers * 2):
+                submit()
+            while pending:
+                arcname, path, future = pending.popleft()
+                submit()
+                method, crc, size, spool, executable = future.result()
+                try:
+                    length = spool.seek(0, os.SEEK_END) if spool is not None else size
+                    if offset > ZIP_MAX or size > ZIP_MAX or length > ZIP_MAX:
+                        raise ValueError(f"{arcname}: archives over 4 GiB are not supported")
+
+                    name = arcname.encode('utf-8')
+                    # Bit 11: the name is UTF-8
+                    flags = 0x800 if not name.isascii() else 0
+                    fields = struct.pack('<HHHHHIIIHH', 20, flags, method, dos_time, dos_date,
+                                         crc, length, size, len(name), 0)
+                    out.write(b'PK\x03\x04' + fields + name)
+                    if spool is not None:
+                        spool.seek(0)
+                        shutil.copyfileobj(spool, out, CHUNK_SIZE)
+                    else:
+                        _copy_stored(path, size, out)
+                finally:
+                    if spool is not None:
+                        spool.close()
+
+                mode = 0o100755 if executable else 0o100644
+                central.append(b'PK\x01\x02' + struct.pack('<H', (3 << 8) | 20) + fields
+                               + struct.pack('<HHHII', 0, 0, 0, mode << 16, offset) + name)
+                offset += 30 + len(name) + length
+                total += size
+                compressed += length
+                if on_entry:
+                    on_entry(arcname, method, size, length)
+
+            if offset > ZIP_MAX:
+                raise ValueError("archives over 4 GiB are not supported")
+            directory = b''.join(central)
+            out.write(directory)
+            out.write(b'PK\x05\x06' + struct.pack('<HHHHIIH', 0, 0, len(central), len(central),
+                                                  len(directory), offset, 0))
+    finally:
+        # Nothing is pending unless an error stopped the loop. Then queued
+        # compressions are dropped and running ones release their spools when
+        # they finish, so the error propagates without waiting for them
+        pool.shutdown(wait=False, cancel_futures=True)
+        for _, _, future in pending:
+            future.add_done_callback(_release_spool)
+    return total, compressed
+
+
+def package_skill(skill_path, output_dir=None, quiet=False, workers=None):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        quiet: Only print errors
+        workers: Compression threads (defaults to the CPU count)
 
     Returns:
         Path to the created .skill file, or None if error
     """
     skill_path = Path(skill_path).resolve()
+    log = (lambda *args: None) if quiet else print
 
     # Validate skill folder exists
     if not skill_path.exists():
@@ -45,13 +253,13 @@ def package_skill(skill_path, output_dir=None):
         return None
 
     # Run validation before packaging
-    print("🔍 Validating skill...")
+    log("🔍 Validating skill...")
     valid, message = validate_skill(skill_path)
     if not valid:
         print(f"❌ Validation failed: {message}")
         print("   Please fix the validation errors before packaging.")
         return None
-    print(f"✅ {message}\n")
+    log(f"✅ {message}\n")
 
     # Determine output location
     skill_name = skill_path.name
@@ -63,42 +271,52 @@ def package_skill(skill_path, output_dir=None):
 
     skill_filename = output_path / f"{skill_name}.skill"
 
-    # Create the .skill file (zip format)
+    def added(arcname, method, size, compressed_size):
+        how = "stored" if method == ZIP_STORED else f"{compressed_size * 100 // max(size, 1)}%"
+        log(f"  Added: {arcname} ({how})")
+
+    # Create the .skill file (zip format), replacing any previous one only once it is complete
+    temp_path = None
     try:
-        with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
-
-        print(f"\n✅ Successfully packaged skill to: {skill_filename}")
+        files = [(arcname, path) for arcname, path in _collect_files(skill_path) if path != skill_filename]
+        with tempfile.NamedTemporaryFile(dir=output_path, prefix=f".{skill_name}.", suffix=".skill",
+                                         delete=False) as temp:
+            temp_path = temp.name
+        total, compressed = write_archive(files, temp_path, workers, added)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, skill_filename)
+
+        log(f"\n✅ Successfully packaged skill to: {skill_filename}")
+        log(f"   {len(files)} files, {total:,} bytes -> {compressed:,} bytes")
         return skill_filename
 
     except Exception as e:
+        if temp_path and os.path.exists(temp_path):
+            os.unlink(temp_path)
         print(f"❌ Error creating .skill file: {e}")
         return None
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        usage="python utils/package_skill.py <path/to/skill-folder> [output-directory] [--quiet] [--workers N]",
+        epilog="Example:\n  python utils/package_skill.py skills/public/my-skill\n"
+               "  python utils/package_skill.py skills/public/my-skill ./dist",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("skill_path", help="Skill folder containing SKILL.md")
+    parser.add_argument("output_dir", nargs="?", help="Directory for the .skill file (default: current directory)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print errors")
+    parser.add_argument("--workers", type=int, help="Compression threads (default: CPU count)")
+    args = parser.parse_args()
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
-
-    print(f"📦 Packaging skill: {skill_path}")
-    if output_dir:
-        print(f"   Output directory: {output_dir}")
-    print()
+    if not args.quiet:
+        print(f"📦 Packaging skill: {args.skill_path}")
+        if args.output_dir:
+            print(f"   Output directory: {args.output_dir}")
+        print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(args.skill_path, args.output_dir, quiet=args.quiet, workers=args.workers)
 
     if result:
         sys.exit(0)
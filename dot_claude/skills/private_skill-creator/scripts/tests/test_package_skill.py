@@ -0,0 +1,140 @@
+"""
+Tests for package_skill.py's deterministic zip writer.
+
+    python3 -m pytest tests
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import package_skill  # noqa: E402
+from package_skill import ZIP_DEFLATED, ZIP_STORED, write_archive  # noqa: E402
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "src"
+    (root / "scripts").mkdir(parents=True)
+    (root / "notes.md").write_text("notes\n" * 1000)
+    (root / "empty.txt").write_bytes(b"")
+    (root / "image.png").write_bytes(os.urandom(5000))
+    (root / "noise.bin").write_bytes(os.urandom(3000))
+    (root / "naïve.txt").write_text("utf-8 name")
+    run = root / "scripts" / "run.sh"
+    run.write_text("#!/bin/sh\necho hi\n")
+    run.chmod(0o755)
+    return root
+
+
+def _files(root):
+    return sorted((p.relative_to(root).as_posix(), p) for p in root.rglob("*") if p.is_file())
+
+
+def _digest(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_archives_are_byte_identical(tree, tmp_path):
+    entries = []
+    write_archive(_files(tree), tmp_path / "a.zip", workers=1)
+    write_archive(_files(tree), tmp_path / "b.zip", workers=4,
+                  on_entry=lambda name, method, size, length: entries.append((name, method)))
+    assert _digest(tmp_path / "a.zip") == _digest(tmp_path / "b.zip")
+    assert [name for name, _ in entries] == [name for name, _ in _files(tree)]
+    methods = dict(entries)
+    assert methods["notes.md"] == ZIP_DEFLATED
+    assert methods["image.png"] == ZIP_STORED           # already compressed format
+    assert methods["noise.bin"] == ZIP_STORED           # deflate did not shrink it
+
+
+def test_entries_round_trip_with_fixed_metadata(tree, tmp_path):
+    write_archive(_files(tree), tmp_path / "a.zip")
+    with zipfile.ZipFile(tmp_path / "a.zip") as archive:
+        assert archive.testzip() is None
+        for info in archive.infolist():
+            assert info.date_time == (1980, 1, 1, 0, 0, 0)
+            assert archive.read(info) == (tree / info.filename).read_bytes()
+        mode = lambda name: archive.getinfo(name).external_attr >> 16
+        assert mode("scripts/run.sh") == 0o100755
+        assert mode("notes.md") == 0o100644
+
+
+def test_source_date_epoch(tree, tmp_path, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    write_archive(_files(tree), tmp_path / "a.zip")
+    with zipfile.ZipFile(tmp_path / "a.zip") as archive:
+        assert archive.getinfo("notes.md").date_time == (2023, 11, 14, 22, 13, 20)
+
+
+def test_large_files_are_streamed_in_chunks(tmp_path, monkeypatch):
+    # Small chunks and spool so both files span many chunks and the spool spills to disk
+    monkeypatch.setattr(package_skill, "CHUNK_SIZE", 4096)
+    monkeypatch.setattr(package_skill, "SPOOL_SIZE", 8192)
+    text = tmp_path / "big.txt"
+    text.write_bytes(b"".join(b"line %d\n" % i for i in range(100000)))
+    noise = tmp_path / "big.bin"
+    noise.write_bytes(os.urandom(100000))
+    files = [("big.bin", noise), ("big.txt", text)]
+    total, compressed = write_archive(files, tmp_path / "a.zip", workers=2)
+    assert total == text.stat().st_size + noise.stat().st_size
+    assert compressed < total
+    with zipfile.ZipFile(tmp_path / "a.zip") as archive:
+        assert archive.read("big.txt") == text.read_bytes()
+        assert archive.read("big.bin") == noise.read_bytes()
+
+
+def test_too_many_entries_fail_before_compressing(tmp_path, monkeypatch):
+    def compress(path):
+        raise AssertionError("compressed a file")
+    monkeypatch.setattr(package_skill, "_compress", compress)
+    files = [(f"f{i}", tmp_path / "missing") for i in range(0x10000)]
+    with pytest.raises(ValueError, match="65535"):
+        write_archive(files, tmp_path / "a.zip")
+    assert not (tmp_path / "a.zip").exists()
+
+
+def test_error_does_not_wait_for_running_compressions(tmp_path, monkeypatch):
+    release = threading.Event()
+    entered, spools = [], []
+
+    def compress(path):
+        if path.name == "f0":
+            raise OSError("unreadable")
+        entered.append(path)
+        release.wait(10)
+        spools.append(tempfile.SpooledTemporaryFile())
+        return ZIP_DEFLATED, 0, 1, spools[-1], False
+    monkeypatch.setattr(package_skill, "_compress", compress)
+    files = [(f"f{i}", tmp_path / f"f{i}") for i in range(8)]
+
+    started = time.monotonic()
+    with pytest.raises(OSError, match="unreadable"):
+        write_archive(files, tmp_path / "a.zip", workers=2)
+    assert time.monotonic() - started < 5
+    # Queued compressions were cancelled; the running ones close their spools when they finish
+    release.set()
+    deadline = time.monotonic() + 5
+    while (len(spools) < len(entered) or not all(spool.closed for spool in spools)) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert 1 <= len(spools) == len(entered) <= 2 and all(spool.closed for spool in spools)
+
+
+def test_package_skill_is_reproducible(tree, tmp_path):
+    pytest.importorskip("yaml")                         # quick_validate parses the frontmatter
+    skill = tmp_path / "my-skill"
+    tree.rename(skill)
+    (skill / "SKILL.md").write_text("---\nname: my-skill\ndescription: A test skill\n---\n\n# My Skill\n")
+    first = package_skill.package_skill(str(skill), str(tmp_path / "a"), quiet=True)
+    second = package_skill.package_skill(str(skill), str(tmp_path / "b"), quiet=True, workers=1)
+    assert first and second
+    assert _digest(first) == _digest(second)
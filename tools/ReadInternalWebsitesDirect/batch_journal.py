@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+"""
+batch_journal.py
+
+Checkpoint journal for resumable read_internal_website.py batch runs.
+
+Every completed URL is appended to the journal as one short line:
+
+    ok<TAB>normalized-url<TAB>offset
+    err<TAB>normalized-url<TAB>offset
+
+The result JSON goes to a separate file next to the journal (JOURNAL.results),
+one line per result starting at that byte offset. A restarted run scans only
+the journal to find which URLs are already done, so the scan stays cheap for
+journals with 100k+ pages however large the pages are; results are read back
+by offset only for the entries that are actually needed. A result is written
+before its journal line, and a journal line left half-written by a crash is
+ignored, and cut off before the next run appends.
+
+Usage:
+    from batch_journal import BatchJournal
+
+    with BatchJournal("run.journal") as journal:
+        done = journal.scan()            # {normalized url: succeeded}
+        for url in urls:
+            if not done.get(key(url)):
+                journal.append(key(url), fetch(url))
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+STATUS_OK = b"ok"
+STATUS_ERROR = b"err"
+RESULTS_SUFFIX = ".results"
+
+
+class BatchJournal:
+    """
+    Append-only journal of completed batch results.
+
+    Args:
+        path (str): Journal file; created if missing, with the results in
+            path + ".results"
+        fsync_interval (float): fsync at most every N seconds (default: 5)
+    """
+
+    def __init__(self, path: str, fsync_interval: float = 5.0):
+        self.path = path
+        self.results_path = path + RESULTS_SUFFIX
+        self.fsync_interval = fsync_interval
+        self._file = None
+        self._results = None
+        self._last_sync = time.monotonic()
+
+    def scan(self) -> Dict[str, bool]:
+        """
+        Find URLs already recorded in the journal.
+
+        Returns:
+            Dict[str, bool]: Normalized URL -> whether its latest entry succeeded
+        """
+        return {key.decode("utf-8"): status == STATUS_OK for key, (status, _) in self._entries().items()}
+
+    def _entries(self) -> Dict[bytes, Tuple[bytes, List[int]]]:
+        """Normalized URL -> (latest status, offsets of all its results, oldest first)."""
+        entries: Dict[bytes, Tuple[bytes, List[int]]] = {}
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write from a crashed run
+                fields = line[:-1].split(b"\t")
+                if len(fields) != 3 or fields[0] not in (STATUS_OK, STATUS_ERROR) or not fields[2].isdigit():
+                    continue
+                offsets = entries[fields[1]][1] if fields[1] in entries else []
+                offsets.append(int(fields[2]))
+                entries[fields[1]] = (fields[0], offsets)
+        return entries
+
+    def load_results(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Decode the latest recorded result for the given URLs.
+
+        Args:
+            keys (Iterable[str]): Normalized URLs to load
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Normalized URL -> result dict; URLs
+                whose results cannot be read are left out
+        """
+        wanted = {key.encode("utf-8") for key in keys}
+        results: Dict[str, Dict[str, Any]] = {}
+        if not wanted or not os.path.exists(self.results_path):
+            return results
+        entries = self._entries()
+        with open(self.results_path, "rb") as f:
+            for key in wanted:
+                # Latest record that decodes; a damaged one never hides an earlier good one
+                for offset in reversed(entries.get(key, (b"", []))[1]):
+                    f.seek(offset)
+                    body = f.readline()
+                    try:
+                        if body.endswith(b"\n"):
+                            results[key.decode("utf-8")] = json.loads(body)
+                            break
+                    except ValueError:
+                        continue
+        return results
+
+    def append(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Record a completed URL.
+
+        Args:
+            key (str): Normalized URL (must not contain tabs or newlines)
+            result (dict): Result from read_internal_website()
+        """
+        if self._file is None:
+            self._open()
+        status = STATUS_OK if result.get("success") else STATUS_ERROR
+        offset = self._results.tell()
+        # json.dumps escapes control characters, so the result stays on one line
+        self._results.write(json.dumps(result).encode("utf-8") + b"\n")
+        self._results.flush()
+        self._file.write(status + b"\t" + key.encode("utf-8") + b"\t" + str(offset).encode("ascii") + b"\n")
+        self._file.flush()
+        if time.monotonic() - self._last_sync >= self.fsync_interval:
+            # Results first, so a synced journal line never points past them
+            os.fsync(self._results.fileno())
+            os.fsync(self._file.fileno())
+            self._last_sync = time.monotonic()
+
+    def _open(self) -> None:
+        # Drop a record torn by a crash: terminating it instead would make it
+        # look complete to the next scan()
+        cut_torn_line(self.path)
+        self._results = open(self.results_path, "ab")
+        self._file = open(self.path, "ab")
+
+    def close(self) -> None:
+        """Flush, fsync and close the journal and its results."""
+        if self._results is not None:
+            self._results.flush()
+            os.fsync(self._results.fileno())
+            self._results.close()
+            self._results = None
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "BatchJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def cut_torn_line(path: str) -> None:
+    """Truncate a file after its last newline, dropping a line left half-written by a crash."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        keep = end
+        while keep > 0:
+            start = max(0, keep - 65536)
+            f.seek(start)
+            newline = f.read(keep - start).rfind(b"\n")
+            if newline != -1:
+                keep = start + newline + 1
+                break
+            keep = start
+        if keep < end:
+            f.truncate(keep)
@@ -0,0 +1,936 @@
+#!/usr/bin/env python3
+
+"""
+benchmark.py
+
+Benchmarks for read_internal_website.py against fake_builder_mcp.py, so the
+numbers do not depend on the real builder-mcp or the network.
+
+Each scenario runs in a fresh interpreter, so its peak RSS is its own. With
+--json the reports are saved together with the Python version and options,
+and --compare prints how every number changed against an earlier file.
+
+Usage:
+    python3 benchmark.py                       # run every scenario
+    python3 benchmark.py concurrency           # run one scenario
+    python3 benchmark.py concurrency --urls 64 --latency-ms 100
+    python3 benchmark.py single sequential concurrent --latency-ms lognormal:100:0.5
+    python3 benchmark.py concurrent --content-mix markdown=3,json=1 --errors mcp-error=0.05,hang=0.01
+    python3 benchmark.py parse --payload-kb 8192
+    python3 benchmark.py table --payload-kb 16384
+    python3 benchmark.py index --payload-kb 1024
+    python3 benchmark.py refresh --payload-kb 1024
+    python3 benchmark.py columnar --payload-kb 1024
+    python3 benchmark.py team --urls 40 --latency-ms lognormal:300:0.3
+    python3 benchmark.py overhead --repeat 20
+    python3 benchmark.py truncate --payload-kb 16384 --max-bytes 1048576
+    python3 benchmark.py --json after.json --compare before.json
+    python3 benchmark.py decode --payload-kb 8192
+    python3 benchmark.py detect --corpus ~/saved-pages
+    python3 benchmark.py extract --payload-kb 8192
+    python3 benchmark.py dispatch --extractors 500
+"""
+
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import re
+import resource
+import shlex
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+HERE = Path(__file__).resolve().parent
+FAKE_SERVER = HERE / "fake_builder_mcp.py"
+
+
+def load_client():
+    """
+    Import read_internal_website.py from this directory.
+
+    The module is stored as executable_read_internal_website.py in the
+    dotfiles source tree and as read_internal_website.py once installed.
+    """
+    for name in ("read_internal_website.py", "executable_read_internal_website.py"):
+        path = HERE / name
+        if path.exists():
+            sys.path.insert(0, str(HERE))
+            spec = importlib.util.spec_from_file_location("read_internal_website", path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules["read_internal_website"] = module
+            spec.loader.exec_module(module)
+            return module
+    raise SystemExit("read_internal_website.py not found next to benchmark.py")
+
+
+def use_fake_server(latency_ms: str, page_kb: float = 0, content_mix: str = "", errors: str = "",
+                    seed: int = 0) -> None:
+    """
+    Point the client at fake_builder_mcp.py.
+
+    Args:
+        latency_ms (str): Latency spec: "100", "50:200" or "lognormal:100:0.5"
+        page_kb (float): Size of every page (default: a small page)
+        content_mix (str): Page kinds, e.g. "markdown=3,json=1" (default: markdown)
+        errors (str): Injected failures, e.g. "mcp-error=0.05" (default: none)
+        seed (int): Seed for the server's choices
+    """
+    os.environ["BUILDER_MCP_COMMAND"] = f"{shlex.quote(sys.executable)} {shlex.quote(str(FAKE_SERVER))}"
+    os.environ["FAKE_MCP_LATENCY_MS"] = str(latency_ms)
+    os.environ["FAKE_MCP_PAYLOAD_KB"] = str(page_kb)
+    os.environ["FAKE_MCP_CONTENT_MIX"] = content_mix
+    os.environ["FAKE_MCP_ERRORS"] = errors
+    os.environ["FAKE_MCP_SEED"] = str(seed)
+
+
+def _use_suite_server(args) -> None:
+    use_fake_server(args.latency_ms, args.page_kb, args.content_mix, args.errors, args.seed)
+
+
+def _fetch_stats(metrics, seconds: float) -> Dict[str, Any]:
+    """Throughput, latency percentiles and outcomes of the fetches recorded in `metrics`."""
+    total = metrics.summary()["total"]
+    return {
+        "fetches": total["fetches"],
+        "seconds": round(seconds, 3),
+        "urls_per_s": round(total["fetches"] / seconds, 1) if seconds else None,
+        **{f"{q}_ms": total["latency_ms"].get(q) for q in ("p50", "p95", "p99")},
+        "failed": total["failed"],
+        "error_codes": total["error_codes"] or "none",
+    }
+
+
+def _suite_report(args, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"urls": args.urls, "latency_ms": args.latency_ms, "page_kb": args.page_kb,
+            "content_mix": args.content_mix or "markdown", "errors": args.errors or "none",
+            "runs": runs}
+
+
+def bench_single(args) -> Dict[str, Any]:
+    """read_internal_website() called once per URL, one after the other."""
+    client = load_client()
+    _use_suite_server(args)
+    metrics = client.enable_metrics()
+    start = time.perf_counter()
+    for i in range(args.urls):
+        client.read_internal_website(f"https://phonetool.amazon.com/users/user{i}", timeout=args.timeout)
+    return _suite_report(args, [{"transport": "process", **_fetch_stats(metrics, time.perf_counter() - start)}])
+
+
+def bench_sequential(args) -> Dict[str, Any]:
+    """read_internal_websites() with one worker, with and without a one-process session pool."""
+    client = load_client()
+    _use_suite_server(args)
+    urls = [f"https://code.amazon.com/packages/Pkg{i}" for i in range(args.urls)]
+    runs = []
+    for transport in ("process", "pool"):
+        pool = client.MCPSessionPool(size=1) if transport == "pool" else None
+        metrics = client.enable_metrics()
+        start = time.perf_counter()
+        client.read_internal_websites(urls, timeout=args.timeout, pool=pool)
+        runs.append({"transport": transport, **_fetch_stats(metrics, time.perf_counter() - start)})
+        if pool is not None:
+            pool.close()
+    return _suite_report(args, runs)
+
+
+def bench_concurrent(args) -> Dict[str, Any]:
+    """read_internal_websites() with --workers workers, per-process and through a session pool."""
+    client = load_client()
+    _use_suite_server(args)
+    urls = [f"https://w.amazon.com/bin/view/Page{i}" for i in range(args.urls)]
+    runs = []
+    for transport in ("process", "pool"):
+        pool = client.MCPSessionPool(size=args.workers) if transport == "pool" else None
+        metrics = client.enable_metrics()
+        start = time.perf_counter()
+        client.read_internal_websites(urls, timeout=args.timeout, pool=pool, max_workers=args.workers)
+        runs.append({"transport": transport, "max_workers": args.workers,
+                     **_fetch_stats(metrics, time.perf_counter() - start)})
+        if pool is not None:
+            pool.close()
+    return {**_suite_report(args, runs), "workers": args.workers}
+
+
+def bench_parse(args) -> Dict[str, Any]:
+    """
+    Fetching and parsing a large code review table (--payload-kb).
+
+    Times the fetch through the fake server and parse_cr_table() on the
+    result separately.
+    """
+    client = load_client()
+    import cr_parser
+    use_fake_server(0, args.payload_kb, "cr-table", seed=args.seed)
+    url = "https://code.amazon.com/reviews/to-user/someone"
+    fetch_times, parse_times, rows = [], [], []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = client.read_internal_website(url, timeout=max(args.timeout, 60))
+        fetched = time.perf_counter()
+        assert client.is_success(result), f"fake fetch failed: {result.get('error')}"
+        rows = cr_parser.parse_cr_table(result["content"])
+        fetch_times.append(fetched - start)
+        parse_times.append(time.perf_counter() - fetched)
+    parse_s = statistics.median(parse_times)
+    return {"payload_kb": args.payload_kb, "rows": len(rows), "runs": [{
+        "fetch_ms": round(statistics.median(fetch_times) * 1000, 3),
+        "parse_ms": round(parse_s * 1000, 3),
+        "rows_per_s": round(len(rows) / parse_s) if parse_s else None,
+        "mb_per_s": round(args.payload_kb / 1024 / parse_s, 1) if parse_s else None,
+    }]}
+
+
+def _legacy_parse_cr_table(content: str) -> list:
+    """parse_cr_table() before it was rebuilt on iter_cr_rows(), kept as a baseline."""
+    if not content or "|" not in content:
+        return []
+    headers, rows = [], []
+    for line in content.strip().split('\n'):
+        if line.startswith('|---'):
+            continue
+        if line.startswith('|'):
+            parts = [p.strip() for p in line.split('|')]
+            parts = parts[1:-1] if parts else []
+            if not headers:
+                headers = parts
+            elif parts and len(parts) >= len(headers):
+                row_dict = {}
+                for i, header in enumerate(headers):
+                    if i < len(parts):
+                        row_dict[header] = parts[i]
+                if 'ID' in row_dict:
+                    row_dict['URL'] = f"https://code.amazon.com/reviews/{row_dict['ID']}"
+                rows.append(row_dict)
+    return rows
+
+
+def _cr_listing(payload_kb: int) -> str:
+    """A code review listing of about payload_kb, with 40 approvers named eng00-eng39."""
+    row = "| CR-{0} | user{1} | Change number {0} with a longer summary | Open | __ eng{2:02d}, eng{3:02d} |\n"
+    lines = ["| ID | Author | Summary | Status | Approved by |\n", "|---|---|---|---|---|\n"]
+    size = sum(map(len, lines))
+    while size < payload_kb * 1024:
+        lines.append(row.format(len(lines), len(lines) % 97, len(lines) % 40, len(lines) % 37))
+        size += len(lines[-1])
+    return "".join(lines)
+
+
+def bench_table(args) -> Dict[str, Any]:
+    """
+    Parsing a --payload-kb code review listing: legacy parser vs iter_cr_rows().
+
+    Times building the full list of dicts and of compact CRRows, and streaming
+    compact rows from the page (with and without reading a field, which
+    splits the row) and from a file. Peak memory includes the parsed rows,
+    not the page.
+    """
+    load_client()
+    import cr_parser
+    page = _cr_listing(args.payload_kb)
+    legacy_rows = _legacy_parse_cr_table(page)
+    assert cr_parser.parse_cr_table(page) == legacy_rows == cr_parser.parse_cr_table(page, compact=True)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".md", delete=False) as f:
+        f.write(page)
+
+    def stream_file():
+        with open(f.name) as lines:
+            return sum(1 for _ in cr_parser.iter_cr_rows(lines, compact=True))
+
+    try:
+        legacy = _measure(lambda: _legacy_parse_cr_table(page), args.repeat)
+        runs = [{"parser": "legacy parse_cr_table", **legacy, "speedup": 1.0}]
+        for parser, fn in (("parse_cr_table", lambda: cr_parser.parse_cr_table(page)),
+                           ("parse_cr_table compact", lambda: cr_parser.parse_cr_table(page, compact=True)),
+                           ("iter_cr_rows compact, not kept",
+                            lambda: sum(1 for _ in cr_parser.iter_cr_rows(page, compact=True))),
+                           ("iter_cr_rows compact, Status read", lambda: sum(
+                               1 for cr in cr_parser.iter_cr_rows(page, compact=True) if cr["Status"] == "Open")),
+                           ("iter_cr_rows file, not kept", stream_file)):
+            measured = _measure(fn, args.repeat)
+            runs.append({"parser": parser, **measured, "speedup": round(legacy["ms"] / measured["ms"], 2)})
+    finally:
+        os.unlink(f.name)
+    return {"payload_kb": args.payload_kb, "rows": len(legacy_rows), "runs": runs}
+
+
+def bench_index(args) -> Dict[str, Any]:
+    """
+    Pending approvals for 40 users over a --payload-kb listing.
+
+    Compares count_pending_approvals() per user with building a CRIndex and
+    asking pending_counts(), and with asking an index that already exists.
+    """
+    load_client()
+    import cr_parser
+    crs = cr_parser.parse_cr_table(_cr_listing(args.payload_kb), compact=True)
+    users = [f"eng{i:02d}" for i in range(40)]
+    index = cr_parser.CRIndex(crs)
+    expected = {user: cr_parser.count_pending_approvals(crs, user) for user in users}
+    assert index.pending_counts(users) == expected
+
+    legacy = _measure(lambda: {user: cr_parser.count_pending_approvals(crs, user) for user in users}, args.repeat)
+    runs = [{"query": "count_pending_approvals per user", **legacy, "speedup": 1.0}]
+    for query, fn in (("CRIndex build + pending_counts", lambda: cr_parser.CRIndex(crs).pending_counts(users)),
+                      ("pending_counts on a built index", lambda: index.pending_counts(users))):
+        measured = _measure(fn, args.repeat)
+        runs.append({"query": query, **measured, "speedup": round(legacy["ms"] / max(measured["ms"], 0.001), 1)})
+    return {"payload_kb": args.payload_kb, "crs": len(crs), "users": len(users), "runs": runs}
+
+
+def bench_refresh(args) -> Dict[str, Any]:
+    """
+    One poll of a --payload-kb listing: re-parsing it vs CRTracker.update().
+
+    The tracker is timed on its first poll, on polls of the same page, on
+    polls where only text outside the table changed and on polls alternating
+    between two versions that differ in one row.
+    """
+    load_client()
+    import cr_parser
+    page = _cr_listing(args.payload_kb)
+    target = page.index("| CR-100 |")
+    changed = page[:target] + page[target:].replace("| Open |", "| Merged |", 1)
+    crs = cr_parser.parse_cr_table(page)
+
+    tracker = cr_parser.CRTracker(index=cr_parser.CRIndex())
+    tracker.update(page)
+    assert tracker.update(changed)["changed"] == {"CR-100": {"Status": ("Open", "Merged")}}
+    versions = [page, changed]
+
+    def alternate():
+        versions.reverse()
+        return tracker.update(versions[0])
+
+    legacy = _measure(lambda: cr_parser.parse_cr_table(page), args.repeat)
+    runs = [{"poll": "parse_cr_table", **legacy, "speedup": 1.0}]
+    for poll, fn in (("CRTracker first poll", lambda: cr_parser.CRTracker().update(page)),
+                     # Fresh strings, as every fetch returns
+                     ("CRTracker identical page", lambda: tracker.update(page[:1] + page[1:])),
+                     ("CRTracker unchanged rows, other page text",
+                      lambda: tracker.update(f"{page}\nPolled at {time.perf_counter()}")),
+                     ("CRTracker one row changed", alternate)):
+        measured = _measure(fn, args.repeat)
+        runs.append({"poll": poll, **measured, "speedup": round(legacy["ms"] / measured["ms"], 1)})
+    return {"payload_kb": args.payload_kb, "crs": len(crs), "runs": runs}
+
+
+def bench_columnar(args) -> Dict[str, Any]:
+    """
+    Keeping 8 polls of a --payload-kb listing: CR dicts vs CRColumns.
+
+    Times parsing the polls into a list of dicts tagged with the poll, and
+    into CRColumns, then exporting each: the dicts with one json.dumps per
+    row, the columns as NDJSON, CSV and (with pyarrow) Parquet. Peak memory
+    of the parse steps is the memory the stored rows take.
+    """
+    load_client()
+    import cr_columnar
+    import cr_parser
+    polls = [(f"poll-{i}", _cr_listing(args.payload_kb)) for i in range(8)]
+
+    def parse_dicts():
+        return [dict(cr, snapshot=label) for label, page in polls for cr in cr_parser.iter_cr_rows(page)]
+
+    def parse_columns():
+        columns = cr_columnar.CRColumns()
+        for label, page in polls:
+            columns.extend_table(page, snapshot=label)
+        return columns
+
+    crs, columns = parse_dicts(), parse_columns()
+    assert len(crs) == len(columns) and next(columns.rows()) == {"snapshot": "poll-0", **crs[0]}
+    out = tempfile.mkdtemp()
+
+    def write_dicts():
+        with open(os.path.join(out, "dicts.ndjson"), "w", encoding="utf-8") as f:
+            for cr in crs:
+                f.write(json.dumps(cr) + "\n")
+
+    steps = [("parse: list of dicts", parse_dicts), ("parse: CRColumns", parse_columns),
+             ("export: dicts, json.dumps per row", write_dicts),
+             ("export: CRColumns ndjson", lambda: columns.write(os.path.join(out, "columns.ndjson"))),
+             ("export: CRColumns csv", lambda: columns.write(os.path.join(out, "columns.csv")))]
+    if cr_columnar.arrow_available():
+        steps.append(("export: CRColumns parquet", lambda: columns.write(os.path.join(out, "columns.parquet"))))
+    runs = []
+    try:
+        for step, fn in steps:
+            runs.append({"step": step, **_measure(fn, args.repeat)})
+        files = {name: round(os.path.getsize(os.path.join(out, name)) / 1024, 1) for name in sorted(os.listdir(out))}
+    finally:
+        for name in os.listdir(out):
+            os.unlink(os.path.join(out, name))
+        os.rmdir(out)
+    return {"payload_kb": args.payload_kb, "polls": len(polls), "rows": len(crs),
+            "pyarrow": cr_columnar.arrow_available(), "file_kib": files, "runs": runs}
+
+
+def bench_team(args) -> Dict[str, Any]:
+    """
+    A team review view of --urls users: a loop over users vs fetch_team_reviews().
+
+    The loop fetches each user's list, parses it and merges CRs by ID by hand,
+    as callers did before. Both are compared with the slowest single fetch.
+    """
+    client = load_client()
+    import cr_parser
+    use_fake_server(args.latency_ms, args.page_kb, "cr-table", seed=args.seed)
+    users = [f"user{i}" for i in range(args.urls)]
+
+    start = time.perf_counter()
+    merged: Dict[str, Dict[str, Any]] = {}
+    for user in users:
+        result = client.read_internal_website(cr_parser.review_list_url(user), timeout=args.timeout)
+        for cr in cr_parser.parse_cr_table(result.get("content") or ""):
+            merged.setdefault(cr["ID"], dict(cr, users=[]))["users"].append(user)
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    team = client.fetch_team_reviews(users, timeout=args.timeout)
+    team_s = time.perf_counter() - start
+    assert not team["errors"] and [cr["ID"] for cr in team["crs"]] == list(merged)
+
+    slowest = max(result["metadata"]["fetch_duration_ms"]
+                  for result in client.read_internal_websites([cr_parser.review_list_url(user) for user in users],
+                                                              timeout=args.timeout, max_workers=len(users)))
+    return {"users": len(users), "crs": len(team["crs"]), "slowest_fetch_ms": slowest, "runs": [
+        {"pipeline": "loop over users", "ms": round(loop_s * 1000, 1)},
+        {"pipeline": "fetch_team_reviews", "ms": round(team_s * 1000, 1)},
+    ]}
+
+
+def bench_concurrency(args) -> Dict[str, Any]:
+    """
+    Batch wall time for increasing max_workers; speedup should track workers.
+
+    Runs once with a fresh builder-mcp process per URL and once with a session
+    pool sized to the worker count.
+    """
+    client = load_client()
+    use_fake_server(args.latency_ms)
+    urls = [f"https://phonetool.amazon.com/users/user{i}" for i in range(args.urls)]
+
+    runs = []
+    for transport in ("process", "pool"):
+        baseline = None
+        for workers in (1, 2, 4, 8, 16):
+            pool = client.MCPSessionPool(size=workers) if transport == "pool" else None
+            if pool is not None:
+                # Start the workers up front so only fetches are timed
+                client.read_internal_websites(urls[:workers], max_workers=workers, pool=pool)
+            start = time.perf_counter()
+            results = client.read_internal_websites(urls, max_workers=workers, pool=pool)
+            elapsed = time.perf_counter() - start
+            if pool is not None:
+                pool.close()
+            assert all(client.is_success(r) for r in results), "fake fetch failed"
+            baseline = baseline or elapsed
+            runs.append({
+                "transport": transport,
+                "max_workers": workers,
+                "seconds": round(elapsed, 3),
+                "speedup": round(baseline / elapsed, 2)
+            })
+    return {"urls": args.urls, "latency_ms": args.latency_ms, "runs": runs}
+
+
+def _legacy_run_builder_mcp(request: Dict[str, Any], timeout: float) -> Any:
+    """The one-shot transport before builder-mcp was exec'd directly, kept as a baseline."""
+    import subprocess
+    command = " ".join(shlex.quote(arg) for arg in shlex.split(os.environ["BUILDER_MCP_COMMAND"]))
+    cmd = f"echo '{json.dumps(request)}' | {command}"
+    result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=timeout)
+    return json.loads(result.stdout)
+
+
+def bench_overhead(args) -> Dict[str, Any]:
+    """
+    Cost of one fetch through a fresh builder-mcp process, legacy shell pipe vs direct exec.
+
+    The fake server answers immediately, so the time is process start-up,
+    transport and decoding. Runs with `cat` standing in for builder-mcp (it
+    echoes the request, so only the spawn and pipe overhead is left), and
+    with the fake server for a small and a --payload-kb page; peak_mib is the
+    client's traced allocation for one call.
+    """
+    client = load_client()
+    codec = client.json_codec
+    request = client._build_request(["https://w.amazon.com/bin/view/Page"])
+    runs = []
+    for page_kb in ("cat", 0, args.payload_kb):
+        use_fake_server(0, page_kb if page_kb != "cat" else 0, seed=args.seed)
+        if page_kb == "cat":
+            os.environ["BUILDER_MCP_COMMAND"] = "cat"
+
+        def current():
+            return codec.loads(client._run_builder_mcp(request, 60).stdout)
+
+        legacy = _measure(lambda: _legacy_run_builder_mcp(request, 60), args.repeat)
+        measured = _measure(current, args.repeat)
+        page = "cat" if page_kb == "cat" else f"{page_kb} KiB" if page_kb else "small"
+        runs.append({"page": page, "transport": "shell pipe (legacy)", **legacy})
+        runs.append({"page": page, "transport": "exec", **measured,
+                     "saved_ms": round(legacy["ms"] - measured["ms"], 3)})
+    return {"repeat": args.repeat, "runs": runs}
+
+
+def bench_truncate(args) -> Dict[str, Any]:
+    """
+    Memory and time for --payload-kb pages, whole vs cut at --max-bytes.
+
+    Fetches one page, then --workers pages at once, through fresh processes
+    and through a session pool; peak_mib is the client's traced allocation.
+    """
+    client = load_client()
+    use_fake_server(0, args.payload_kb, seed=args.seed)
+    urls = [f"https://w.amazon.com/bin/view/Huge{i}" for i in range(args.workers)]
+    runs = []
+    for transport in ("process", "pool"):
+        if transport == "pool":
+            client.enable_session_pool(size=args.workers)
+        for limit in (None, args.max_bytes):
+            if limit is None:
+                client.disable_content_limit()
+            else:
+                client.enable_content_limit(limit)
+            single = client.read_internal_website(urls[0], timeout=60)
+            assert single["success"], single.get("error")
+            for label, fn in (("1 page", lambda: client.read_internal_website(urls[0], timeout=60)),
+                              (f"{args.workers} pages", lambda: client.read_internal_websites(
+                                  urls, timeout=60, max_workers=args.workers))):
+                runs.append({"transport": transport, "fetch": label, "max_bytes": limit or "none",
+                             **_measure(fn, args.repeat), "content_length": single["content_length"]})
+        client.disable_content_limit()
+        client.disable_session_pool()
+    return {"payload_kb": args.payload_kb, "repeat": args.repeat, "runs": runs}
+
+
+def _legacy_decode(raw: str) -> Dict[str, Any]:
+    """
+    The response pipeline before single-pass decoding, kept as a baseline.
+
+    The page is parsed by the extractor, again by content type detection and a
+    third time when it is stored; dict content is re-serialized for its length.
+    """
+    response = json.loads(raw)
+    content = None
+    for item in response["result"]["content"]:
+        try:
+            nested = json.loads(item["text"])
+        except json.JSONDecodeError:
+            content = item["text"]
+            break
+        if isinstance(nested, dict) and "processedContent" in nested:
+            content = nested
+            break
+        if isinstance(nested, dict) and "content" in nested:
+            content = nested["content"]
+            if isinstance(content, str):
+                content = re.sub(r'\[([^\]]+)\]\[\d+\]', r'\1', content)
+            break
+
+    if isinstance(content, dict):
+        return {"content": content, "content_type": "json", "content_length": len(json.dumps(content))}
+    content_type = "text"
+    if content.strip().startswith('{') or content.strip().startswith('['):
+        try:
+            json.loads(content)
+            content_type = "json"
+        except Exception:
+            pass
+    if content_type == "json":
+        return {"content": json.loads(content), "content_type": "json", "content_length": len(content)}
+    return {"content": content, "content_type": content_type, "content_length": len(content)}
+
+
+def _large_payloads(size_kb: int) -> Dict[str, str]:
+    """Raw builder-mcp output for large JSON pages, shaped like issues and builderhub responses."""
+    rows = []
+    while sum(len(r) for r in rows) < size_kb * 1024:
+        i = len(rows)
+        rows.append(json.dumps({"id": f"ISSUE-{i}", "title": f"Issue number {i} " * 4,
+                                "status": "Open", "tags": ["a", "b", "c"], "score": i * 1.5}))
+    page = "[" + ",".join(rows) + "]"
+
+    def wrap(text: str) -> str:
+        return json.dumps({"jsonrpc": "2.0", "id": 1,
+                           "result": {"content": [{"type": "text", "text": text}]}})
+
+    return {
+        "json-page": wrap(json.dumps({"url": "https://issues.amazon.com/", "content": page})),
+        "builderhub-dict": wrap(json.dumps({"processedContent": page, "sections": json.loads(page)[:2000]}))
+    }
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Median wall time and peak traced allocation of fn()."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms": round(statistics.median(times) * 1000, 3), "peak_mib": round(peak / 2 ** 20, 1)}
+
+
+def bench_decode(args) -> Dict[str, Any]:
+    """
+    CPU time and peak memory to turn one large builder-mcp response into a result.
+
+    Compares the legacy triple-parse pipeline with the current one under every
+    installed JSON backend, and with a lazy result that is only checked for
+    success.
+    """
+    client = load_client()
+    codec = client.json_codec
+    default_backend = codec.backend()
+    runs = []
+    for name, raw in _large_payloads(args.payload_kb).items():
+        legacy = _measure(lambda: _legacy_decode(raw), args.repeat)
+        runs.append({"payload": name, "pipeline": "legacy", "backend": "json", **legacy, "speedup": 1.0})
+
+        def current():
+            result = client._new_result("https://issues.amazon.com/")
+            client._populate_results([result], codec.loads(raw), time.time(), False, {})
+            return result
+
+        def lazy_status():
+            results = [client._new_result("https://issues.amazon.com/")]
+            client._populate_results(results, codec.loads(raw), time.time(), False, {}, lazy=True)
+            return client.is_success(results[0])
+
+        for backend in codec.available_backends():
+            codec.use_backend(backend)
+            for pipeline, fn in (("current", current), ("lazy, is_success only", lazy_status)):
+                measured = _measure(fn, args.repeat)
+                runs.append({"payload": name, "pipeline": pipeline, "backend": backend, **measured,
+                             "speedup": round(legacy["ms"] / measured["ms"], 2)})
+        codec.use_backend(default_backend)
+    return {"payload_kb": args.payload_kb, "repeat": args.repeat, "runs": runs}
+
+
+def bench_extract(args) -> Dict[str, Any]:
+    """
+    The extraction path (decode, link cleanup, type detection) on a large markdown page.
+
+    The page is full of reference-style links, as builder-mcp renders wiki
+    and code review pages. Compares the legacy pipeline with the current one
+    stripping links and resolving them to inline links.
+    """
+    client = load_client()
+    codec = client.json_codec
+    paragraph = "".join(f"See [page {i}][{i}] for details. " for i in range(1, 51))
+    definitions = "".join(f"[{i}]: https://w.amazon.com/bin/view/Page{i}\n" for i in range(1, 51))
+    page = "# Wiki export\n\n"
+    while len(page) < args.payload_kb * 1024:
+        page += paragraph + "\n\n"
+    page += definitions
+    raw = json.dumps({"jsonrpc": "2.0", "id": 1, "result": {"content": [
+        {"type": "text", "text": json.dumps({"url": "https://w.amazon.com/", "content": page})}]}})
+
+    def current(resolve: bool):
+        def run():
+            client.enable_link_resolution() if resolve else client.disable_link_resolution()
+            result = client._new_result("https://w.amazon.com/")
+            client._populate_results([result], codec.loads(raw), time.time(), False, {})
+            return result
+        return run
+
+    legacy = _measure(lambda: _legacy_decode(raw), args.repeat)
+    runs = [{"pipeline": "legacy", "links": "strip", **legacy, "speedup": 1.0}]
+    for links, fn in (("strip", current(False)), ("resolve", current(True))):
+        measured = _measure(fn, args.repeat)
+        runs.append({"pipeline": "current", "links": links, **measured,
+                     "speedup": round(legacy["ms"] / measured["ms"], 2)})
+    client.disable_link_resolution()
+    return {"payload_kb": args.payload_kb, "links": page.count("]["), "json_backend": codec.backend(), "runs": runs}
+
+
+def _legacy_detect_content_type(content: Any) -> str:
+    """detect_content_type() before bounded-window detection, kept as the accuracy reference."""
+    if isinstance(content, (dict, list)):
+        return "json"
+    if not content or not isinstance(content, str):
+        return "unknown"
+    if content.strip().startswith('{') or content.strip().startswith('['):
+        try:
+            json.loads(content)
+            return "json"
+        except Exception:
+            pass
+    if '<html' in content.lower() or '<!doctype' in content.lower():
+        return "html"
+    if '<div' in content or '<p>' in content or '<h1' in content:
+        return "html"
+    if '|---|' in content and content.count('|') > 10:
+        return "markdown"
+    if content.startswith('#') or '\n#' in content:
+        return "markdown"
+    return "text"
+
+
+def _detect_corpus(corpus_dir: str = None) -> Dict[str, Any]:
+    """Pages of every kind builder-mcp returns, plus any files from corpus_dir."""
+    table = "| ID | Title | Status |\n|---|---|---|\n" + "".join(
+        f"| CR-{i} | Change {i} | Open |\n" for i in range(20))
+    wiki = "# Team page\n\n" + "Some prose with a [link](https://w.amazon.com/x) in it.\n" * 20
+    rows = [{"id": i, "name": f"item {i}", "tags": ["a", "b"]} for i in range(50)]
+    corpus = {
+        "empty": "",
+        "dict": {"a": 1},
+        "list": [1, 2],
+        "json-object": json.dumps(rows[0]),
+        "json-array": json.dumps(rows),
+        "json-padded": "\n  " + json.dumps(rows) + "\n",
+        "json-empty-object": "{}",
+        "json-invalid": '{"a": 1,,}',
+        "markdown-link-first": "[Home](https://w.amazon.com/) > [Team](https://w.amazon.com/team)",
+        "bracket-note": "[draft] notes for the week [wip]",
+        "html-doctype": "<!DOCTYPE html><html><body><p>Hello</p></body></html>",
+        "html-upper": "<HTML><BODY>Hello</BODY></HTML>",
+        "html-fragment": "<div class='x'>content</div>",
+        "html-late-tag": "plain intro\n" * 30 + "<h1>Heading</h1>",
+        "markdown-table": table,
+        "markdown-table-few-pipes": "|---|\nnot much table here",
+        "markdown-header": wiki,
+        "markdown-late-header": "intro line\n" * 10 + "# Section\n",
+        "text": "Just a plain paragraph of text without any markup at all.",
+        "text-with-hash": "Issue #123 was fixed in build #45.",
+        "large-wiki-markdown": (wiki + table) * 20000,
+        "large-html": "<!doctype html><html><body>" + "<div>row</div>\n" * 500000 + "</body></html>",
+        "large-text": "lorem ipsum dolor sit amet " * 400000,
+        "large-json": json.dumps(rows * 20000),
+        "large-markdown-html-in-middle": wiki * 10000 + "<div>embedded</div>" + wiki * 10000,
+        "large-bracket-notes": "[1] meeting notes\n" + "- item\n" * 200000 + "[end of notes]",
+        "large-json-shaped-text": "[1, 2, 3" + ", 4 5" * 200000 + "]",
+    }
+    if corpus_dir:
+        for path in sorted(Path(corpus_dir).expanduser().iterdir()):
+            if path.is_file():
+                corpus[f"file:{path.name}"] = path.read_text(errors="replace")
+    return corpus
+
+
+def bench_detect(args) -> Dict[str, Any]:
+    """
+    Accuracy of detect_content_type() against the legacy implementation, and throughput.
+
+    Every corpus page is labelled by both; disagreements are listed. Pages
+    larger than 1 MB are also timed.
+    """
+    client = load_client()
+    corpus = _detect_corpus(args.corpus)
+    mismatches = []
+    runs = []
+    for name, page in corpus.items():
+        legacy, current = _legacy_detect_content_type(page), client.detect_content_type(page)
+        if legacy != current:
+            mismatches.append(f"{name}: legacy={legacy} current={current}")
+        if isinstance(page, str) and len(page) > 1_000_000:
+            mb = len(page) / 1_000_000
+            legacy_time = _measure(lambda: _legacy_detect_content_type(page), args.repeat)
+            current_time = _measure(lambda: client.detect_content_type(page), args.repeat)
+            runs.append({"page": name, "mb": round(mb, 1), "label": current,
+                         "legacy_mb_s": round(mb / legacy_time["ms"] * 1000),
+                         "current_mb_s": round(mb / current_time["ms"] * 1000) if current_time["ms"] else "inf",
+                         "legacy_peak_mib": legacy_time["peak_mib"], "current_peak_mib": current_time["peak_mib"]})
+    return {
+        "pages": len(corpus),
+        "agreement": f"{len(corpus) - len(mismatches)}/{len(corpus)}",
+        "mismatches": mismatches or "none",
+        "runs": runs
+    }
+
+
+def bench_dispatch(args) -> Dict[str, Any]:
+    """
+    Extractor lookup per URL, combined matcher vs a linear scan of patterns.
+
+    The registry holds the built-in extractors plus up to --extractors
+    synthetic per-host ones registered before them, so the built-ins are
+    tried first and the synthetic hosts and unmatched URLs are the slow cases.
+    """
+    load_client()
+    import extractors
+    urls = ["https://code.amazon.com/reviews/to-user/jdoe", "https://board.amazon.com/boards/B1",
+            "https://team-7.corp.amazon.com/pages/1", "https://unknown.example.com/"]
+    runs = []
+    for count in sorted({0, args.extractors // 10, args.extractors}):
+        registry = extractors.ExtractorRegistry()
+        for i in range(count):
+            registry.register(f"team-{i}", rf"team-{i}\.corp\.amazon\.com/", extractors.parse_sections)
+        for name in reversed(extractors.default_registry.names()):
+            pattern = extractors.default_registry._extractors[name][0]
+            registry.register(name, pattern, extractors.parse_sections)
+        linear = [(name, re.compile(registry._extractors[name][0])) for name in registry.names()]
+        keys = [extractors._match_key(url) for url in urls]
+
+        def scan():
+            for url in urls:
+                key = extractors._match_key(url)
+                next((name for name, pattern in linear if pattern.match(key)), None)
+
+        def combined():
+            for url in urls:
+                registry.find(url)
+
+        assert [registry.find(url) and registry.find(url)[0] for url in urls] == \
+            [next((name for name, pattern in linear if pattern.match(key)), None) for key in keys]
+        repeat = max(args.repeat, 200)
+        for matcher, fn in (("linear scan", scan), ("combined", combined)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                fn()
+            per_url = (time.perf_counter() - start) / repeat / len(urls)
+            runs.append({"extractors": len(linear), "matcher": matcher, "us_per_url": round(per_url * 1e6, 2)})
+    return {"urls": len(urls), "runs": runs}
+
+
+SCENARIOS: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+    "single": bench_single,
+    "sequential": bench_sequential,
+    "concurrent": bench_concurrent,
+    "parse": bench_parse,
+    "table": bench_table,
+    "index": bench_index,
+    "refresh": bench_refresh,
+    "columnar": bench_columnar,
+    "team": bench_team,
+    "overhead": bench_overhead,
+    "truncate": bench_truncate,
+    "concurrency": bench_concurrency,
+    "decode": bench_decode,
+    "extract": bench_extract,
+    "detect": bench_detect,
+    "dispatch": bench_dispatch,
+}
+
+
+def _peak_rss_mib(who: int) -> float:
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1)
+
+
+def run_scenario(name: str, args) -> Dict[str, Any]:
+    """Run one scenario and add the peak RSS of this process and of its builder-mcp children."""
+    report = SCENARIOS[name](args)
+    report["peak_rss_mib"] = _peak_rss_mib(resource.RUSAGE_SELF)
+    report["peak_child_rss_mib"] = _peak_rss_mib(resource.RUSAGE_CHILDREN)
+    return report
+
+
+def run_isolated(name: str, args) -> Dict[str, Any]:
+    """run_scenario() in a fresh interpreter."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(run_scenario, (name, args))
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """
+    Lines describing how every number changed between two --json files.
+
+    Runs are matched by position within a scenario; only scenarios and fields
+    present in both files are compared.
+    """
+    lines = []
+    for name, report in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        pairs = [("", before, report)]
+        pairs += [(f" run {i + 1}", old, new) for i, (old, new)
+                  in enumerate(zip(before.get("runs", []), report.get("runs", [])))]
+        for label, old, new in pairs:
+            for key, value in new.items():
+                was = old.get(key)
+                if isinstance(value, bool) or not isinstance(value, (int, float)) \
+                        or not isinstance(was, (int, float)) or was == value:
+                    continue
+                change = f" ({(value - was) / was * 100:+.1f}%)" if was else ""
+                lines.append(f"   {name}{label} {key}: {was} -> {value}{change}")
+    return lines
+
+
+def print_report(name: str, report: Dict[str, Any]) -> None:
+    print(f"== {name}")
+    for key, value in report.items():
+        if key != "runs":
+            print(f"   {key}: {value}")
+    for run in report.get("runs", []):
+        print("   " + "  ".join(f"{k}={v}" for k, v in run.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark read_internal_website.py against a fake builder-mcp")
+    parser.add_argument("scenarios", nargs="*", metavar="scenario",
+                        help=f"Scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--urls", type=int, default=32, help="URLs per batch (default: 32)")
+    parser.add_argument("--latency-ms", default="100",
+                        help="Fake builder-mcp latency: MS, LOW:HIGH (uniform) or lognormal:MEDIAN:SIGMA "
+                             "(default: 100)")
+    parser.add_argument("--page-kb", type=float, default=0,
+                        help="Page size for single/sequential/concurrent (default: a small page)")
+    parser.add_argument("--content-mix", default="",
+                        help="Page kinds for single/sequential/concurrent, e.g. markdown=3,json=1,html=1 "
+                             "(default: markdown)")
+    parser.add_argument("--errors", default="",
+                        help="Injected failures per URL, e.g. mcp-error=0.05,garbage=0.01,crash=0.01,hang=0.01")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the fake server's choices (default: 0)")
+    parser.add_argument("--workers", type=int, default=8, help="max_workers for concurrent (default: 8)")
+    parser.add_argument("--timeout", type=float, default=5, help="Fetch timeout in seconds (default: 5)")
+    parser.add_argument("--payload-kb", type=int, default=4096, help="Size of large test pages (default: 4096)")
+    parser.add_argument("--max-bytes", type=int, default=1024 * 1024,
+                        help="Content limit for truncate (default: 1048576)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per timed measurement (default: 5)")
+    parser.add_argument("--extractors", type=int, default=500,
+                        help="Registered extractors for dispatch (default: 500)")
+    parser.add_argument("--corpus", help="Directory of saved pages to add to the detect corpus")
+    parser.add_argument("--json", metavar="FILE", help="Save the reports to FILE")
+    parser.add_argument("--compare", metavar="FILE", help="Show changes against reports saved with --json")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenario(s): {', '.join(unknown)}")
+
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "options": {key: value for key, value in vars(args).items() if key not in ("json", "compare")},
+        "scenarios": {}
+    }
+    for name in args.scenarios or list(SCENARIOS):
+        results["scenarios"][name] = run_isolated(name, args)
+        print_report(name, results["scenarios"][name])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved to {args.json}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"== changes since {args.compare} ({baseline.get('created', 'unknown date')})")
+        for line in compare_reports(baseline, results) or ["   none"]:
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
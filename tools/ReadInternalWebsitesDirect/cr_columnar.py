@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+
+"""
+cr_columnar.py
+
+Column-oriented storage and export of parsed code review tables.
+
+A list of CR dicts repeats every header key in every row and holds a string
+per cell. CRColumns instead keeps one column per header, each dictionary
+encoded: the distinct values once, plus a compact array of 4-byte codes per
+row. Authors, statuses, approvers and snapshot labels repeat across rows
+and polls, so memory grows with the number of distinct values rather than
+rows x headers, and "URL" is derived from "ID" only when exported.
+
+Exports go to Parquet or Arrow IPC when pyarrow is installed (as dictionary
+columns, without expanding them) and to CSV or NDJSON with the standard
+library otherwise. Every distinct value is quoted or JSON-encoded once and
+rows are assembled from those pieces.
+
+Usage:
+    from cr_columnar import CRColumns
+
+    columns = CRColumns()
+    columns.extend_table(page, snapshot="2025-11-17T09:00")   # markdown from code.amazon.com/reviews/*
+    columns.extend_table(later_page, snapshot="2025-11-17T10:00")
+    print(columns.value_counts("Status"))
+    columns.write("reviews.parquet")    # or .arrow, .csv, .ndjson
+
+    python3 cr_columnar.py snapshots/*.md --output reviews.parquet
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import sys
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from cr_parser import CR_URL_PREFIX, CRHeader, CRRow, iter_cr_rows
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.feather
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Formats by file extension; the pyarrow ones need pyarrow
+FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow", ".csv": "csv",
+           ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+# Column holding the label given to extend()/extend_table(), e.g. a poll timestamp
+SNAPSHOT_COLUMN = "snapshot"
+
+
+def arrow_available() -> bool:
+    """True if pyarrow is installed, so Parquet and Arrow exports work."""
+    return pyarrow is not None
+
+
+def default_format() -> str:
+    """The export format used for an unknown extension: "parquet" with pyarrow, else "ndjson"."""
+    return "parquet" if pyarrow is not None else "ndjson"
+
+
+class _DictColumn:
+    """One dictionary-encoded column: distinct values and a code per row."""
+
+    __slots__ = ("values", "codes", "_lookup")
+
+    def __init__(self, rows: int = 0):
+        # Code 0 is the missing value, for rows added before the column existed or without the field
+        self.values: List[Optional[str]] = [None]
+        self.codes = array("I", bytes(4 * rows))
+        self._lookup: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class CRColumns:
+    """
+    CR rows stored column by column, with every column dictionary encoded.
+
+    Columns are added as new header names appear; rows that lack a field
+    hold a missing value (None, a null in Arrow, an empty CSV cell, a key left
+    out of the NDJSON object). Appending is
+    O(fields) per row and keeps no per-row objects.
+
+    Example:
+        >>> columns = CRColumns()
+        >>> columns.extend(parse_cr_table(page, compact=True), snapshot="monday")
+        >>> len(columns), columns.names
+        (1200, ['snapshot', 'ID', 'Author', 'Summary', 'Status', 'Approved by'])
+        >>> columns.value_counts("Status")
+        {'Open': 950, 'Merged': 250}
+        >>> columns.write("reviews.parquet")
+    """
+
+    def __init__(self):
+        self._columns: Dict[str, _DictColumn] = {}
+        self._rows = 0
+
+    @property
+    def names(self) -> List[str]:
+        """Column names, in the order they first appeared ("URL" is never stored)."""
+        return list(self._columns)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _column(self, name: str) -> _DictColumn:
+        column = self._columns.get(name)
+        if column is None:
+            column = self._columns[name] = _DictColumn(self._rows)
+        return column
+
+    def append(self, row: Mapping[str, str], snapshot: Optional[str] = None) -> None:
+        """Add one row (a dict or CRRow); a "URL" next to an "ID" is dropped and derived again on export."""
+        if snapshot is not None:
+            self._column(SNAPSHOT_COLUMN)
+        for name in self._columns:
+            # Columns this row lacks still need a code for it
+            value = snapshot if name == SNAPSHOT_COLUMN and snapshot is not None else row.get(name)
+            self._columns[name].codes.append(self._columns[name].code(value))
+        for name, value in row.items():
+            if name not in self._columns and not (name == "URL" and "ID" in row):
+                column = self._column(name)
+                column.codes.append(column.code(value))
+        self._rows += 1
+
+    def extend(self, rows: Iterable[Mapping[str, str]], snapshot: Optional[str] = None) -> int:
+        """
+        Add rows from parse_cr_table() or iter_cr_rows().
+
+        Args:
+            rows (iterable): CR dicts or CRRows
+            snapshot (str): Label stored in the "snapshot" column of every row,
+                e.g. when the listing was fetched (default: none)
+
+        Returns:
+            int: Number of rows added
+        """
+        count = 0
+        header, plan = None, None
+        for row in rows:
+            if not isinstance(row, CRRow):
+                self.append(row, snapshot)
+                header = None
+            else:
+                # Rows of one table share a header: map its cells to columns once
+                if row.header is not header:
+                    header = row.header
+                    plan = self._plan(header, snapshot)
+                fields, filler = plan
+                cells = row.cells
+                width = len(cells)
+                for index, lookup, column in fields:
+                    value = cells[index] if index < width else None
+                    code = lookup.get(value)
+                    column.codes.append(column.code(value) if code is None else code)
+                for codes in filler:
+                    codes.append(0)
+                self._rows += 1
+            count += 1
+        return count
+
+    def _plan(self, header: CRHeader, snapshot: Optional[str]) -> Tuple[list, list]:
+        """(cell index, lookup, column) per header field, and the codes of the columns it lacks."""
+        fields = []
+        if snapshot is not None:
+            # The index is past every cell, so the value is always None, looked up as the snapshot
+            column = self._column(SNAPSHOT_COLUMN)
+            fields.append((header.width, {None: column.code(snapshot)}, column))
+        for name, index in header.fields.items():
+            if not (name == SNAPSHOT_COLUMN and snapshot is not None):
+                column = self._column(name)
+                fields.append((index, column._lookup, column))
+        covered = {id(column) for _, _, column in fields}
+        filler = [column.codes for column in self._columns.values() if id(column) not in covered]
+        return fields, filler
+
+    def extend_table(self, content: Union[str, Iterable[str]], snapshot: Optional[str] = None) -> int:
+        """Parse a markdown CR table (or its lines) straight into the columns; returns the rows added."""
+        return self.extend(iter_cr_rows(content, compact=True), snapshot)
+
+    def column(self, name: str) -> List[Optional[str]]:
+        """
+        The decoded values of one column; "URL" is built from "ID".
+
+        Raises:
+            KeyError: If there is no such column
+        """
+        if name == "URL" and "ID" in self._columns:
+            return [None if cr_id is None else CR_URL_PREFIX + cr_id for cr_id in self.column("ID")]
+        column = self._columns[name]
+        values = column.values
+        return [values[code] for code in column.codes]
+
+    def value_counts(self, name: str) -> Dict[Optional[str], int]:
+        """
+        How many rows hold each value of a column, counted on the codes.
+
+        Raises:
+            KeyError: If there is no such column
+        """
+        column = self._columns[name]
+        return {column.values[code]: count for code, count in Counter(column.codes).most_common()}
+
+    def rows(self, url: bool = True) -> Iterator[Dict[str, Any]]:
+        """Decode the rows back into dicts, with "URL" after the stored fields when there is an "ID"."""
+        names = self.names
+        lookups = [(column.values, column.codes) for column in self._columns.values()]
+        with_url = url and "ID" in self._columns
+        for i in range(self._rows):
+            row = {name: values[codes[i]] for name, (values, codes) in zip(names, lookups)
+                   if codes[i]}
+            if with_url and "ID" in row:
+                row["URL"] = CR_URL_PREFIX + row["ID"]
+            yield row
+
+    def to_arrow(self, url: bool = True) -> "pyarrow.Table":
+        """
+        The columns as a pyarrow Table of dictionary arrays, without expanding them.
+
+        The table holds a copy of the codes, so rows can still be added afterwards.
+
+        Args:
+            url (bool): Add a "URL" column derived from "ID" (default: True)
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        _require_arrow("to_arrow()")
+        arrays, names = [], []
+        for name, column in self._columns.items():
+            # The codes are copied, since exporting the live array would make later
+            # appends fail. Code 0 (missing) is a null in the validity bitmap, and the
+            # other codes shift down by one to index a dictionary without a slot for it
+            validity, nulls = _validity_bitmap(column.codes)
+            codes = pyarrow.Array.from_buffers(pyarrow.uint32(), self._rows,
+                                               [validity, pyarrow.py_buffer(column.codes.tobytes())], nulls)
+            indices = pyarrow.compute.subtract(codes, 1)
+            dictionary = pyarrow.array(column.values[1:], pyarrow.string())
+            arrays.append(pyarrow.DictionaryArray.from_arrays(indices, dictionary))
+            names.append(name)
+        if url and "ID" in self._columns:
+            ids = arrays[names.index("ID")].dictionary_decode()
+            arrays.append(pyarrow.compute.binary_join_element_wise(CR_URL_PREFIX, ids, ""))
+            names.append("URL")
+        return pyarrow.table(arrays, names=names)
+
+    def write(self, path: str, fmt: Optional[str] = None, url: bool = True) -> str:
+        """
+        Export the columns to a file.
+
+        Args:
+            path (str): Output file
+            fmt (str): "parquet", "arrow", "csv" or "ndjson" (default: from
+                the extension, or default_format() if it is not known)
+            url (bool): Include a "URL" column derived from "ID" (default: True)
+
+        Returns:
+            str: The format written
+
+        Raises:
+            ImportError: For parquet/arrow without pyarrow
+            ValueError: If the format is unknown
+        """
+        fmt = fmt or FORMATS.get(os.path.splitext(path)[1].lower(), default_format())
+        if fmt == "parquet":
+            _require_arrow("Parquet export")
+            pyarrow.parquet.write_table(self.to_arrow(url), path)
+        elif fmt == "arrow":
+            _require_arrow("Arrow export")
+            pyarrow.feather.write_feather(self.to_arrow(url), path)
+        elif fmt in ("csv", "ndjson"):
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                self.write_text(f, fmt, url)
+        else:
+            raise ValueError(f"Unknown export format: {fmt} (have: parquet, arrow, csv, ndjson)")
+        logger.debug(f"Wrote {self._rows} rows to {path} as {fmt}")
+        return fmt
+
+    def write_text(self, stream, fmt: str = "ndjson", url: bool = True) -> None:
+        """
+        Write CSV (a header row, then one row per CR) or NDJSON (one JSON
+        object per CR, the same as json.dumps() of each rows() dict) to an
+        open text stream.
+
+        Each distinct value is quoted or JSON-encoded once; rows are joined
+        from those pieces. Missing values are empty CSV cells and are left
+        out of NDJSON objects.
+
+        Args:
+            stream: Writable text stream
+            fmt (str): "csv" or "ndjson" (default: "ndjson")
+            url (bool): Include a "URL" column derived from "ID" (default: True)
+        """
+        if fmt == "csv":
+            encode = _csv_cell
+        elif fmt == "ndjson":
+            encode = json.dumps
+        else:
+            raise ValueError(f"Unknown text format: {fmt} (have: csv, ndjson)")
+
+        names = self.names
+        columns = [[column.values[1:], column.codes] for column in self._columns.values()]
+        if url and "ID" in self._columns:
+            names.append("URL")
+            columns.append([[CR_URL_PREFIX + cr_id for cr_id in self._columns["ID"].values[1:]],
+                            self._columns["ID"].codes])
+        for name, column in zip(names, columns):
+            if fmt == "csv":
+                column[0] = [""] + [encode(value) for value in column[0]]
+            else:
+                key = encode(name) + ": "
+                column[0] = [""] + [key + encode(value) for value in column[0]]
+
+        if fmt == "csv":
+            stream.write(",".join(encode(name) for name in names) + "\r\n")
+            for i in range(self._rows):
+                stream.write(",".join(pieces[codes[i]] for pieces, codes in columns) + "\r\n")
+        else:
+            for i in range(self._rows):
+                stream.write("{" + ", ".join(filter(None, [pieces[codes[i]] for pieces, codes in columns])) + "}\n")
+
+
+def _validity_bitmap(codes: array) -> Tuple[Optional["pyarrow.Buffer"], int]:
+    """Arrow validity bitmap marking code 0 as null, and the null count; (None, 0) if there are none."""
+    if 0 not in codes:
+        return None, 0
+    bitmap = bytearray(b"\xff" * ((len(codes) + 7) // 8))
+    nulls = 0
+    for i, code in enumerate(codes):
+        if not code:
+            bitmap[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+            nulls += 1
+    return pyarrow.py_buffer(bitmap), nulls
+
+
+def _csv_cell(value: str) -> str:
+    """One CSV cell, quoted the way csv.writer quotes it by default."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="").writerow([value])
+    return buffer.getvalue()
+
+
+def _require_arrow(what: str) -> None:
+    if pyarrow is None:
+        raise ImportError(f"{what} needs pyarrow (pip install pyarrow); use a .csv or .ndjson file instead")
+
+
+def main():
+    """Convert saved code review listings into one columnar file."""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(
+        description="Store code review listings (markdown from code.amazon.com/reviews/*) column by column",
+        epilog="""
+Examples:
+  %(prog)s snapshots/*.md --output reviews.parquet
+  %(prog)s monday.md tuesday.md --output reviews.ndjson --no-url
+        """
+    )
+    parser.add_argument("files", nargs="+", help="Listing files; each is one snapshot labeled with its file name")
+    parser.add_argument("--output", required=True,
+                        help=f"Output file: .parquet/.arrow (needs pyarrow), .csv or .ndjson "
+                             f"(default format for other names: {default_format()})")
+    parser.add_argument("--no-url", action="store_true", help="Do not add the URL column")
+    args = parser.parse_args()
+
+    columns = CRColumns()
+    for name in args.files:
+        try:
+            with open(name, encoding="utf-8") as f:
+                count = columns.extend_table(f, snapshot=os.path.basename(name))
+        except OSError as e:
+            print(f"❌ Cannot read {name}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"📋 {name}: {count} CRs", file=sys.stderr)
+
+    try:
+        fmt = columns.write(args.output, url=not args.no_url)
+    except ImportError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"📁 {len(columns)} rows in {len(columns.names)} columns saved to {args.output} ({fmt})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
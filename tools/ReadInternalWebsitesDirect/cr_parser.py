@@ -7,16 +7,230 @@ Code Review specific utilities for parsing code.amazon.com data.
 This module contains specialized parsers for Code Review (CR) data structures.
 
 Usage:
-    from cr_parser import parse_cr_table
+    from cr_parser import parse_cr_table, iter_cr_rows
 
     # Parse markdown table from code.amazon.com/reviews/*
     data = read_internal_website("https://code.amazon.com/reviews/to-user/username")
     if data["success"] and data["content_type"] == "markdown":
         crs = parse_cr_table(data["content"])
+
+    # Large listings: stream rows, each a compact CRRow instead of a dict
+    for cr in iter_cr_rows(data["content"], compact=True):
+        print(cr["ID"], cr.get("Status"))
+
+    # Many questions about one listing: index it once
+    index = CRIndex(crs)
+    print(index.pending_counts(["alice", "bob"]), index.blocking("CR-123"))
+
+    # Polling a listing: only look at rows whose line changed
+    tracker = CRTracker()
+    diff = tracker.update(data["content"])   # {"added": [...], "removed": [...], "changed": {...}, ...}
+
+    # Several users' listings: one record per CR with each user's roles
+    merger = CRMerger()
+    merger.add("alice", parse_cr_table(alice_page), role="reviewer")
 """
 
+import re
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+CR_URL_PREFIX = "https://code.amazon.com/reviews/"
+
+# Review lists per user, code.amazon.com/reviews/<list>/<username>, and the role they give the user
+REVIEW_LISTS = {"to-user": "reviewer", "from-user": "author"}
+
+# Characters of a page searched for table lines at a time
+_BLOCK_CHARS = 256 * 1024
+_TABLE_LINE_RE = re.compile(r'^[ \t]*\|.*$', re.MULTILINE)
+# The |---|:--:| line under the header
+_SEPARATOR_RE = re.compile(r'[ \t]*\|[ \t:|-]*-[ \t:|-]*\s*')
+# A cell delimiter: a pipe that is not escaped as \|
+_DELIMITER_RE = re.compile(r'(?<!\\)\|')
+
+# Markers in front of a name in the "Approved by" column; an unmarked name has approved
+APPROVAL_MARKERS = {"__": "pending", "✓": "approved", "✔": "approved", "✗": "rejected", "✘": "rejected"}
+# One "Approved by" entry: an optional marker and a username
+_APPROVER_RE = re.compile(r'(__|[^\w\s,;<>]+)?[ \t]*([A-Za-z0-9][\w.-]*)')
+_BREAK_RE = re.compile(r'<br\s*/?>', re.IGNORECASE)
+# "Approved by" cells that mean nobody, compared lowercased
+_NO_APPROVERS = frozenset({"n/a", "na", "-", "\u2013", "\u2014"})
+
+
+class CRHeader:
+    """
+    Column layout of one CR table, shared by all of its CRRows.
+
+    Attributes:
+        names (list): Header cells, in order
+        fields (dict): Field name -> cell index ("URL" is derived when there is an "ID")
+    """
+
+    __slots__ = ("names", "fields", "width")
+
+    def __init__(self, names: List[str]):
+        self.names = names
+        self.fields = {name: index for index, name in enumerate(names)}
+        if "ID" in self.fields:
+            self.fields.pop("URL", None)
+        self.width = len(names)
+
+
+class CRRow(Mapping):
+    """
+    One row of a CR table, as a read-only mapping.
+
+    A row keeps its raw table line and the table's shared CRHeader, and only
+    splits the line into cells when a field is first read, so streaming or
+    holding thousands of rows costs one string each rather than a dict.
+    "URL" is derived from "ID". Compares equal to the dict parse_cr_table()
+    returns for the same row.
 
-def parse_cr_table(content: str) -> list:
+    Example:
+        >>> rows = list(iter_cr_rows(content, compact=True))
+        >>> rows[0]["ID"], rows[0].cells
+        ('CR-1', ('CR-1', 'jdoe', 'Fix the build', 'Open', '__ alice'))
+    """
+
+    __slots__ = ("header", "_line", "_cells")
+
+    def __init__(self, header: CRHeader, line: str):
+        self.header = header
+        self._line = line
+        self._cells: Optional[Tuple[str, ...]] = None
+
+    @property
+    def cells(self) -> Tuple[str, ...]:
+        """The row's cells, at most one per header column."""
+        cells = self._cells
+        if cells is None:
+            cells = self._cells = tuple(_split_cells(self._line)[:self.header.width])
+            self._line = None
+        return cells
+
+    def __getitem__(self, key: str) -> str:
+        index = self.header.fields.get(key)
+        cells = self.cells
+        if index is not None and index < len(cells):
+            return cells[index]
+        if key == "URL" and "ID" in self:
+            return CR_URL_PREFIX + self["ID"]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        count = len(self.cells)
+        has_id = False
+        for name, index in self.header.fields.items():
+            if index < count:
+                has_id = has_id or name == "ID"
+                yield name
+        if has_id:
+            yield "URL"
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"CRRow({dict(self)!r})"
+
+
+def _table_lines(content: str) -> Iterator[str]:
+    """Lines of a page that start with "|", found a block at a time rather than splitting the page."""
+    start, size = 0, len(content)
+    while start < size:
+        end = content.find("\n", start + _BLOCK_CHARS)
+        if end < 0:
+            end = size
+        yield from _TABLE_LINE_RE.findall(content, start, end)
+        start = end + 1
+
+
+def _split_cells(line: str) -> List[str]:
+    """The stripped cells of a table line, with escaped pipes unescaped."""
+    line = line.strip()
+    if "\\" in line:
+        cells = [cell.strip().replace("\\|", "|") for cell in _DELIMITER_RE.split(line)]
+        closed = not line.endswith("\\|")
+    else:
+        cells = [cell.strip() for cell in line.split("|")]
+        closed = True
+    # Drop the empty cells outside the leading and trailing pipes
+    return cells[1:-1] if closed and line.endswith("|") else cells[1:]
+
+
+def _read_header(content: Union[str, Iterable[str]]) -> Tuple[Optional[CRHeader], Iterator[str]]:
+    """The header of a table and an iterator over the table lines after it."""
+    if isinstance(content, str):
+        lines: Iterator[str] = _table_lines(content) if "|" in content else iter(())
+    else:
+        # Without line endings, like the lines found in a str
+        lines = (line.rstrip("\r\n") for line in content if line.lstrip().startswith("|"))
+    for line in lines:
+        headers = _split_cells(line)
+        if headers:
+            return CRHeader(headers), lines
+    return None, lines
+
+
+def _is_row(line: str) -> bool:
+    """False for the separator line and for rows with only empty cells."""
+    # The first character that is not a pipe or blank: none for an empty row
+    first = line.strip(" \t\r\n|")[:1]
+    return bool(first) and not (first in "-:" and _SEPARATOR_RE.fullmatch(line))
+
+
+def iter_cr_rows(content: Union[str, Iterable[str]],
+                 compact: bool = False) -> Iterator[Union[Dict[str, str], CRRow]]:
+    """
+    Parse a markdown table of code reviews lazily, one row at a time.
+
+    Only lines starting with "|" are looked at; the first is the header.
+    Cells may contain escaped pipes ("\\|"). A row with fewer cells than the
+    header is kept with the fields it has, one with more is cut to the header.
+
+    Args:
+        content (str or iterable): Markdown from code.amazon.com/reviews/*, or
+            its lines (e.g. an open file)
+        compact (bool): Yield CRRows, which split their line on first access,
+            instead of dicts
+
+    Returns:
+        Iterator: CR dicts (or CRRows) with fields like ID, Author, Summary and URL
+
+    Example:
+        >>> for cr in iter_cr_rows(open("reviews.md"), compact=True):
+        >>>     if cr.get("Status") == "Open":
+        >>>         print(cr["URL"])
+    """
+    header, lines = _read_header(content)
+    if header is None:
+        return
+    if compact:
+        for line in lines:
+            if _is_row(line):
+                yield CRRow(header, line)
+        return
+
+    headers = header.names
+    has_id = "ID" in header.fields
+    for line in lines:
+        if "\\" in line:
+            cells = _split_cells(line)
+        else:
+            # Inlined _split_cells(); an empty last cell is the one after the closing pipe
+            cells = [cell.strip() for cell in line.split("|")]
+            cells = cells[1:-1] if not cells[-1] else cells[1:]
+        if not cells or not cells[0] and not any(cells):
+            continue
+        if cells[0][:1] in ("-", ":") and _SEPARATOR_RE.fullmatch(line):
+            continue
+        row = dict(zip(headers, cells))
+        if has_id and "ID" in row:
+            row["URL"] = CR_URL_PREFIX + row["ID"]
+        yield row
+
+
+def parse_cr_table(content: str, compact: bool = False) -> list:
     """
     Parse a markdown table of code reviews into structured data.
 
@@ -25,6 +239,7 @@ def parse_cr_table(content: str) -> list:
 
     Args:
         content (str): Markdown table content from code.amazon.com
+        compact (bool): Return CRRow records instead of dicts, see iter_cr_rows()
 
     Returns:
         list: List of CR dictionaries with fields like ID, Author, Summary, etc.
@@ -40,33 +255,9 @@ def parse_cr_table(content: str) -> list:
         >>>         print(f"{cr['ID']}: {cr.get('Summary', 'N/A')}")
     """
 
-    if not content or "|" not in content:
+    if not content:
         return []
-
-    lines = content.strip().split('\n')
-    headers = []
-    rows = []
-
-    for line in lines:
-        if line.startswith('|---'):
-            continue
-        if line.startswith('|'):
-            parts = [p.strip() for p in line.split('|')]
-            parts = parts[1:-1] if parts else []  # Remove empty first and last elements
-
-            if not headers:
-                headers = parts
-            elif parts and len(parts) >= len(headers):
-                row_dict = {}
-                for i, header in enumerate(headers):
-                    if i < len(parts):
-                        row_dict[header] = parts[i]
-                # Add URL if we have an ID
-                if 'ID' in row_dict:
-                    row_dict['URL'] = f"https://code.amazon.com/reviews/{row_dict['ID']}"
-                rows.append(row_dict)
-
-    return rows
+    return list(iter_cr_rows(content, compact))
 
 
 def count_pending_approvals(crs: list, username: str) -> int:
@@ -87,3 +278,340 @@ def count_pending_approvals(crs: list, username: str) -> int:
     """
     pending = [cr for cr in crs if f"__ {username}" in cr.get("Approved by", "")]
     return len(pending)
+
+
+def parse_approvals(cell: str) -> List[Tuple[str, str]]:
+    """
+    Split an "Approved by" cell into (username, status) entries.
+
+    Status comes from the marker in front of each name (see APPROVAL_MARKERS):
+    "pending", "approved" or "rejected", and "unknown" for other markers. A
+    placeholder such as "N/A" or "-" is an empty cell.
+
+    Example:
+        >>> parse_approvals("__ alice, bob")
+        [('alice', 'pending'), ('bob', 'approved')]
+    """
+    if cell.strip().lower() in _NO_APPROVERS:
+        return []
+    if "<" in cell:
+        cell = _BREAK_RE.sub(",", cell)
+    return [(user, APPROVAL_MARKERS.get(marker, "unknown") if marker else "approved")
+            for marker, user in _APPROVER_RE.findall(cell)]
+
+
+class CRIndex:
+    """
+    Inverted indexes over a CR listing, for asking many per-user questions.
+
+    Built once from parse_cr_table() or iter_cr_rows() output (dicts or
+    CRRows), with the "Approved by" column parsed into (username, status)
+    entries and CR IDs indexed by approver and status, by author and by the
+    "Status" column. Each query is then a dict lookup plus O(k) in the size of
+    the answer, instead of a scan of every CR per user. Usernames are matched
+    whole, unlike count_pending_approvals()'s substring test. Rows without an
+    ID are skipped; adding a row with a known ID replaces it.
+
+    Example:
+        >>> index = CRIndex(parse_cr_table(content, compact=True))
+        >>> index.pending_counts(["alice", "bob"])
+        {'alice': 3, 'bob': 0}
+        >>> index.blocking("CR-123")
+        ['alice']
+        >>> [cr["URL"] for cr in index.queue("alice")]
+        ['https://code.amazon.com/reviews/CR-123', ...]
+    """
+
+    def __init__(self, crs: Iterable[Mapping] = ()):
+        # ID -> row, in listing order
+        self._crs: Dict[str, Mapping] = {}
+        self._approvals: Dict[str, List[Tuple[str, str]]] = {}
+        # Ordered sets (dicts of None) of CR IDs, so removal is O(1)
+        self._by_approver: Dict[str, Dict[str, Dict[str, None]]] = {}
+        self._by_author: Dict[str, Dict[str, None]] = {}
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        for cr in crs:
+            self.add(cr)
+
+    def add(self, cr: Mapping) -> None:
+        """Index one CR, replacing an indexed CR with the same ID."""
+        cr_id = cr.get("ID")
+        if not cr_id:
+            return
+        if cr_id in self._crs:
+            self.remove(cr_id)
+        self._crs[cr_id] = cr
+        approvals = parse_approvals(cr.get("Approved by", ""))
+        self._approvals[cr_id] = approvals
+        for user, status in approvals:
+            self._by_approver.setdefault(user, {}).setdefault(status, {})[cr_id] = None
+        self._by_author.setdefault(cr.get("Author", ""), {})[cr_id] = None
+        self._by_status.setdefault(cr.get("Status", ""), {})[cr_id] = None
+
+    def remove(self, cr_id: str) -> None:
+        """Drop a CR from every index; unknown IDs are ignored."""
+        cr = self._crs.pop(cr_id, None)
+        if cr is None:
+            return
+        for user, status in self._approvals.pop(cr_id):
+            _discard(self._by_approver[user], status, cr_id)
+            if not self._by_approver[user]:
+                del self._by_approver[user]
+        _discard(self._by_author, cr.get("Author", ""), cr_id)
+        _discard(self._by_status, cr.get("Status", ""), cr_id)
+
+    def __len__(self) -> int:
+        return len(self._crs)
+
+    def __contains__(self, cr_id: object) -> bool:
+        return cr_id in self._crs
+
+    def get(self, cr_id: str) -> Optional[Mapping]:
+        """The CR with this ID, or None."""
+        return self._crs.get(cr_id)
+
+    def approvals(self, cr_id: str) -> List[Tuple[str, str]]:
+        """(username, status) entries of a CR's "Approved by" column."""
+        return list(self._approvals.get(cr_id, ()))
+
+    def blocking(self, cr_id: str) -> List[str]:
+        """Usernames whose approval of a CR is still pending."""
+        return [user for user, status in self._approvals.get(cr_id, ()) if status == "pending"]
+
+    def pending_count(self, username: str) -> int:
+        """Number of CRs pending approval from a user."""
+        return len(self._by_approver.get(username, {}).get("pending", ()))
+
+    def pending_counts(self, usernames: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Pending approvals per user.
+
+        Args:
+            usernames (iterable): Users to count, including those with none
+                (default: every user with at least one)
+
+        Returns:
+            dict: username -> number of CRs pending their approval
+        """
+        if usernames is None:
+            return {user: len(statuses["pending"]) for user, statuses in self._by_approver.items()
+                    if statuses.get("pending")}
+        return {user: self.pending_count(user) for user in usernames}
+
+    def queue(self, username: str, status: str = "pending") -> List[Mapping]:
+        """CRs on which a user's approval entry has this status, in listing order."""
+        return [self._crs[cr_id] for cr_id in self._by_approver.get(username, {}).get(status, ())]
+
+    def authored_by(self, username: str) -> List[Mapping]:
+        """CRs whose Author is this user."""
+        return [self._crs[cr_id] for cr_id in self._by_author.get(username, ())]
+
+    def with_status(self, status: str) -> List[Mapping]:
+        """CRs whose Status column is exactly this value, e.g. "Open"."""
+        return [self._crs[cr_id] for cr_id in self._by_status.get(status, ())]
+
+
+def _discard(index: Dict[str, Dict[str, None]], key: str, cr_id: str) -> None:
+    """Remove cr_id from index[key], dropping the key once it is empty."""
+    ids = index.get(key)
+    if ids is not None:
+        ids.pop(cr_id, None)
+        if not ids:
+            del index[key]
+
+
+class CRTracker:
+    """
+    The last parse of a polled CR listing, refreshed incrementally.
+
+    update() takes the listing's new content and reports which CRs were
+    added, removed or changed since the previous call. Each row is keyed by
+    its raw table line: a line seen in the previous poll maps straight back
+    to its CRRow, so unchanged rows are neither split nor compared, and a
+    poll where nothing changed costs one scan for table lines and a dict
+    lookup per row; an identical page is recognized without scanning it. Only
+    new lines are parsed and diffed field by field against the CR with the
+    same ID.
+
+    Example:
+        >>> tracker = CRTracker(index=CRIndex())
+        >>> tracker.update(first_poll)["added"]      # every CR, the first time
+        ['CR-1', 'CR-2']
+        >>> tracker.update(second_poll)
+        {'added': [], 'removed': ['CR-2'], 'changed': {'CR-1': {'Status': ('Open', 'Merged')}}, 'unchanged': 0}
+        >>> tracker.index.pending_counts()           # kept in sync with every update
+    """
+
+    def __init__(self, index: Optional[CRIndex] = None):
+        """
+        Args:
+            index (CRIndex): Index to keep in sync with the listing (default: none)
+        """
+        self.index = index
+        self.header: Optional[CRHeader] = None
+        # ID -> row, and raw line -> (ID, row) for the rows of the last poll
+        self._rows: Dict[str, CRRow] = {}
+        self._lines: Dict[str, Tuple[str, CRRow]] = {}
+        # The last content, when it was a str: an identical poll is answered without a scan
+        self._content: Optional[str] = None
+
+    @property
+    def rows(self) -> Dict[str, CRRow]:
+        """The CRs of the last poll by ID, in listing order."""
+        return dict(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, cr_id: str) -> Optional[CRRow]:
+        """The CR with this ID in the last poll, or None."""
+        return self._rows.get(cr_id)
+
+    def update(self, content: Union[str, Iterable[str]]) -> Dict[str, Any]:
+        """
+        Replace the listing with a new poll of it and diff the two.
+
+        Args:
+            content (str or iterable): Markdown from code.amazon.com/reviews/*,
+                or its lines
+
+        Returns:
+            dict: "added" and "removed" (lists of CR IDs), "changed" (CR ID ->
+                {field: (old value, new value)}; a field missing on one side is
+                None) and "unchanged" (number of CRs whose line did not change)
+        """
+        if isinstance(content, str) and content == self._content:
+            return {"added": [], "removed": [], "changed": {}, "unchanged": len(self._rows)}
+        self._content = content if isinstance(content, str) else None
+
+        header, lines = _read_header(content)
+        previous_rows, previous_lines = self._rows, self._lines
+        if header is None or self.header is None or header.names != self.header.names:
+            # Same lines under other columns would be other values
+            previous_lines = {}
+        if header is not None:
+            self.header = header
+
+        rows: Dict[str, CRRow] = {}
+        seen: Dict[str, Tuple[str, CRRow]] = {}
+        # ID -> row for lines that were not in the previous poll
+        fresh: Dict[str, CRRow] = {}
+        for line in lines:
+            known = previous_lines.get(line)
+            if known is None:
+                if not _is_row(line):
+                    continue
+                row = CRRow(header, line)
+                cr_id = row.get("ID")
+                if not cr_id:
+                    continue
+                known = (cr_id, row)
+                fresh[cr_id] = row
+            seen[line] = known
+            rows[known[0]] = known[1]
+        self._rows, self._lines = rows, seen
+
+        added, changed = [], {}
+        for cr_id, row in fresh.items():
+            old = previous_rows.get(cr_id)
+            if old is None:
+                added.append(cr_id)
+            else:
+                delta = _field_delta(old, row)
+                if delta:
+                    changed[cr_id] = delta
+        removed = [cr_id for cr_id in previous_rows if cr_id not in rows]
+
+        if self.index is not None:
+            for cr_id in removed:
+                self.index.remove(cr_id)
+            for cr_id, row in fresh.items():
+                if rows[cr_id] is row:
+                    self.index.add(row)
+        return {"added": added, "removed": removed, "changed": changed,
+                "unchanged": len(rows) - len(fresh)}
+
+
+def _field_delta(old: Mapping, new: Mapping) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """{field: (old, new)} for every field whose value differs between two rows."""
+    delta = {}
+    for field in dict.fromkeys([*old, *new]):
+        before, after = old.get(field), new.get(field)
+        if before != after:
+            delta[field] = (before, after)
+    return delta
+
+
+def review_list_url(username: str, review_list: str = "to-user") -> str:
+    """
+    URL of a user's review list.
+
+    Args:
+        username (str): Username
+        review_list (str): One of REVIEW_LISTS (default: "to-user", CRs awaiting their review)
+
+    Raises:
+        ValueError: If the list is unknown
+    """
+    if review_list not in REVIEW_LISTS:
+        raise ValueError(f"Unknown review list: {review_list} (have: {', '.join(REVIEW_LISTS)})")
+    return f"{CR_URL_PREFIX}{review_list}/{username}"
+
+
+class CRMerger:
+    """
+    Several users' CR listings merged into one record per CR ID.
+
+    Each record is the CR's fields from the first listing it was seen in plus
+    "roles": {username: [role, ...]} for every listing it appeared in, so a CR
+    in three reviewers' queues is one record with three users.
+
+    Example:
+        >>> merger = CRMerger()
+        >>> merger.add("alice", parse_cr_table(alice_page), role="reviewer")
+        >>> merger.add("bob", parse_cr_table(bob_page), role="author")
+        >>> merger.records[0]["roles"]
+        {'alice': ['reviewer'], 'bob': ['author']}
+    """
+
+    def __init__(self):
+        self._records: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, username: str, crs: Iterable[Mapping], role: str = "reviewer") -> List[Dict[str, Any]]:
+        """
+        Merge one user's listing.
+
+        Args:
+            username (str): Whose listing it is
+            crs (iterable): Rows from parse_cr_table() or iter_cr_rows()
+            role (str): The user's role for these CRs (default: "reviewer")
+
+        Returns:
+            list: The records that are new or gained a role, in listing order
+        """
+        touched = []
+        for cr in crs:
+            cr_id = cr.get("ID")
+            if not cr_id:
+                continue
+            record = self._records.get(cr_id)
+            if record is None:
+                record = self._records[cr_id] = dict(cr)
+                record["roles"] = {}
+            roles = record["roles"].setdefault(username, [])
+            if role not in roles:
+                roles.append(role)
+                touched.append(record)
+        return touched
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """Every merged record, in the order CRs were first seen."""
+        return list(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, cr_id: str) -> Optional[Dict[str, Any]]:
+        """The merged record for a CR ID, or None."""
+        return self._records.get(cr_id)
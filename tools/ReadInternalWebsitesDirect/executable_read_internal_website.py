@@ -31,7 +31,9 @@ Usage:
         print(content)
 
     # Batch fetching
-    from read_internal_website import read_internal_websites
+    from read_internal_website import read_internal_websites, enable_session_pool
+
+    enable_session_pool(size=2)  # optional: reuse builder-mcp processes
 
     urls = [
         "https://phonetool.amazon.com/users/user1",
@@ -42,24 +44,758 @@ Usage:
         if is_success(result):
             print(f"✓ {result['url']}")
 
-Note: For code review specific parsing, see cr_parser.py module.
+Team review view (every CR in several users' queues, fetched concurrently
+and merged by CR ID):
+
+    team = fetch_team_reviews(["user1", "user2", "user3"])
+    for cr in team["crs"]:
+        print(cr["ID"], cr["roles"])
+
+Note: For code review specific parsing, see cr_parser.py module, and for
+structured data from other sites, extractors.py.
 """
 
+import asyncio
+import codecs
+import copy
 import json
+import os
+import selectors
 import subprocess
 import sys
-from typing import Dict, Any, Optional, Union, List
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Any, Optional, Union, List, Iterator, Tuple, AsyncIterator
 import logging
 import re
 from datetime import datetime
 import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from mcp_session import (MCPSessionPool, MCPSessionError, MCPTimeoutError, MCPResponseTooLargeError,
+                         default_command)
+import json_codec
+from batch_journal import BatchJournal, cut_torn_line
+from cr_parser import REVIEW_LISTS, CRMerger, iter_cr_rows, review_list_url
+from extractors import apply_extractor
+from metrics import MetricsRegistry, PhaseTimer
+from rate_limit import RateLimiter
+from resilience import CircuitBreaker, RetryPolicy
+from response_cache import ResponseCache
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Content type detection only looks at this many characters at the start and end of a page
+_DETECT_HEAD = 64 * 1024
+_DETECT_TAIL = 16 * 1024
+_NON_SPACE_RE = re.compile(r'\S')
+_LAST_NON_SPACE_RE = re.compile(r'\S(?=\s*\Z)')
+_HTML_DOCUMENT_RE = re.compile(r'<html|<!doctype', re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r'<(?:div|p>|h1)')
+# Characters that can follow "[" in a JSON array
+_JSON_VALUE_START = frozenset('{["-0123456789tfn]')
+# Characters that can precede the closing bracket of non-empty JSON (a value's last character)
+_JSON_VALUE_END = frozenset('"0123456789el}]')
+
+# Markdown reference links "[text][1]" and their definitions "[1]: https://..."
+_REFERENCE_LINK_RE = re.compile(r'\[([^\]]+)\]\[(\d+)\]')
+_LINK_DEFINITION_RE = re.compile(r'^ {0,3}\[(\d+)\]:[ \t]*<?([^\s>]+)>?', re.MULTILINE)
+# Opening and closing lines of fenced code blocks, whose "[N]: ..." lines are not definitions
+_CODE_FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})', re.MULTILINE)
+
+# Whether clean_markdown_links() resolves links by default, see enable_link_resolution()
+_resolve_links = False
+
+# Shared persistent builder-mcp workers, see enable_session_pool()
+_default_pool: Optional[MCPSessionPool] = None
+
+# Shared response cache, see enable_cache()
+_default_cache: Optional[ResponseCache] = None
+
+# Shared retry policy and circuit breaker, see enable_retries() / enable_circuit_breaker()
+_default_retry_policy: Optional[RetryPolicy] = None
+_default_breaker: Optional[CircuitBreaker] = None
+
+# Shared per-host token buckets, see enable_rate_limit()
+_default_rate_limiter: Optional[RateLimiter] = None
+
+# Shared per-host fetch metrics, see enable_metrics()
+_default_metrics: Optional[MetricsRegistry] = None
+
+# Largest builder-mcp response read before giving up, see enable_response_limit()
+_max_response_bytes: Optional[int] = None
+
+# Largest page kept per URL, see enable_content_limit()
+_max_content_bytes: Optional[int] = None
+# Output read beyond the content limit for the JSON-RPC envelope around a page
+_ENVELOPE_BYTES = 64 * 1024
+# Where the page text starts in a cut-off response, see _content_prefix()
+_TEXT_FIELD_RE = re.compile(r'"text"\s*:\s*"')
+_CONTENT_FIELD_RE = re.compile(r'"content"\s*:\s*"')
+# builderhub's structured pages, which are never cut
+_PROCESSED_FIELD_RE = re.compile(r'"processedContent"\s*:')
+_JSON_DECODER = json.JSONDecoder()
+
+
+def enable_session_pool(size: int = 1, command: Optional[List[str]] = None) -> MCPSessionPool:
+    """
+    Route all fetches through long-lived builder-mcp processes.
+
+    Instead of spawning builder-mcp for every URL, keep `size` processes open
+    and reuse them across read_internal_website() / read_internal_websites()
+    calls. Crashed workers are restarted and all workers are shut down at exit.
+
+    Args:
+        size (int): Number of builder-mcp worker processes (default: 1)
+        command (List[str]): builder-mcp argv (default: BUILDER_MCP_COMMAND or "builder-mcp")
+
+    Returns:
+        MCPSessionPool: The pool now used by default
+
+    Example:
+        >>> enable_session_pool(size=4)
+        >>> results = read_internal_websites(urls)  # no per-URL process start
+    """
+    global _default_pool
+    disable_session_pool()
+    _default_pool = MCPSessionPool(size=size, command=command)
+    return _default_pool
+
+
+def disable_session_pool() -> None:
+    """Shut down the default session pool and go back to one process per fetch."""
+    global _default_pool
+    pool, _default_pool = _default_pool, None
+    if pool is not None:
+        pool.close()
+
+
+def enable_cache(cache_dir: Optional[str] = None, ttl: float = 300,
+                 domain_ttls: Optional[Dict[str, float]] = None, **kwargs) -> ResponseCache:
+    """
+    Cache successful results for all fetches.
+
+    Results are keyed by normalize_url() and kept in memory and in a sqlite
+    database under `cache_dir`. Cache hits carry
+    metadata["cache"] = {"hit": True, "tier": ..., "age_seconds": ...}.
+
+    Args:
+        cache_dir (str): Cache directory (default: ~/.cache/read_internal_website)
+        ttl (float): Seconds an entry stays fresh (default: 300)
+        domain_ttls (dict): Per-domain TTLs, e.g. {"phonetool.amazon.com": 3600}
+        **kwargs: max_bytes / memory_entries, see ResponseCache
+
+    Returns:
+        ResponseCache: The cache now used by default
+
+    Example:
+        >>> enable_cache(ttl=600, domain_ttls={"w.amazon.com": 60})
+        >>> data = read_internal_website("https://phonetool.amazon.com/users/username")
+    """
+    global _default_cache
+    disable_cache()
+    _default_cache = ResponseCache(cache_dir, ttl=ttl, domain_ttls=domain_ttls, **kwargs)
+    return _default_cache
+
+
+def disable_cache() -> None:
+    """Stop caching and close the default cache."""
+    global _default_cache
+    cache, _default_cache = _default_cache, None
+    if cache is not None:
+        cache.close()
+
+
+def enable_retries(max_attempts: int = 3, **kwargs) -> RetryPolicy:
+    """
+    Retry failed fetches with exponential backoff and jitter.
+
+    Results whose error_code is retryable (TIMEOUT, SUBPROCESS_ERROR,
+    PARSE_ERROR and MCP_ERROR by default) are fetched again until they
+    succeed, `max_attempts` is reached or the policy's deadline would be
+    passed. Every fetched result carries metadata["attempts"] and the total
+    time slept between attempts in metadata["backoff_ms"].
+
+    Args:
+        max_attempts (int): Total attempts per URL, including the first (default: 3)
+        **kwargs: retry_on / base_delay / max_delay / deadline, see RetryPolicy
+
+    Returns:
+        RetryPolicy: The policy now used by default
+
+    Example:
+        >>> enable_retries(max_attempts=4, deadline=60)
+        >>> results = read_internal_websites(urls, max_workers=8)
+    """
+    global _default_retry_policy
+    _default_retry_policy = RetryPolicy(max_attempts=max_attempts, **kwargs)
+    return _default_retry_policy
+
+
+def disable_retries() -> None:
+    """Go back to a single attempt per fetch."""
+    global _default_retry_policy
+    _default_retry_policy = None
+
+
+def enable_circuit_breaker(failure_threshold: int = 5, reset_timeout: float = 30,
+                           **kwargs) -> CircuitBreaker:
+    """
+    Fail fast for hosts that keep failing.
+
+    After `failure_threshold` consecutive failures for a hostname, fetches for
+    it return error_code CIRCUIT_OPEN without starting builder-mcp, so one
+    broken site does not occupy the workers of a concurrent batch. After
+    `reset_timeout` seconds one probe fetch decides whether the host recovered.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open a circuit (default: 5)
+        reset_timeout (float): Seconds before a probe is let through (default: 30)
+        **kwargs: failure_codes, see CircuitBreaker
+
+    Returns:
+        CircuitBreaker: The breaker now used by default
+    """
+    global _default_breaker
+    _default_breaker = CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=reset_timeout, **kwargs)
+    return _default_breaker
+
+
+def disable_circuit_breaker() -> None:
+    """Stop tracking host failures."""
+    global _default_breaker
+    _default_breaker = None
+
+
+def enable_rate_limit(rates: Optional[Dict[str, Tuple[float, float]]] = None,
+                      default: Optional[Tuple[float, float]] = None) -> RateLimiter:
+    """
+    Limit builder-mcp requests per host with token buckets.
+
+    Every request (a retry, or a chunk of several URLs, counts as one) takes a
+    token from its host's bucket first, across all threads and asyncio tasks.
+    Time spent waiting for a token is reported in
+    metadata["rate_limit_wait_ms"] and not counted in fetch_duration_ms.
+
+    Args:
+        rates (dict): Domain -> (requests per second, burst); a domain also
+            covers its subdomains
+        default (tuple): (requests per second, burst) for every other host
+            (default: unlimited)
+
+    Returns:
+        RateLimiter: The limiter now used by default
+
+    Example:
+        >>> enable_rate_limit({"code.amazon.com": (2, 4), "issues.amazon.com": (1, 1)})
+        >>> results = read_internal_websites(urls, max_workers=16)
+    """
+    global _default_rate_limiter
+    _default_rate_limiter = RateLimiter(rates, default=default)
+    return _default_rate_limiter
+
+
+def disable_rate_limit() -> None:
+    """Stop rate limiting requests."""
+    global _default_rate_limiter
+    _default_rate_limiter = None
+
+
+def enable_metrics(registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """
+    Aggregate every fetched result into a per-host metrics registry.
+
+    Each result is counted once, after its retries; results served from the
+    cache or coalesced with another caller's fetch are not counted. Export
+    with registry.to_openmetrics() or registry.summary().
+
+    Args:
+        registry (MetricsRegistry): Registry to record into (default: a new one)
+
+    Returns:
+        MetricsRegistry: The registry now used by default
+
+    Example:
+        >>> metrics = enable_metrics()
+        >>> results = read_internal_websites(urls, max_workers=8)
+        >>> print(metrics.to_openmetrics())
+    """
+    global _default_metrics
+    _default_metrics = registry if registry is not None else MetricsRegistry()
+    return _default_metrics
+
+
+def disable_metrics() -> None:
+    """Stop recording fetch metrics."""
+    global _default_metrics
+    _default_metrics = None
+
+
+def enable_response_limit(max_bytes: int) -> None:
+    """
+    Fail fetches whose builder-mcp response is larger than `max_bytes`.
+
+    A process spawned for the fetch is killed as soon as its output passes
+    the limit, so a runaway page costs at most `max_bytes` of memory; the
+    result fails with error_code RESPONSE_TOO_LARGE. A session pool worker
+    keeps running, but the rest of its response is dropped as it is read.
+
+    Args:
+        max_bytes (int): Maximum size of one JSON-RPC response in bytes
+
+    Example:
+        >>> enable_response_limit(64 * 1024 * 1024)
+    """
+    global _max_response_bytes
+    if max_bytes < 1:
+        raise ValueError("max_bytes must be at least 1")
+    _max_response_bytes = max_bytes
+
+
+def disable_response_limit() -> None:
+    """Accept builder-mcp responses of any size."""
+    global _max_response_bytes
+    _max_response_bytes = None
+
+
+def enable_content_limit(max_content_bytes: int) -> None:
+    """
+    Truncate pages larger than `max_content_bytes` instead of returning them whole.
+
+    builder-mcp output is read only up to the limit plus a small allowance
+    for the JSON-RPC envelope and the page is recovered from what was read,
+    so memory per fetch stays around the limit however large the page is. A
+    process spawned for the fetch is then killed; a session pool worker keeps
+    running and the rest of its response is dropped as it is read.
+
+    A text page succeeds with its start, at most `max_content_bytes` bytes
+    of UTF-8 (less if the page is heavy in characters JSON has to escape), a
+    warning and metadata["truncated"]. Structured content (builderhub dicts
+    and JSON pages) is never cut: read whole it is returned whole, and cut
+    off while reading it fails with error_code CONTENT_TOO_LARGE,
+    content_type "json" and metadata["truncated"]. Truncated results are not
+    cached. A batched request that is cut off is fetched again one URL at a
+    time. A lower enable_response_limit() still fails the fetch first.
+
+    Args:
+        max_content_bytes (int): Largest page kept, in bytes
+
+    Example:
+        >>> enable_content_limit(4 * 1024 * 1024)
+        >>> data = read_internal_website("https://w.amazon.com/bin/view/HugePage")
+        >>> data["metadata"].get("truncated")
+        True
+    """
+    global _max_content_bytes
+    if max_content_bytes < 1:
+        raise ValueError("max_content_bytes must be at least 1")
+    _max_content_bytes = max_content_bytes
+
+
+def disable_content_limit() -> None:
+    """Return pages whole, whatever their size."""
+    global _max_content_bytes
+    _max_content_bytes = None
+
+
+def enable_link_resolution() -> None:
+    """
+    Turn reference-style markdown links into inline links instead of stripping them.
+
+    Fetched markdown then keeps "[text](https://...)" for every "[text][N]"
+    whose "[N]: https://..." definition is on the page. Results already in
+    the response cache keep the form they were stored in.
+    """
+    global _resolve_links
+    _resolve_links = True
+
+
+def disable_link_resolution() -> None:
+    """Go back to stripping reference-style links down to their text."""
+    global _resolve_links
+    _resolve_links = False
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL used as cache key.
+
+    Lower-cases scheme and host, drops default ports and fragments, and sorts
+    query parameters so equivalent URLs share one entry.
+
+    Args:
+        url (str): Any URL
+
+    Returns:
+        str: Normalized URL
+
+    Example:
+        >>> normalize_url("HTTPS://Phonetool.Amazon.com:443/users/x?b=2&a=1#top")
+        'https://phonetool.amazon.com/users/x?a=1&b=2'
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    try:
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    netloc = (parts.hostname or "").lower()
+    if port and (scheme, port) not in (("http", 80), ("https", 443)):
+        netloc = f"{netloc}:{port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+# Cache entry key holding a LazyResult's undecoded builder-mcp items
+_LAZY_ITEMS = "lazy_items"
+
+
+def _cache_lookup(url: str, cache: Optional[ResponseCache], lazy: bool = False) -> Optional[Dict[str, Any]]:
+    """Return a cached result for a URL, marked as a hit, or None."""
+    if cache is None:
+        return None
+    hit = cache.get(normalize_url(url))
+    if hit is None:
+        return None
+    result, age, tier = hit
+    if _LAZY_ITEMS in result:
+        # Stored undecoded by a lazy fetch: stay lazy, or decode for an eager caller
+        lazy_result = LazyResult(result, result.pop(_LAZY_ITEMS))
+        if lazy:
+            result = lazy_result
+        else:
+            lazy_result._resolve()
+            result = {key: dict.__getitem__(lazy_result, key) for key in dict.keys(lazy_result)}
+    result["url"] = url
+    result["metadata"]["cache"] = {"hit": True, "tier": tier, "age_seconds": round(age, 3)}
+    return result
+
+
+def _cache_store(results: List[Dict[str, Any]], cache: Optional[ResponseCache]) -> None:
+    """Store successful results; failures are never cached."""
+    if cache is None:
+        return
+    for result in results:
+        if not is_success(result):
+            continue
+        if isinstance(result, LazyResult) and result._stage < 2:
+            # Store the raw payload rather than decode the page just to cache it
+            entry = result._cache_entry()
+        else:
+            entry = {key: value for key, value in result.items() if key != "debug_info"}
+        if entry["metadata"].get("truncated"):
+            # A cut page must not be served to callers without the limit
+            continue
+        revalidated = cache.put(normalize_url(result["url"]), entry)
+        result["metadata"]["cache"] = {"hit": False, "revalidated": revalidated}
+
+
+def _fetch_and_cache(urls: List[str], timeout: int, debug: bool, pool: Optional[MCPSessionPool],
+                     cache: Optional[ResponseCache], lazy: bool = False) -> List[Dict[str, Any]]:
+    """_fetch_with_retries() followed by storing the results in the cache."""
+    results = _fetch_with_retries(urls, timeout, debug, pool, lazy)
+    _cache_store(results, cache)
+    _observe(results)
+    return results
+
+
+def _observe(results: List[Dict[str, Any]]) -> None:
+    """Record finished results in the default metrics registry, if any."""
+    if _default_metrics is not None:
+        for result in results:
+            _default_metrics.observe(result)
+
+
+def _admit(urls: List[str], pending: List[int], results: List[Optional[Dict[str, Any]]],
+           breaker: Optional[CircuitBreaker], backoff: float) -> List[int]:
+    """Indices of pending URLs whose host circuit is closed; the others fail with CIRCUIT_OPEN."""
+    if breaker is None:
+        return pending
+    allowed = []
+    for i in pending:
+        host = url_host(urls[i])
+        if breaker.allow(host):
+            allowed.append(i)
+        elif results[i] is None:
+            results[i] = _new_result(urls[i])
+            _set_error([results[i]], f"Circuit open for {host}", "CIRCUIT_OPEN",
+                       f"Too many consecutive failures; next probe in {breaker.retry_after(host):.1f} seconds")
+            results[i]["metadata"].update(attempts=0, backoff_ms=round(backoff * 1000))
+        else:
+            results[i]["warnings"].append(f"Not retried: circuit open for {host}")
+    return allowed
+
+
+def _record_attempt(urls: List[str], allowed: List[int], fetched: List[Dict[str, Any]],
+                    results: List[Optional[Dict[str, Any]]], attempts: int, backoff: float,
+                    waited: Optional[float], policy: Optional[RetryPolicy],
+                    breaker: Optional[CircuitBreaker]) -> List[int]:
+    """Store one attempt's results, report them to the breaker and return the indices to retry."""
+    retry = []
+    for i, result in zip(allowed, fetched):
+        result["metadata"]["attempts"] = attempts
+        result["metadata"]["backoff_ms"] = round(backoff * 1000)
+        if waited is not None:
+            result["metadata"]["rate_limit_wait_ms"] = round(waited * 1000)
+        results[i] = result
+        if breaker is not None:
+            breaker.record(url_host(urls[i]), result)
+        if policy is not None and policy.should_retry(result, attempts):
+            retry.append(i)
+    return retry
+
+
+def _next_backoff(policy: Optional[RetryPolicy], retry: List[int], results: List[Optional[Dict[str, Any]]],
+                  attempts: int, started: float) -> Optional[float]:
+    """Seconds to sleep before retrying, or None if nothing is retried (e.g. deadline reached)."""
+    if not retry:
+        return None
+    delay = policy.backoff(attempts)
+    if not policy.allows(time.monotonic() - started, delay):
+        for i in retry:
+            results[i]["warnings"].append(f"Retry deadline of {policy.deadline} seconds reached")
+        return None
+    return delay
+
+
+def _fetch_with_retries(urls: List[str], timeout: int, debug: bool,
+                        pool: Optional[MCPSessionPool], lazy: bool = False) -> List[Dict[str, Any]]:
+    """_fetch_urls() under the default retry policy, circuit breaker and rate limiter."""
+    policy, breaker, limiter = _default_retry_policy, _default_breaker, _default_rate_limiter
+    results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+    pending = list(range(len(urls)))
+    attempts, backoff = 0, 0.0
+    waited = 0.0 if limiter is not None else None
+    started = time.monotonic()
+    while True:
+        allowed = _admit(urls, pending, results, breaker, backoff)
+        if not allowed:
+            return results
+        attempts += 1
+        request_urls = [urls[i] for i in allowed]
+        if limiter is not None:
+            for host in dict.fromkeys(url_host(url) for url in request_urls):
+                waited += limiter.acquire(host)
+        fetched = _fetch_urls(request_urls, timeout, debug, pool, lazy)
+        pending = _record_attempt(urls, allowed, fetched, results, attempts, backoff, waited, policy, breaker)
+        delay = _next_backoff(policy, pending, results, attempts, started)
+        if delay is None:
+            return results
+        logger.debug(f"Retrying {len(pending)} URL(s) in {delay:.2f} seconds (attempt {attempts + 1})")
+        time.sleep(delay)
+        backoff += delay
+
+
+def _coalesced_copy(result: Dict[str, Any], url: str) -> Dict[str, Any]:
+    """Private copy of a shared result for another caller of the same URL."""
+    result = copy.deepcopy(result)
+    result["url"] = url
+    result["metadata"]["coalesced"] = True
+    return result
+
+
+class _SingleFlight:
+    """
+    Collapse concurrent fetches of the same normalized URL into one call.
+
+    The first caller (the leader) runs the fetch; callers arriving while it is
+    in flight wait for it and receive their own deep copy of the result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Dict[str, Any]] = {}
+
+    def do(self, url: str, fetch) -> Dict[str, Any]:
+        key = normalize_url(url)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event(), "result": None, "error": None}
+
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return _coalesced_copy(call["result"], url)
+
+        try:
+            result = fetch()
+            # Snapshot before returning, so the leader's caller can mutate its copy
+            call["result"] = copy.deepcopy(result)
+            return result
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+
+_single_flight = _SingleFlight()
+
+# In-flight asyncio fetches per (event loop, normalized URL)
+_async_in_flight: Dict[Tuple[int, str], "asyncio.Future[Dict[str, Any]]"] = {}
+
+
+def _fetch_chunk(urls: List[str], timeout: int, debug: bool, pool: Optional[MCPSessionPool],
+                 cache: Optional[ResponseCache], lazy: bool = False) -> List[Dict[str, Any]]:
+    """Fetch a request's worth of URLs; single URLs are shared with concurrent callers."""
+    if len(urls) == 1:
+        return [_single_flight.do(urls[0], lambda: _fetch_and_cache(urls, timeout, debug, pool, cache, lazy)[0])]
+    return _fetch_and_cache(urls, timeout, debug, pool, cache, lazy)
+
+
+def _plan_batch(urls: List[str], cache: Optional[ResponseCache],
+                chunk_size: int, lazy: bool = False) -> Tuple[List[Tuple[int, Dict[str, Any]]], Dict[str, List[Tuple[List[int], List[str]]]],
+                                          Dict[int, List[int]]]:
+    """
+    Split a batch into cache hits and per-host request chunks, fetching duplicates once.
+
+    Returns:
+        Tuple: (cache hits as (index, result), {host: [(indices, urls), ...]},
+            {index of first occurrence: [indices of duplicate URLs]})
+    """
+    first_index: Dict[str, int] = {}
+    duplicates: Dict[int, List[int]] = {}
+    hits: List[Tuple[int, Dict[str, Any]]] = []
+    by_host: Dict[str, List[Tuple[int, str]]] = {}
+
+    for index, url in enumerate(urls):
+        key = normalize_url(url)
+        if key in first_index:
+            duplicates.setdefault(first_index[key], []).append(index)
+            continue
+        first_index[key] = index
+        cached = _cache_lookup(url, cache, lazy)
+        if cached is not None:
+            hits.append((index, cached))
+        else:
+            by_host.setdefault(url_host(url), []).append((index, url))
+
+    chunks = {
+        host: [([i for i, _ in chunk], [u for _, u in chunk]) for chunk in _chunk(items, chunk_size)]
+        for host, items in by_host.items()
+    }
+    return hits, chunks, duplicates
+
+
+def _fan_out(urls: List[str], duplicates: Dict[int, List[int]], index: int,
+             result: Dict[str, Any]) -> List[Tuple[int, Dict[str, Any]]]:
+    """Hand a result to its own index and a private copy to every duplicate of its URL."""
+    return [(index, result)] + [(dup, _coalesced_copy(result, urls[dup])) for dup in duplicates.get(index, ())]
+
 
-def read_internal_website(url: str, timeout: int = 30, debug: bool = False) -> Dict[str, Any]:
+def _build_request(urls: List[str]) -> Dict[str, Any]:
+    """Build the JSON-RPC tools/call request for ReadInternalWebsites."""
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {
+            "name": "ReadInternalWebsites",
+            "arguments": {
+                "inputs": urls
+            }
+        }
+    }
+
+
+def _run_builder_mcp(request: Dict[str, Any], timeout: float, timer: Optional[PhaseTimer] = None,
+                     max_bytes: Optional[int] = None) -> subprocess.CompletedProcess:
+    """
+    Run a single request through a fresh builder-mcp process.
+
+    builder-mcp is exec'd directly (no shell), the request is written to its
+    stdin and stdout/stderr are read in chunks as they arrive. Output is kept
+    as bytes, which the JSON decoder takes as is, so it is never copied into
+    a str. If stdout grows past `max_bytes` (see _read_budget()), builder-mcp
+    is killed at once.
+
+    Marks the "spawn", "first_byte" and "read" phases on `timer`, if given.
+
+    Returns:
+        subprocess.CompletedProcess: stdout as bytes, stderr as str
+
+    Raises:
+        subprocess.TimeoutExpired: If builder-mcp does not finish in time
+        MCPResponseTooLargeError: If stdout exceeds `max_bytes`, with the
+            output read so far
+        FileNotFoundError: If builder-mcp is not installed
+    """
+    command = default_command()
+    deadline = time.monotonic() + timeout
+    proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if timer is not None:
+        timer.mark("spawn")
+    try:
+        try:
+            # The request is a few hundred bytes, well inside the pipe buffer
+            proc.stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        stdout, stderr = _read_output(proc, deadline, timeout, timer, max_bytes)
+        proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+        if timer is not None:
+            timer.mark("read")
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        proc.stdout.close()
+        proc.stderr.close()
+    return subprocess.CompletedProcess(command, proc.returncode, stdout, stderr.decode("utf-8", errors="replace"))
+
+
+def _read_output(proc: subprocess.Popen, deadline: float, timeout: float,
+                 timer: Optional[PhaseTimer], limit: Optional[int] = None) -> Tuple[bytes, bytes]:
+    """
+    Read stdout and stderr of `proc` until both are closed.
+
+    Raises:
+        subprocess.TimeoutExpired: If the deadline passes first
+        MCPResponseTooLargeError: If stdout exceeds `limit`
+    """
+    chunks: Dict[int, List[bytes]] = {proc.stdout.fileno(): [], proc.stderr.fileno(): []}
+    stdout_fd = proc.stdout.fileno()
+    received = 0
+    with selectors.DefaultSelector() as selector:
+        for fd in chunks:
+            selector.register(fd, selectors.EVENT_READ)
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(proc.args, timeout)
+            for key, _ in selector.select(remaining):
+                data = os.read(key.fd, 65536)
+                if not data:
+                    selector.unregister(key.fd)
+                    continue
+                chunks[key.fd].append(data)
+                if key.fd != stdout_fd:
+                    continue
+                if received == 0 and timer is not None:
+                    timer.mark("first_byte")
+                received += len(data)
+                if limit is not None and received > limit:
+                    # The error holds the only copy of the output read
+                    error = MCPResponseTooLargeError(f"builder-mcp was stopped after {received} bytes of output",
+                                                     b"".join(chunks[stdout_fd]), limit)
+                    chunks.clear()
+                    if timer is not None:
+                        timer.mark("read")
+                    raise error
+    return b"".join(chunks[stdout_fd]), b"".join(chunks[proc.stderr.fileno()])
+
+
+def read_internal_website(url: str, timeout: int = 30, debug: bool = False,
+                          pool: Optional[MCPSessionPool] = None,
+                          cache: Optional[ResponseCache] = None, lazy: bool = False) -> Dict[str, Any]:
     """
     Fetch data from any Amazon internal website using builder-mcp.
 
@@ -75,6 +811,12 @@ def read_internal_website(url: str, timeout: int = 30, debug: bool = False) -> D
         url (str): The internal website URL to fetch
         timeout (int): Timeout in seconds for the builder-mcp call (default: 30)
         debug (bool): Enable debug logging (default: False)
+        pool (MCPSessionPool): Persistent builder-mcp workers to use instead of
+            spawning a process (default: the pool from enable_session_pool(), if any)
+        cache (ResponseCache): Response cache to consult and fill
+            (default: the cache from enable_cache(), if any)
+        lazy (bool): Return a LazyResult that decodes the page only when its
+            fields are accessed (default: False)
 
     Returns:
         dict: JSON response with the following structure:
@@ -112,154 +854,658 @@ def read_internal_website(url: str, timeout: int = 30, debug: bool = False) -> D
         >>>     print(f"Content type: {data['content_type']}")
     """
 
+    cache = cache or _default_cache
+    cached = _cache_lookup(url, cache, lazy)
+    if cached is not None:
+        return cached
+    return _fetch_chunk([url], timeout, debug, pool, cache, lazy)[0]
+
+
+def _new_result(url: str) -> Dict[str, Any]:
+    """Initialize the response structure for one URL."""
+    return {
+        "success": False,
+        "url": url,
+        "timestamp": datetime.now().isoformat(),
+        "content": None,
+        "content_type": None,
+        "content_length": 0,
+        "warnings": [],
+        "metadata": {}
+    }
+
+
+def _set_error(results: List[Dict[str, Any]], error: str, error_code: Optional[str], details: Any) -> None:
+    """Mark every result in a request as failed with the same error."""
+    for response_data in results:
+        response_data["error"] = error
+        if error_code:
+            response_data["error_code"] = error_code
+        response_data["error_details"] = details
+
+
+def _fetch_urls(urls: List[str], timeout: int = 30, debug: bool = False,
+                pool: Optional[MCPSessionPool] = None, lazy: bool = False) -> List[Dict[str, Any]]:
+    """
+    Fetch one or more URLs with a single ReadInternalWebsites call.
+
+    All URLs go into the "inputs" array of one tools/call and the multi-item
+    result.content array is split back into one result per URL. If the number
+    of content items does not match the number of URLs, each URL is fetched
+    again on its own.
+
+    Args:
+        urls (List[str]): URLs to fetch in one JSON-RPC request
+        timeout (int): Timeout in seconds for the builder-mcp call
+        debug (bool): Enable debug logging
+        pool (MCPSessionPool): Persistent builder-mcp workers (default: enable_session_pool() pool)
+        lazy (bool): Return LazyResult objects (default: False)
+
+    Returns:
+        List[Dict[str, Any]]: One result dict per URL, in input order
+    """
+
     if debug:
         logger.setLevel(logging.DEBUG)
 
     start_time = time.time()
+    timer = PhaseTimer()
+    pool = pool or _default_pool
 
     # Build the correct JSON-RPC request
-    request = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/call",
-        "params": {
-            "name": "ReadInternalWebsites",
-            "arguments": {
-                "inputs": [url]
-            }
-        }
-    }
+    request = _build_request(urls)
+
+    logger.debug(f"Request: {json.dumps(request)}")
+
+    # Initialize response structure
+    results = [_new_result(url) for url in urls]
+
+    raw_output = None
+    try:
+        if pool is not None:
+            response = pool.call(request["method"], request["params"], timeout=timeout, timer=timer,
+                                 max_bytes=_read_budget(len(urls)))
+            process_info = {}
+        else:
+            result = _run_builder_mcp(request, timeout, timer, _read_budget(len(urls)))
+
+            logger.debug(f"Return code: {result.returncode}")
+            logger.debug(f"Stdout length: {len(result.stdout)} bytes")
+            logger.debug(f"Stderr: {result.stderr}")
+
+            if not result.stdout:
+                _set_error(results, "No response from builder-mcp", None,
+                           result.stderr if result.stderr else "Unknown error")
+                _set_timings(results, start_time, timer)
+                return results
+
+            # Parse the JSON-RPC response straight from the bytes read
+            raw_output = result.stdout
+            process_info = {"return_code": result.returncode, "stderr": result.stderr}
+            response = json_codec.loads(raw_output)
+            # Only the decoded response is kept from here on
+            raw_output = result = None
+            timer.mark("decode")
+
+        if not _populate_results(results, response, start_time, debug, process_info, lazy, timer):
+            results = [_fetch_urls([url], timeout, debug, pool, lazy)[0] for url in urls]
+            for response_data in results:
+                response_data["warnings"].append("Batched response did not match inputs; fetched individually")
+        return results
+
+    except Exception as e:
+        if _cut_off(e) and len(urls) > 1:
+            logger.warning(f"Batched response passed the content limit, fetching {len(urls)} URLs individually")
+            return [_fetch_urls([url], timeout, debug, pool, lazy)[0] for url in urls]
+        if _cut_off(e):
+            _set_truncated(results[0], e, timer)
+        else:
+            _set_fetch_error(results, e, timeout, debug, raw_output)
+        _set_timings(results, start_time, timer)
+        return results
+
+
+def _populate_results(results: List[Dict[str, Any]], response: Dict[str, Any], start_time: float,
+                      debug: bool, process_info: Dict[str, Any], lazy: bool = False,
+                      timer: Optional[PhaseTimer] = None) -> bool:
+    """
+    Split a parsed JSON-RPC response into the result dicts of its URLs.
+
+    With `lazy` (ignored in debug mode), each result is replaced in the list
+    by a LazyResult holding its undecoded item. The phases of the request so
+    far are taken from `timer`; "extract" and "detect" are added to it.
+
+    Returns:
+        bool: False if a batched response does not have one item per URL
+            (results are left untouched so the caller can fetch individually)
+    """
+    if lazy and not debug:
+        items = _text_items(response)
+        if items and (len(results) == 1 or len(items) == len(results)):
+            groups = [items] if len(results) == 1 else [[item] for item in items]
+            for index, group in enumerate(groups):
+                results[index] = LazyResult(results[index], group)
+                _set_timings([results[index]], start_time, timer)
+                if len(results) > 1:
+                    results[index]["metadata"]["batch_size"] = len(results)
+            return True
+
+    if len(results) == 1:
+        contents = [_extract_sized(response)]
+    else:
+        contents = _extract_all_sized(response)
+        if len(contents) != len(results):
+            logger.warning(f"Batched response had {len(contents)} items for {len(results)} URLs, "
+                           f"fetching individually")
+            return False
+    if timer is not None:
+        timer.mark("extract")
+
+    for response_data, (content, raw_length) in zip(results, contents):
+        _populate_result(response_data, content, response, start_time, debug, process_info, raw_length,
+                         timer.fork() if timer is not None and len(results) > 1 else timer)
+        if len(results) > 1:
+            response_data["metadata"]["batch_size"] = len(results)
+    return True
+
+
+def _set_fetch_error(results: List[Dict[str, Any]], error: BaseException, timeout: float, debug: bool,
+                     raw_output: Optional[Union[str, bytes]] = None) -> None:
+    """Translate an exception raised while talking to builder-mcp into error results."""
+    if isinstance(error, (subprocess.TimeoutExpired, MCPTimeoutError, asyncio.TimeoutError)):
+        _set_error(results, f"Timeout after {timeout} seconds", "TIMEOUT",
+                   "builder-mcp took too long to respond")
+
+    elif isinstance(error, subprocess.CalledProcessError):
+        _set_error(results, f"builder-mcp failed with exit code {error.returncode}", "SUBPROCESS_ERROR",
+                   str(error))
+
+    elif isinstance(error, MCPResponseTooLargeError):
+        _set_error(results, f"Response larger than {error.limit} bytes", "RESPONSE_TOO_LARGE", str(error))
+
+    elif isinstance(error, MCPSessionError):
+        _set_error(results, "builder-mcp session failed", "SUBPROCESS_ERROR", str(error))
+
+    elif isinstance(error, FileNotFoundError):
+        _set_error(results, "builder-mcp not found", "NOT_FOUND",
+                   "Install: toolbox install mcp-registry && mcp-registry install builder-mcp")
+
+    elif isinstance(error, json.JSONDecodeError):
+        _set_error(results, "Failed to parse response as JSON", "PARSE_ERROR", str(error))
+        if debug and raw_output is not None:
+            head = raw_output[:500]
+            if isinstance(head, bytes):
+                head = head.decode("utf-8", errors="replace")
+            for response_data in results:
+                response_data["debug_info"] = {"raw_output": head}
+
+    else:
+        _set_error(results, f"Unexpected error: {str(error)}", "UNKNOWN", str(error))
+
+
+def _read_budget(count: int) -> Optional[int]:
+    """Bytes of builder-mcp output read for a request of `count` URLs before it is stopped."""
+    limits = [_max_response_bytes]
+    if _max_content_bytes is not None:
+        limits.append(_max_content_bytes * count + _ENVELOPE_BYTES)
+    limits = [limit for limit in limits if limit is not None]
+    return min(limits) if limits else None
+
+
+def _cut_off(error: BaseException) -> bool:
+    """True if reading stopped at the content limit rather than failing at the response limit."""
+    return (isinstance(error, MCPResponseTooLargeError) and _max_content_bytes is not None
+            and error.limit != _max_response_bytes)
+
+
+def _set_truncated(response_data: Dict[str, Any], error: MCPResponseTooLargeError,
+                   timer: Optional[PhaseTimer] = None) -> None:
+    """Fill a result from the start of a single-URL response cut off at the content limit."""
+    content, has_links, complete = _content_prefix(error)
+    if timer is not None:
+        timer.mark("decode")
+    if content is _STRUCTURED or not complete and content and _opens_like_json(content):
+        # Structured content is never cut: a prefix of it is not the page
+        _set_error([response_data], f"Structured page is larger than the content limit of {_max_content_bytes} bytes",
+                   "CONTENT_TOO_LARGE", "JSON pages are not truncated; raise the limit to fetch this page")
+        response_data["content_type"] = "json"
+        response_data["metadata"]["truncated"] = True
+        return
+    if not content:
+        _set_error([response_data], "Response was cut off before any content", "EXTRACTION_FAILED", str(error))
+        return
+    if has_links:
+        content = clean_markdown_links(content)
+    response_data["success"] = True
+    if _set_content(response_data, content, None) or not complete:
+        _mark_truncated(response_data)
+    if timer is not None:
+        timer.mark("detect")
+
+
+def _content_prefix(error: MCPResponseTooLargeError) -> Tuple[Any, bool, bool]:
+    """
+    The page text at the start of a cut-off response.
+
+    Decodes the first result.content text item as far as it was read and,
+    when that is the usual nested {"url": ..., "content": "..."} JSON, the
+    content string inside it. Each stage is released as soon as the next
+    one is decoded, so only one copy of the page is held at a time.
+
+    Returns:
+        Tuple: (page text, None, or _STRUCTURED for a builderhub page, whether
+            clean_markdown_links() applies, whether the page ended within what
+            was read)
+    """
+    partial, error.partial = error.partial, b""
+    # Not final: a character cut in half at the end is dropped
+    output = codecs.getincrementaldecoder("utf-8")(errors="replace").decode(partial)
+    del partial
+    match = _TEXT_FIELD_RE.search(output)
+    if match is None:
+        return None, False, False
+    try:
+        text, complete = json_codec.string_prefix(output, match.end() - 1)
+    except ValueError:
+        return None, False, False
+    del output
+    first = _NON_SPACE_RE.search(text)
+    if first is None or text[first.start()] != "{":
+        return text, False, complete
+    match = _CONTENT_FIELD_RE.search(text)
+    if _PROCESSED_FIELD_RE.search(text, 0, match.start() if match else len(text)):
+        return _STRUCTURED, False, False
+    if match is None:
+        return None, False, False
+    try:
+        content, complete = json_codec.string_prefix(text, match.end() - 1)
+    except ValueError:
+        return None, False, False
+    return content, True, complete
+
+
+# Returned by _content_prefix() for a cut-off builderhub page
+_STRUCTURED = object()
+
+
+def _opens_like_json(content: str) -> bool:
+    """
+    Whether the start of a cut-off page is a JSON object or array.
+
+    Decodes the first member key or element in the detection head and checks
+    what follows it, so a page such as "[1] notes" is not taken for JSON.
+    """
+    first = _NON_SPACE_RE.search(content, 0, _DETECT_HEAD)
+    if first is None or content[first.start()] not in "{[":
+        return False
+    head = content[:_DETECT_HEAD]
+    opening = head[first.start()]
+    following = _NON_SPACE_RE.search(head, first.start() + 1)
+    if following is None:
+        return True
+    if opening == "{" and head[following.start()] not in '"}':
+        return False
+    if head[following.start()] in "}]":
+        end = following.start()
+    else:
+        try:
+            _, end = _JSON_DECODER.raw_decode(head, following.start())
+        except ValueError:
+            # A string, object or array element may just run past the head
+            return head[following.start()] in '"{['
+    after = _NON_SPACE_RE.search(head, end)
+    if after is None:
+        return True
+    if opening == "{" and head[following.start()] == '"':
+        return head[after.start()] == ":"
+    if head[after.start()] == ",":
+        return True
+    # A closed array or object must end the page
+    return head[after.start()] in "}]" and _NON_SPACE_RE.search(head, after.start() + 1) is None
+
+
+def _truncate_text(content: str, max_bytes: int) -> Tuple[str, bool]:
+    """
+    Cut text to at most `max_bytes` bytes of UTF-8, on a character boundary.
+
+    Returns:
+        Tuple[str, bool]: (the text, whether it was cut)
+    """
+    if len(content) * 4 <= max_bytes:
+        return content, False
+    if content.isascii():
+        return (content[:max_bytes], True) if len(content) > max_bytes else (content, False)
+    encoded = content.encode("utf-8", errors="surrogatepass")
+    if len(encoded) <= max_bytes:
+        return content, False
+    return encoded[:max_bytes].decode("utf-8", errors="ignore"), True
+
+
+def _mark_truncated(response_data: Dict[str, Any]) -> None:
+    response_data["metadata"]["truncated"] = True
+    response_data["warnings"].append(f"Content truncated: the page is larger than {_max_content_bytes} bytes")
+
+
+def _populate_result(response_data: Dict[str, Any], content: Any, response: Dict[str, Any],
+                     start_time: float, debug: bool, process_info: Dict[str, Any],
+                     raw_length: Optional[int] = None, timer: Optional[PhaseTimer] = None) -> None:
+    """
+    Fill a result dict from the content extracted for its URL.
+
+    String content is decoded at most once: a JSON page is parsed while its
+    type is detected and the parsed object is stored directly.
+
+    Args:
+        response_data (dict): Result dict to update in place
+        content: Content extracted from the JSON-RPC response, or None
+        response (dict): Parsed JSON-RPC response from builder-mcp
+        start_time (float): time.time() when the fetch started
+        debug (bool): Attach debug_info
+        process_info (dict): Extra debug fields (return code, stderr) if any
+        raw_length (int): Length of the JSON text `content` was decoded from, if known
+        timer (PhaseTimer): Phases of the request so far; "detect" is added
+    """
+    if content:
+        _set_status(response_data, content)
+        if _set_content(response_data, content, raw_length):
+            _mark_truncated(response_data)
+        if timer is not None:
+            timer.mark("detect")
+
+        # Add metadata
+        _set_timings([response_data], start_time, timer)
+
+        # Add debug info if requested
+        if debug:
+            response_data["debug_info"] = {"raw_response": response, **process_info}
+    else:
+        _set_extraction_failed(response_data)
+        _set_timings([response_data], start_time, timer)
+        if debug:
+            response_data["debug_info"] = {"raw_response": response}
+
+
+def _set_timings(results: List[Dict[str, Any]], start_time: float, timer: Optional[PhaseTimer]) -> None:
+    """Record fetch_duration_ms and, with a timer, the per-phase timings_ms of finished results."""
+    duration_ms = int((time.time() - start_time) * 1000)
+    for response_data in results:
+        response_data["metadata"]["fetch_duration_ms"] = duration_ms
+        if timer is not None:
+            response_data["metadata"]["timings_ms"] = timer.as_ms()
+
+
+def _set_status(response_data: Dict[str, Any], content: Any) -> None:
+    """Set success, or the error fields if MCP returned an error in the content."""
+    if isinstance(content, dict) and content.get("status") == "error":
+        response_data["success"] = False
+        response_data["error"] = "MCP returned error"
+        response_data["error_code"] = "MCP_ERROR"
+        response_data["error_details"] = content.get("error", "Unknown MCP error")
+    else:
+        response_data["success"] = True
+
+
+def _set_content(response_data: Dict[str, Any], content: Any, raw_length: Optional[int]) -> bool:
+    """
+    Set content, content_type and content_length from extracted (non-empty) content.
+
+    Returns:
+        bool: True if text content was cut to the limit from enable_content_limit()
+    """
+    truncated = False
+    if isinstance(content, dict):
+        # Content is already a dict (JSON object), or an MCP error which is still included
+        response_data["content"] = content
+        response_data["content_type"] = "json"
+        response_data["content_length"] = _json_length(content, raw_length)
+    else:
+        # Content is a string - detect type, parsing JSON in the same pass
+        content_type, decoded = _decode_content(content)
+        if _max_content_bytes is not None and content_type != "json":
+            # Only text is cut; a JSON page read whole is kept whole
+            content, truncated = _truncate_text(content, _max_content_bytes)
+            if truncated:
+                content_type, decoded = _detect_text_type(content), content
+        response_data["content_type"], response_data["content"] = content_type, decoded
+        response_data["content_length"] = len(content)
+    return truncated
+
+
+def _set_extraction_failed(response_data: Dict[str, Any]) -> None:
+    response_data["error"] = "Failed to extract content from response"
+    response_data["error_code"] = "EXTRACTION_FAILED"
+    response_data["error_details"] = "Response structure not recognized"
+
+
+def _json_length(content: Any, raw_length: Optional[int]) -> int:
+    """Length of the JSON text behind decoded content, re-serializing only if it is unknown."""
+    return raw_length if raw_length is not None else len(json.dumps(content))
+
+
+def _decode_content(content: str) -> Tuple[str, Any]:
+    """
+    Detect the type of string content, decoding JSON at most once.
+
+    Returns:
+        Tuple[str, Any]: (content type, parsed object for JSON else the string)
+    """
+    if _looks_like_json(content):
+        try:
+            return "json", json_codec.loads(content)
+        except (ValueError, RecursionError):
+            pass
+    return _detect_text_type(content), content
+
+
+def _looks_like_json(content: str) -> bool:
+    """
+    Cheap pre-check before attempting a JSON decode.
 
-    logger.debug(f"Request: {json.dumps(request)}")
+    The first and last non-space characters must be a matching pair of
+    brackets, the character after the opening bracket must be able to start
+    a member or value, and the one before the closing bracket must be able to
+    end a value. Looks only at the detection windows.
+    """
+    first = _NON_SPACE_RE.search(content, 0, _DETECT_HEAD)
+    if first is None or content[first.start()] not in "{[":
+        return False
+    last = _LAST_NON_SPACE_RE.search(content, max(0, len(content) - _DETECT_TAIL))
+    if last is None or last.start() == first.start():
+        return False
+    opening, closing = content[first.start()], content[last.start()]
+    if closing != ("}" if opening == "{" else "]"):
+        return False
+    following = _NON_SPACE_RE.search(content, first.start() + 1, last.start() + 1)
+    if content[following.start()] not in ('"}' if opening == "{" else _JSON_VALUE_START):
+        return False
+    if following.start() == last.start():
+        return True  # empty object or array
+    preceding = _LAST_NON_SPACE_RE.search(content, max(following.start(), last.start() - _DETECT_TAIL), last.start())
+    return preceding is None or content[preceding.start()] in _JSON_VALUE_END
+
+
+class LazyResult(dict):
+    """
+    A fetch result that decodes its content only when it is looked at.
 
-    # Initialize response structure
-    response_data = {
-        "success": False,
-        "url": url,
-        "timestamp": datetime.now().isoformat(),
-        "content": None,
-        "content_type": None,
-        "content_length": 0,
-        "warnings": [],
-        "metadata": {}
-    }
+    Returned by the fetch functions when called with lazy=True. It is a dict
+    with the same keys as an eager result, but holds this URL's raw
+    builder-mcp text and does the work in two stages:
 
-    try:
-        # Execute builder-mcp with the request using echo pipe (proven method)
-        cmd = f"echo '{json.dumps(request)}' | builder-mcp"
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-
-        logger.debug(f"Return code: {result.returncode}")
-        logger.debug(f"Stdout length: {len(result.stdout)}")
-        logger.debug(f"Stderr: {result.stderr}")
-
-        if not result.stdout:
-            response_data["error"] = "No response from builder-mcp"
-            response_data["error_details"] = result.stderr if result.stderr else "Unknown error"
-            return response_data
-
-        # Parse the JSON-RPC response
-        response = json.loads(result.stdout)
-
-        # Extract the content from the nested structure
-        content = extract_content(response)
-
-        if content:
-            # Check if MCP returned an error in the content
-            if isinstance(content, dict) and content.get("status") == "error":
-                response_data["success"] = False
-                response_data["error"] = "MCP returned error"
-                response_data["error_code"] = "MCP_ERROR"
-                response_data["error_details"] = content.get("error", "Unknown MCP error")
-                response_data["content"] = content  # Still include the error content
-                response_data["content_type"] = "json"
-                response_data["content_length"] = len(json.dumps(content))
-            else:
-                response_data["success"] = True
-
-                # Determine content type first
-                if isinstance(content, dict):
-                    # Content is already a dict (JSON object)
-                    response_data["content"] = content
-                    response_data["content_type"] = "json"
-                    # Calculate length from JSON string representation
-                    response_data["content_length"] = len(json.dumps(content))
-                else:
-                    # Content is a string - detect type
-                    response_data["content_type"] = detect_content_type(content)
-
-                    # If it's JSON string, parse it to object
-                    if response_data["content_type"] == "json":
-                        try:
-                            response_data["content"] = json.loads(content)
-                            response_data["content_length"] = len(content)
-                        except json.JSONDecodeError:
-                            # If parsing fails, keep as string
-                            response_data["content"] = content
-                            response_data["content_length"] = len(content)
-                            response_data["warnings"].append("Content detected as JSON but failed to parse")
-                    else:
-                        # For non-JSON content, keep as string
-                        response_data["content"] = content
-                        response_data["content_length"] = len(content)
-
-            # Add metadata
-            duration_ms = int((time.time() - start_time) * 1000)
-            response_data["metadata"]["fetch_duration_ms"] = duration_ms
-
-            # Add debug info if requested
-            if debug:
-                response_data["debug_info"] = {
-                    "raw_response": response,
-                    "return_code": result.returncode,
-                    "stderr": result.stderr
-                }
+    - success / error / error_code / error_details: parses the page's JSON-RPC
+      item (needed to tell a page from an MCP error)
+    - content / content_type / content_length: also cleans up markdown links,
+      detects the content type and decodes JSON pages
+
+    Callers that only check is_success(), or that archive `raw`, never pay for
+    the second stage. Iterating, copying, comparing or serializing the result
+    (e.g. json.dumps) decodes everything first; deep copies and pickles stay
+    lazy.
+
+    Example:
+        >>> data = read_internal_website("https://issues.amazon.com/issues/P1", lazy=True)
+        >>> if is_success(data):
+        >>>     archive.write(data.raw)   # content was never decoded
+    """
+
+    _STATUS_KEYS = frozenset({"success", "error", "error_code", "error_details"})
+    _CONTENT_KEYS = frozenset({"content", "content_type", "content_length"})
+
+    def __init__(self, base: Dict[str, Any], items: List[Dict[str, Any]]):
+        super().__init__((key, value) for key, value in base.items()
+                         if key not in self._STATUS_KEYS and key not in self._CONTENT_KEYS)
+        self._items = items
+        self._stage = 0
+        self._content: Any = None
+        self._raw_length: Optional[int] = None
+        self._has_links = False
+
+    @property
+    def raw(self) -> Optional[str]:
+        """The undecoded text builder-mcp returned for this URL."""
+        for item in self._items:
+            if isinstance(item, dict) and "text" in item:
+                return item["text"]
+        return None
+
+    def _cache_entry(self) -> Dict[str, Any]:
+        """The result as a cache entry that keeps the raw items instead of decoded content."""
+        entry = {key: dict.__getitem__(self, key) for key in dict.keys(self) if key != "debug_info"}
+        entry[_LAZY_ITEMS] = self._items
+        return entry
+
+    def _resolve_status(self) -> None:
+        if self._stage >= 1:
+            return
+        self._stage = 1
+        for item in self._items:
+            self._content, self._raw_length, self._has_links = _extract_item_parts(item)
+            if self._content is not None:
+                break
+        # Fields are built in a plain dict so storing them does not re-enter the lazy hooks
+        fields: Dict[str, Any] = {}
+        if self._content:
+            _set_status(fields, self._content)
+        else:
+            fields["success"] = False
+            _set_extraction_failed(fields)
+        dict.update(self, fields)
+
+    def _resolve(self) -> None:
+        if self._stage >= 2:
+            return
+        self._resolve_status()
+        self._stage = 2
+        fields: Dict[str, Any] = {"content": None, "content_type": None, "content_length": 0}
+        if self._content:
+            content = clean_markdown_links(self._content) if self._has_links else self._content
+            if _set_content(fields, content, self._raw_length):
+                _mark_truncated(self)
+        dict.update(self, fields)
+        self._content = None
+        # Same key order as an eager result, so serialized output is identical
+        current = {key: dict.__getitem__(self, key) for key in dict.keys(self)}
+        dict.clear(self)
+        dict.update(self, {key: current.pop(key) for key in _new_result("") if key in current})
+        dict.update(self, current)
+
+    def __missing__(self, key: str) -> Any:
+        if key in self._STATUS_KEYS and self._stage < 1:
+            self._resolve_status()
+        elif key in self._CONTENT_KEYS and self._stage < 2:
+            self._resolve()
         else:
-            response_data["error"] = "Failed to extract content from response"
-            response_data["error_code"] = "EXTRACTION_FAILED"
-            response_data["error_details"] = "Response structure not recognized"
-            if debug:
-                response_data["debug_info"] = {"raw_response": response}
-
-        return response_data
-
-    except subprocess.TimeoutExpired:
-        response_data["error"] = f"Timeout after {timeout} seconds"
-        response_data["error_code"] = "TIMEOUT"
-        response_data["error_details"] = "builder-mcp took too long to respond"
-        return response_data
-
-    except subprocess.CalledProcessError as e:
-        response_data["error"] = f"builder-mcp failed with exit code {e.returncode}"
-        response_data["error_code"] = "SUBPROCESS_ERROR"
-        response_data["error_details"] = str(e)
-        return response_data
-
-    except FileNotFoundError:
-        response_data["error"] = "builder-mcp not found"
-        response_data["error_code"] = "NOT_FOUND"
-        response_data["error_details"] = "Install: toolbox install mcp-registry && mcp-registry install builder-mcp"
-        return response_data
-
-    except json.JSONDecodeError as e:
-        response_data["error"] = "Failed to parse response as JSON"
-        response_data["error_code"] = "PARSE_ERROR"
-        response_data["error_details"] = str(e)
-        if debug and 'result' in locals():
-            response_data["debug_info"] = {"raw_output": result.stdout[:500]}
-        return response_data
+            raise KeyError(key)
+        return self[key]
 
-    except Exception as e:
-        response_data["error"] = f"Unexpected error: {str(e)}"
-        response_data["error_code"] = "UNKNOWN"
-        response_data["error_details"] = str(e)
-        return response_data
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._CONTENT_KEYS or key == "success":
+            return True
+        if key in self._STATUS_KEYS:
+            self._resolve_status()
+        return dict.__contains__(self, key)
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._STATUS_KEYS or key in self._CONTENT_KEYS:
+            self._resolve()
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._STATUS_KEYS or key in self._CONTENT_KEYS:
+            self._resolve()
+        dict.__delitem__(self, key)
+
+    def __eq__(self, other: object) -> bool:
+        self._resolve()
+        if isinstance(other, LazyResult):
+            other._resolve()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "LazyResult":
+        clone = LazyResult.__new__(LazyResult)
+        dict.update(clone, copy.deepcopy({key: dict.__getitem__(self, key) for key in dict.keys(self)}, memo))
+        # The raw items are never mutated, so copies share them
+        clone._items = self._items
+        clone._stage = self._stage
+        clone._content = copy.deepcopy(self._content, memo)
+        clone._raw_length = self._raw_length
+        clone._has_links = self._has_links
+        return clone
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # The default dict pickling would decode everything and restore the items
+        # before the attributes the lazy hooks need; pickle the undecoded state instead
+        fields = {key: dict.__getitem__(self, key) for key in dict.keys(self)}
+        return _restore_lazy_result, (fields, self._items, self._stage, self._content, self._raw_length,
+                                      self._has_links)
+
+    def _decoded(method):
+        def wrapper(self, *args, **kwargs):
+            self._resolve()
+            return method(self, *args, **kwargs)
+        wrapper.__name__ = method.__name__
+        return wrapper
+
+    keys = _decoded(dict.keys)
+    values = _decoded(dict.values)
+    items = _decoded(dict.items)
+    copy = _decoded(dict.copy)
+    pop = _decoded(dict.pop)
+    popitem = _decoded(dict.popitem)
+    setdefault = _decoded(dict.setdefault)
+    update = _decoded(dict.update)
+    __iter__ = _decoded(dict.__iter__)
+    __len__ = _decoded(dict.__len__)
+    __repr__ = _decoded(dict.__repr__)
+    del _decoded
+
+    __hash__ = None
+
+
+def _restore_lazy_result(fields: Dict[str, Any], items: List[Dict[str, Any]], stage: int, content: Any,
+                         raw_length: Optional[int], has_links: bool) -> LazyResult:
+    """Rebuild an unpickled LazyResult, as undecoded as the one pickled."""
+    result = LazyResult.__new__(LazyResult)
+    dict.update(result, fields)
+    result._items = items
+    result._stage = stage
+    result._content = content
+    result._raw_length = raw_length
+    result._has_links = has_links
+    return result
 
 
 def detect_content_type(content: Union[str, dict]) -> str:
@@ -284,43 +1530,186 @@ def detect_content_type(content: Union[str, dict]) -> str:
     if not content or not isinstance(content, str):
         return "unknown"
 
-    # Check for JSON string
-    if content.strip().startswith('{') or content.strip().startswith('['):
+    # Check for JSON string; pages too large to validate cheaply are judged by shape
+    if _looks_like_json(content):
+        if len(content) > _DETECT_HEAD:
+            return "json"
         try:
-            json.loads(content)
+            json_codec.loads(content)
             return "json"
-        except:
+        except (ValueError, RecursionError):
             pass
 
+    return _detect_text_type(content)
+
+
+def _detection_windows(content: str) -> Tuple[Tuple[int, int], ...]:
+    """(start, end) spans examined by content type detection: the whole page if small, else both ends."""
+    length = len(content)
+    if length <= _DETECT_HEAD + _DETECT_TAIL:
+        return ((0, length),)
+    return ((0, _DETECT_HEAD), (length - _DETECT_TAIL, length))
+
+
+def _detect_text_type(content: str) -> str:
+    """
+    Classify non-JSON string content as html, markdown or text.
+
+    Only the detection windows are scanned, with precompiled patterns and
+    bounded str.find/count calls, so the cost does not grow with the page and
+    no copy of the page is made.
+    """
+    windows = _detection_windows(content)
+
     # Check for HTML
-    if '<html' in content.lower() or '<!doctype' in content.lower():
-        return "html"
-    if '<div' in content or '<p>' in content or '<h1' in content:
-        return "html"
+    for start, end in windows:
+        if _HTML_DOCUMENT_RE.search(content, start, end) or _HTML_TAG_RE.search(content, start, end):
+            return "html"
 
     # Check for Markdown table (common in code.amazon.com)
-    if '|---|' in content and content.count('|') > 10:
-        return "markdown"
+    if any(content.find('|---|', start, end) != -1 for start, end in windows):
+        if sum(content.count('|', start, end) for start, end in windows) > 10:
+            return "markdown"
 
     # Check for Markdown headers
-    if content.startswith('#') or '\n#' in content:
+    if content.startswith('#') or any(content.find('\n#', start, end) != -1 for start, end in windows):
         return "markdown"
 
     # Default to plain text
     return "text"
 
 
-def extract_content(response: Dict[str, Any]) -> Optional[str]:
+def _extract_item(item: Any) -> Tuple[Optional[Any], Optional[int]]:
     """
-    Extract the actual content from the nested JSON-RPC response structure.
+    Extract the content of one item of a JSON-RPC result.content array.
 
     Args:
-        response (dict): The JSON-RPC response from builder-mcp
+        item: One element of result.content, normally {"type": "text", "text": "..."}
 
     Returns:
-        str or None: The extracted content, or None if not found
+        Tuple: (extracted content (str or dict) or None, length of the JSON
+            text a dict was decoded from, or None if it is not known)
+    """
+    content, raw_length, has_links = _extract_item_parts(item)
+    if has_links:
+        content = clean_markdown_links(content)
+    return content, raw_length
+
+
+def _extract_item_parts(item: Any) -> Tuple[Optional[Any], Optional[int], bool]:
+    """
+    _extract_item() without the link cleanup stage.
+
+    Returns:
+        Tuple: (content, raw length, whether clean_markdown_links() still applies)
+    """
+    if not (isinstance(item, dict) and "text" in item):
+        return None, None, False
+
+    # Parse the nested JSON in the text field
+    try:
+        nested = json_codec.loads(item["text"])
+    except ValueError:
+        # If not JSON, return the text directly
+        return item["text"], None, False
+
+    # Handle builderhub-specific structure with processedContent
+    if isinstance(nested, dict) and "processedContent" in nested:
+        # For builderhub, return the entire structure as dict together with
+        # the length of the text it came from, so it is never re-serialized
+        return nested, len(item["text"]), False
+
+    # Handle other structures
+    if isinstance(nested, dict) and "content" in nested:
+        if isinstance(nested["content"], dict) and "content" in nested["content"]:
+            content = nested["content"]["content"]
+        else:
+            content = nested["content"]
+        # Markdown link artifacts are cleaned up as a separate stage
+        return content, None, isinstance(content, str)
+
+    return None, None, False
+
+
+def clean_markdown_links(content: str, resolve: Optional[bool] = None) -> str:
+    """
+    Post-process reference-style markdown links in fetched content.
+
+    builder-mcp renders links as "[text][1]" with "[1]: https://..."
+    definitions. By default the reference is stripped, leaving "text". With
+    `resolve`, a link whose definition is present becomes an inline link
+    "[text](https://...)" instead (others are still stripped); the first of
+    duplicate definitions wins, and lines inside fenced code blocks are not
+    definitions. Both use precompiled patterns and a single pass over the
+    content.
+
+    Args:
+        content (str): Markdown text
+        resolve (bool): Resolve links to their targets (default: the setting
+            from enable_link_resolution())
+
+    Returns:
+        str: The processed text
+
+    Example:
+        >>> clean_markdown_links("See [docs][1].\n\n[1]: https://w.amazon.com/docs")
+        'See docs.\n\n[1]: https://w.amazon.com/docs'
+        >>> clean_markdown_links("See [docs][1].\n\n[1]: https://w.amazon.com/docs", resolve=True)
+        'See [docs](https://w.amazon.com/docs).\n\n[1]: https://w.amazon.com/docs'
+    """
+    if "][" not in content:
+        return content
+    if resolve is None:
+        resolve = _resolve_links
+    # split() is much faster than sub() with a replacement on multi-MB text:
+    # it yields [text, link text, reference number, text, ...]
+    parts = _REFERENCE_LINK_RE.split(content)
+    targets = {}
+    if resolve:
+        targets = _link_definitions(content)
+    if targets:
+        for i in range(1, len(parts), 3):
+            target = targets.get(parts[i + 1])
+            if target:
+                parts[i] = f"[{parts[i]}]({target})"
+    del parts[2::3]
+    return "".join(parts)
+
+
+def _link_definitions(content: str) -> Dict[str, str]:
     """
+    The "[N]: target" definitions of a page, by reference number.
 
+    As in CommonMark, the first definition of a number wins and lines inside
+    fenced code blocks are not definitions.
+    """
+    fences = []
+    if "```" in content or "~~~" in content:
+        fence = None
+        for match in _CODE_FENCE_RE.finditer(content):
+            marker = match.group(1)
+            if fence is None:
+                fence = (marker, match.start())
+            elif marker[0] == fence[0][0] and len(marker) >= len(fence[0]):
+                fences.append((fence[1], match.end()))
+                fence = None
+        if fence is not None:
+            # An unclosed fence runs to the end of the page
+            fences.append((fence[1], len(content)))
+    targets: Dict[str, str] = {}
+    fence_index = 0
+    for match in _LINK_DEFINITION_RE.finditer(content):
+        # Matches and fences both come in page order
+        while fence_index < len(fences) and fences[fence_index][1] <= match.start():
+            fence_index += 1
+        if fence_index < len(fences) and fences[fence_index][0] <= match.start():
+            continue
+        targets.setdefault(match.group(1), match.group(2))
+    return targets
+
+
+def _extract_sized(response: Dict[str, Any]) -> Tuple[Optional[Any], Optional[int]]:
+    """extract_content() that also returns the raw JSON length of dict content, if known."""
     try:
         # Handle JSON-RPC response structure
         if "result" in response and "content" in response["result"]:
@@ -329,73 +1718,673 @@ def extract_content(response: Dict[str, Any]) -> Optional[str]:
             # Handle array of content objects
             if isinstance(result_content, list):
                 for item in result_content:
-                    if isinstance(item, dict) and "text" in item:
-                        # Parse the nested JSON in the text field
-                        try:
-                            nested = json.loads(item["text"])
-
-                            # Handle builderhub-specific structure with processedContent
-                            if isinstance(nested, dict) and "processedContent" in nested:
-                                # For builderhub, return the entire structure as dict
-                                # It will be converted to JSON string in the main function
-                                return nested
-
-                            # Handle other structures
-                            if "content" in nested:
-                                if isinstance(nested["content"], dict) and "content" in nested["content"]:
-                                    content = nested["content"]["content"]
-                                else:
-                                    content = nested["content"]
-                                # Clean up any markdown link artifacts
-                                if isinstance(content, str):
-                                    import re
-                                    content = re.sub(r'\[([^\]]+)\]\[\d+\]', r'\1', content)
-                                return content
-                        except json.JSONDecodeError:
-                            # If not JSON, return the text directly
-                            return item["text"]
+                    content, raw_length = _extract_item(item)
+                    if content is not None:
+                        return content, raw_length
 
             # Handle direct content
             elif isinstance(result_content, dict) and "content" in result_content:
-                return result_content["content"]
+                return result_content["content"], None
             elif isinstance(result_content, str):
-                return result_content
+                return result_content, None
 
         # Fallback: check for direct content field
         if "content" in response:
             if isinstance(response["content"], dict) and "content" in response["content"]:
-                return response["content"]["content"]
-            return response["content"]
+                return response["content"]["content"], None
+            return response["content"], None
 
     except Exception as e:
         logger.error(f"Error extracting content: {e}")
 
-    return None
+    return None, None
+
 
+def _text_items(response: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """The text items of a JSON-RPC result.content array, or None if there is no array."""
+    result_content = response.get("result", {}).get("content") if isinstance(response, dict) else None
+    if not isinstance(result_content, list):
+        return None
+    return [item for item in result_content if isinstance(item, dict) and "text" in item]
 
-def read_internal_websites(urls: List[str], timeout: int = 30, debug: bool = False) -> List[Dict[str, Any]]:
+
+def _extract_all_sized(response: Dict[str, Any]) -> List[Tuple[Optional[Any], Optional[int]]]:
+    """extract_contents() with the raw JSON length of each dict content, if known."""
+    result_content = response.get("result", {}).get("content") if isinstance(response, dict) else None
+    if not isinstance(result_content, list):
+        return []
+
+    contents = []
+    for item in result_content:
+        if isinstance(item, dict) and "text" in item:
+            try:
+                contents.append(_extract_item(item))
+            except Exception as e:
+                logger.error(f"Error extracting content: {e}")
+                contents.append((None, None))
+    return contents
+
+
+def extract_content(response: Dict[str, Any]) -> Optional[str]:
+    """
+    Extract the actual content from the nested JSON-RPC response structure.
+
+    Args:
+        response (dict): The JSON-RPC response from builder-mcp
+
+    Returns:
+        str or None: The extracted content, or None if not found
+    """
+    return _extract_sized(response)[0]
+
+
+def extract_contents(response: Dict[str, Any]) -> List[Optional[Any]]:
+    """
+    Split a multi-URL JSON-RPC response into one content entry per item.
+
+    When several URLs are sent in one ReadInternalWebsites call, builder-mcp
+    answers with one result.content item per input, in input order.
+
+    Args:
+        response (dict): The JSON-RPC response from builder-mcp
+
+    Returns:
+        List: Extracted content (or None) for each text item in result.content
+    """
+    return [content for content, _ in _extract_all_sized(response)]
+
+
+def url_host(url: str) -> str:
+    """
+    Get the lower-cased hostname of a URL, used to group per-site limits.
+
+    Args:
+        url (str): Any URL
+
+    Returns:
+        str: Hostname, or "" if the URL has none
+    """
+    return (urlsplit(url).hostname or "").lower()
+
+
+def _chunk(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """Split a list into consecutive chunks of at most `size` items."""
+    size = max(1, size)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def iter_internal_websites(urls: List[str], timeout: int = 30, debug: bool = False,
+                           pool: Optional[MCPSessionPool] = None, max_workers: int = 1,
+                           per_host_limit: Optional[int] = None, chunk_size: int = 1,
+                           cache: Optional[ResponseCache] = None,
+                           lazy: bool = False) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Fetch multiple URLs concurrently, yielding results as they complete.
+
+    Up to `max_workers` fetches run at once. With `per_host_limit`, no more
+    than that many fetches for the same hostname are in flight at any time;
+    URLs for a saturated host wait in a queue without holding a worker, so
+    other hosts keep the workers busy.
+
+    With `chunk_size` > 1, up to that many URLs of the same host are packed
+    into the "inputs" array of a single ReadInternalWebsites call, and each
+    such call counts as one fetch for the worker and per-host limits.
+
+    Cached URLs are yielded first without using a worker. A URL that appears
+    several times (after normalize_url()) is fetched once and every position
+    receives its own copy of the result, marked metadata["coalesced"].
+
+    Args:
+        urls (List[str]): List of internal website URLs to fetch
+        timeout (int): Timeout in seconds for each fetch (default: 30)
+        debug (bool): Enable debug logging (default: False)
+        pool (MCPSessionPool): Persistent builder-mcp workers to reuse for every URL
+        max_workers (int): Maximum concurrent fetches (default: 1, sequential)
+        per_host_limit (int): Maximum concurrent fetches per hostname (default: no limit)
+        chunk_size (int): URLs per JSON-RPC request (default: 1)
+        cache (ResponseCache): Response cache (default: the cache from enable_cache(), if any)
+        lazy (bool): Yield LazyResult objects, see read_internal_website() (default: False)
+
+    Yields:
+        Tuple[int, Dict[str, Any]]: (index into urls, result) in completion order
+
+    Example:
+        >>> for index, result in iter_internal_websites(urls, max_workers=8):
+        >>>     print(f"{urls[index]}: {is_success(result)}")
     """
-    Fetch multiple URLs sequentially.
+    cache = cache or _default_cache
+
+    # Cache hits first, then uncached URLs grouped per host into request-sized chunks
+    hits, chunks, duplicates = _plan_batch(urls, cache, chunk_size, lazy)
+    for index, cached in hits:
+        yield from _fan_out(urls, duplicates, index, cached)
+    queues: Dict[str, deque] = {host: deque(host_chunks) for host, host_chunks in chunks.items()}
+
+    if max_workers <= 1:
+        for indices, chunk_urls in sorted((c for q in queues.values() for c in q), key=lambda c: c[0][0]):
+            for index, result in zip(indices, _fetch_chunk(chunk_urls, timeout, debug, pool, cache, lazy)):
+                yield from _fan_out(urls, duplicates, index, result)
+        return
+
+    # Queue chunks per host so a saturated host never blocks a worker thread
+    hosts = deque(queues)
+    in_flight_by_host: Dict[str, int] = {host: 0 for host in queues}
+    running: Dict[Future, Tuple[List[int], str]] = {}
+
+    def next_chunk() -> Optional[Tuple[List[int], List[str], str]]:
+        # Round-robin over hosts that have queued URLs and spare capacity
+        for _ in range(len(hosts)):
+            host = hosts[0]
+            hosts.rotate(-1)
+            if not queues[host]:
+                continue
+            if per_host_limit and in_flight_by_host[host] >= per_host_limit:
+                continue
+            indices, chunk_urls = queues[host].popleft()
+            return indices, chunk_urls, host
+        return None
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="read-internal-website")
+    try:
+        while True:
+            while len(running) < max_workers:
+                item = next_chunk()
+                if item is None:
+                    break
+                indices, chunk_urls, host = item
+                in_flight_by_host[host] += 1
+                future = executor.submit(_fetch_chunk, chunk_urls, timeout, debug, pool, cache, lazy)
+                running[future] = (indices, host)
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                indices, host = running.pop(future)
+                in_flight_by_host[host] -= 1
+                for index, result in zip(indices, future.result()):
+                    yield from _fan_out(urls, duplicates, index, result)
+    finally:
+        # Abandoned iteration: drop queued work, let in-flight fetches finish
+        for future in running:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def read_internal_websites(urls: List[str], timeout: int = 30, debug: bool = False,
+                           pool: Optional[MCPSessionPool] = None, max_workers: int = 1,
+                           per_host_limit: Optional[int] = None, chunk_size: int = 1,
+                           cache: Optional[ResponseCache] = None, lazy: bool = False) -> List[Dict[str, Any]]:
+    """
+    Fetch multiple URLs, sequentially or with bounded parallelism.
 
     Args:
         urls (List[str]): List of internal website URLs to fetch
         timeout (int): Timeout in seconds for each fetch (default: 30)
         debug (bool): Enable debug logging (default: False)
+        pool (MCPSessionPool): Persistent builder-mcp workers to reuse for every URL
+        max_workers (int): Maximum concurrent fetches (default: 1, sequential)
+        per_host_limit (int): Maximum concurrent fetches per hostname (default: no limit)
+        chunk_size (int): URLs of the same host packed into one JSON-RPC request (default: 1)
+        cache (ResponseCache): Response cache (default: the cache from enable_cache(), if any)
+        lazy (bool): Return LazyResult objects, see read_internal_website() (default: False)
 
     Returns:
-        List[Dict[str, Any]]: List of response dictionaries, one per URL
+        List[Dict[str, Any]]: List of response dictionaries, one per URL, in input order
 
     Example:
         >>> urls = [
         >>>     "https://phonetool.amazon.com/users/user1",
         >>>     "https://phonetool.amazon.com/users/user2"
         >>> ]
-        >>> results = read_internal_websites(urls)
+        >>> results = read_internal_websites(urls, max_workers=8, per_host_limit=4)
         >>> for result in results:
         >>>     if is_success(result):
         >>>         print(f"✓ {result['url']}")
     """
-    return [read_internal_website(url, timeout, debug) for url in urls]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+    for index, result in iter_internal_websites(urls, timeout, debug, pool=pool, max_workers=max_workers,
+                                                per_host_limit=per_host_limit, chunk_size=chunk_size,
+                                                cache=cache, lazy=lazy):
+        results[index] = result
+    return results
+
+
+async def _aread_stream(stream: asyncio.StreamReader, timer: Optional[PhaseTimer] = None,
+                        limit: Optional[int] = None) -> bytes:
+    """
+    Read a subprocess stream to EOF in chunks, marking "first_byte" on `timer`.
+
+    Raises:
+        MCPResponseTooLargeError: As soon as more than `limit` bytes arrive,
+            with the output read so far
+    """
+    chunks: List[bytes] = []
+    received = 0
+    while True:
+        data = await stream.read(65536)
+        if not data:
+            return b"".join(chunks)
+        if not chunks and timer is not None:
+            timer.mark("first_byte")
+        chunks.append(data)
+        received += len(data)
+        if limit is not None and received > limit:
+            # The error holds the only copy of the output read
+            error = MCPResponseTooLargeError(f"builder-mcp was stopped after {received} bytes of output",
+                                             b"".join(chunks), limit)
+            chunks.clear()
+            if timer is not None:
+                timer.mark("read")
+            raise error
+
+
+async def _arun_builder_mcp(request: Dict[str, Any], timeout: float, timer: Optional[PhaseTimer] = None,
+                            max_bytes: Optional[int] = None) -> Tuple[bytes, bytes, Optional[int]]:
+    """
+    Run a single request through a fresh builder-mcp process without blocking the loop.
+
+    builder-mcp is started with asyncio.create_subprocess_exec() (no shell),
+    so it works on any event loop that supports subprocesses, including the
+    Windows proactor loop. The request is written to its stdin and stdout and
+    stderr are read through asyncio streams. On timeout or cancellation the
+    process is killed and reaped before the exception propagates, as it is
+    when stdout passes `max_bytes`. Marks the "spawn", "first_byte" and "read"
+    phases on `timer`.
+
+    Returns:
+        Tuple[bytes, bytes, Optional[int]]: stdout, stderr and exit code
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *default_command(),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    if timer is not None:
+        timer.mark("spawn")
+    # Drained alongside stdout, so a chatty builder-mcp never blocks on a full stderr pipe
+    stderr_task = asyncio.ensure_future(proc.stderr.read())
+
+    async def communicate() -> Tuple[bytes, bytes, Optional[int]]:
+        try:
+            proc.stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+            await proc.stdin.drain()
+            proc.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        stdout = await _aread_stream(proc.stdout, timer, max_bytes)
+        stderr = await stderr_task
+        returncode = await proc.wait()
+        if timer is not None:
+            timer.mark("read")
+        return stdout, stderr, returncode
+
+    try:
+        return await asyncio.wait_for(communicate(), timeout)
+    finally:
+        stderr_task.cancel()
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+
+
+async def _afetch_urls(urls: List[str], timeout: float = 30, debug: bool = False,
+                       lazy: bool = False, pool: Optional[MCPSessionPool] = None) -> List[Dict[str, Any]]:
+    """
+    Asyncio counterpart of _fetch_urls(), see _arun_builder_mcp().
+
+    Cancelling the calling task kills the builder-mcp process and re-raises
+    CancelledError; a timeout produces TIMEOUT results like the sync API.
+
+    With a session pool (`pool`, or the enable_session_pool() pool) the call
+    runs _fetch_urls() on the loop's default executor instead. Cancelling
+    then returns at once, but the pooled call finishes in its thread, bounded
+    by `timeout` - a worker that does not answer in time is killed.
+    """
+    pool = pool or _default_pool
+    if pool is not None:
+        return await asyncio.get_running_loop().run_in_executor(None, _fetch_urls, urls, timeout, debug, pool, lazy)
+
+    if debug:
+        logger.setLevel(logging.DEBUG)
+
+    start_time = time.time()
+    timer = PhaseTimer()
+    request = _build_request(urls)
+    logger.debug(f"Request: {json.dumps(request)}")
+    results = [_new_result(url) for url in urls]
+
+    raw_output = None
+    try:
+        raw_output, stderr, returncode = await _arun_builder_mcp(request, timeout, timer, _read_budget(len(urls)))
+        stderr_text = stderr.decode("utf-8", errors="replace")
+
+        logger.debug(f"Return code: {returncode}")
+        logger.debug(f"Stdout length: {len(raw_output)} bytes")
+
+        if not raw_output:
+            _set_error(results, "No response from builder-mcp", None, stderr_text if stderr_text else "Unknown error")
+            _set_timings(results, start_time, timer)
+            return results
+
+        response = json_codec.loads(raw_output)
+        raw_output = None
+        timer.mark("decode")
+        process_info = {"return_code": returncode, "stderr": stderr_text}
+
+        if not _populate_results(results, response, start_time, debug, process_info, lazy, timer):
+            results = [(await _afetch_urls([url], timeout, debug, lazy))[0] for url in urls]
+            for response_data in results:
+                response_data["warnings"].append("Batched response did not match inputs; fetched individually")
+        return results
+
+    except asyncio.CancelledError:
+        raise
+
+    except Exception as e:
+        if _cut_off(e) and len(urls) > 1:
+            logger.warning(f"Batched response passed the content limit, fetching {len(urls)} URLs individually")
+            return [(await _afetch_urls([url], timeout, debug, lazy))[0] for url in urls]
+        if _cut_off(e):
+            _set_truncated(results[0], e, timer)
+        else:
+            _set_fetch_error(results, e, timeout, debug, raw_output)
+        _set_timings(results, start_time, timer)
+        return results
+
+
+async def _afetch_and_cache(urls: List[str], timeout: float, debug: bool, cache: Optional[ResponseCache],
+                            lazy: bool = False, pool: Optional[MCPSessionPool] = None) -> List[Dict[str, Any]]:
+    """_afetch_with_retries() followed by storing the results in the cache."""
+    results = await _afetch_with_retries(urls, timeout, debug, lazy, pool)
+    _cache_store(results, cache)
+    _observe(results)
+    return results
+
+
+async def _afetch_with_retries(urls: List[str], timeout: float, debug: bool, lazy: bool = False,
+                               pool: Optional[MCPSessionPool] = None) -> List[Dict[str, Any]]:
+    """Asyncio counterpart of _fetch_with_retries(); backoff sleeps do not block the loop."""
+    policy, breaker, limiter = _default_retry_policy, _default_breaker, _default_rate_limiter
+    results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+    pending = list(range(len(urls)))
+    attempts, backoff = 0, 0.0
+    waited = 0.0 if limiter is not None else None
+    started = time.monotonic()
+    while True:
+        allowed = _admit(urls, pending, results, breaker, backoff)
+        if not allowed:
+            return results
+        attempts += 1
+        request_urls = [urls[i] for i in allowed]
+        if limiter is not None:
+            for host in dict.fromkeys(url_host(url) for url in request_urls):
+                waited += await limiter.aacquire(host)
+        fetched = await _afetch_urls(request_urls, timeout, debug, lazy, pool)
+        pending = _record_attempt(urls, allowed, fetched, results, attempts, backoff, waited, policy, breaker)
+        delay = _next_backoff(policy, pending, results, attempts, started)
+        if delay is None:
+            return results
+        logger.debug(f"Retrying {len(pending)} URL(s) in {delay:.2f} seconds (attempt {attempts + 1})")
+        await asyncio.sleep(delay)
+        backoff += delay
+
+
+async def _afetch_chunk(urls: List[str], timeout: float, debug: bool, cache: Optional[ResponseCache],
+                        lazy: bool = False, pool: Optional[MCPSessionPool] = None) -> List[Dict[str, Any]]:
+    """
+    Asyncio counterpart of _fetch_chunk(): single URLs are shared between
+    tasks on the same event loop that request them concurrently.
+    """
+    if len(urls) > 1:
+        return await _afetch_and_cache(urls, timeout, debug, cache, lazy, pool)
+
+    loop = asyncio.get_running_loop()
+    key = (id(loop), normalize_url(urls[0]))
+    while key in _async_in_flight:
+        shared = _async_in_flight[key]
+        try:
+            return [_coalesced_copy(await asyncio.shield(shared), urls[0])]
+        except asyncio.CancelledError:
+            if not shared.cancelled():
+                raise
+            # The leading task was cancelled; fetch on our own
+
+    shared = _async_in_flight[key] = loop.create_future()
+    try:
+        results = await _afetch_and_cache(urls, timeout, debug, cache, lazy, pool)
+        shared.set_result(copy.deepcopy(results[0]))
+        return results
+    finally:
+        if not shared.done():
+            shared.cancel()
+        del _async_in_flight[key]
+
+
+async def aread_internal_website(url: str, timeout: float = 30, debug: bool = False,
+                                 cache: Optional[ResponseCache] = None, lazy: bool = False,
+                                 pool: Optional[MCPSessionPool] = None) -> Dict[str, Any]:
+    """
+    Asyncio version of read_internal_website().
+
+    Without a session pool this does not block the event loop or use a
+    thread: builder-mcp's pipes are read through the event loop and
+    cancelling the awaiting task kills the builder-mcp process. With a pool,
+    the pooled call runs on the loop's default executor, see _afetch_urls().
+
+    Args:
+        url (str): The internal website URL to fetch
+        timeout (float): Timeout in seconds for this call (default: 30)
+        debug (bool): Enable debug logging (default: False)
+        cache (ResponseCache): Response cache (default: the cache from enable_cache(), if any)
+        lazy (bool): Return a LazyResult, see read_internal_website() (default: False)
+        pool (MCPSessionPool): Persistent builder-mcp workers (default: enable_session_pool() pool, if any)
+
+    Returns:
+        dict: Same result structure as read_internal_website()
+
+    Example:
+        >>> data = await aread_internal_website("https://phonetool.amazon.com/users/username")
+        >>> if is_success(data):
+        >>>     print(get_content(data))
+    """
+    cache = cache or _default_cache
+    cached = _cache_lookup(url, cache, lazy)
+    if cached is not None:
+        return cached
+    return (await _afetch_chunk([url], timeout, debug, cache, lazy, pool))[0]
+
+
+async def aiter_internal_websites(urls: List[str], timeout: float = 30, debug: bool = False,
+                                  max_concurrency: int = 8, chunk_size: int = 1,
+                                  cache: Optional[ResponseCache] = None, lazy: bool = False,
+                                  pool: Optional[MCPSessionPool] = None,
+                                  per_host_limit: Optional[int] = None) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Fetch URLs concurrently on the event loop, yielding results as they complete.
+
+    Up to `max_concurrency` builder-mcp calls run at once. With
+    `per_host_limit`, no more than that many are in flight for the same
+    hostname; requests for a saturated host wait without taking a
+    concurrency slot, so other hosts keep going. With a session pool the
+    calls go through its workers, see aread_internal_website().
+
+    Args:
+        urls (List[str]): List of internal website URLs to fetch
+        timeout (float): Timeout in seconds for each builder-mcp call (default: 30)
+        debug (bool): Enable debug logging (default: False)
+        max_concurrency (int): Maximum builder-mcp calls in flight (default: 8)
+        chunk_size (int): URLs of the same host packed into one request (default: 1)
+        cache (ResponseCache): Response cache (default: the cache from enable_cache(), if any)
+        lazy (bool): Return LazyResult objects, see read_internal_website() (default: False)
+        pool (MCPSessionPool): Persistent builder-mcp workers (default: enable_session_pool() pool, if any)
+        per_host_limit (int): Maximum builder-mcp calls in flight per hostname (default: no limit)
+
+    Yields:
+        Tuple[int, Dict[str, Any]]: (index into urls, result) in completion order
+
+    Example:
+        >>> async for index, result in aiter_internal_websites(urls, max_concurrency=16):
+        >>>     print(f"{urls[index]}: {is_success(result)}")
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    cache = cache or _default_cache
+
+    hits, chunks, duplicates = _plan_batch(urls, cache, chunk_size, lazy)
+    for index, cached in hits:
+        for item in _fan_out(urls, duplicates, index, cached):
+            yield item
+
+    host_semaphores = {host: asyncio.Semaphore(per_host_limit) for host in chunks} if per_host_limit else {}
+
+    async def fetch_chunk(indices: List[int], chunk_urls: List[str], host: str) -> List[Tuple[int, Dict[str, Any]]]:
+        # The host's slot is taken first, so a saturated host never holds a shared one
+        host_semaphore = host_semaphores.get(host)
+        if host_semaphore is not None:
+            await host_semaphore.acquire()
+        try:
+            async with semaphore:
+                results = await _afetch_chunk(chunk_urls, timeout, debug, cache, lazy, pool)
+        finally:
+            if host_semaphore is not None:
+                host_semaphore.release()
+        return [item for index, result in zip(indices, results) for item in _fan_out(urls, duplicates, index, result)]
+
+    tasks = [
+        asyncio.ensure_future(fetch_chunk(indices, chunk_urls, host))
+        for host, host_chunks in chunks.items()
+        for indices, chunk_urls in host_chunks
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            for item in await next_done:
+                yield item
+    finally:
+        # Abandoned or cancelled iteration: stop every outstanding fetch
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def aread_internal_websites(urls: List[str], timeout: float = 30, debug: bool = False,
+                                  max_concurrency: int = 8, chunk_size: int = 1,
+                                  cache: Optional[ResponseCache] = None, lazy: bool = False,
+                                  pool: Optional[MCPSessionPool] = None,
+                                  per_host_limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Asyncio version of read_internal_websites(), see aiter_internal_websites().
+
+    Args:
+        urls (List[str]): List of internal website URLs to fetch
+        timeout (float): Timeout in seconds for each builder-mcp call (default: 30)
+        debug (bool): Enable debug logging (default: False)
+        max_concurrency (int): Maximum builder-mcp calls in flight (default: 8)
+        chunk_size (int): URLs of the same host packed into one request (default: 1)
+        cache (ResponseCache): Response cache (default: the cache from enable_cache(), if any)
+        lazy (bool): Return LazyResult objects, see read_internal_website() (default: False)
+        pool (MCPSessionPool): Persistent builder-mcp workers (default: enable_session_pool() pool, if any)
+        per_host_limit (int): Maximum builder-mcp calls in flight per hostname (default: no limit)
+
+    Returns:
+        List[Dict[str, Any]]: List of response dictionaries, one per URL, in input order
+
+    Example:
+        >>> results = await aread_internal_websites(urls, max_concurrency=16)
+        >>> print(sum(1 for r in results if is_success(r)), "succeeded")
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+    async for index, result in aiter_internal_websites(urls, timeout, debug, max_concurrency, chunk_size, cache,
+                                                       lazy, pool, per_host_limit):
+        results[index] = result
+    return results
+
+
+def iter_team_reviews(usernames: List[str], review_lists: Tuple[str, ...] = ("to-user",),
+                      timeout: int = 30, debug: bool = False, pool: Optional[MCPSessionPool] = None,
+                      max_workers: Optional[int] = None, merger: Optional[CRMerger] = None
+                      ) -> Iterator[Tuple[str, Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    Fetch several users' review lists at once, merging CRs by ID as each page arrives.
+
+    Every page is fetched concurrently (by default all at once, so the whole
+    view takes about as long as the slowest page) and its table is parsed and
+    merged into `merger` as soon as it completes. A CR in several users'
+    lists is one record with a role per user, see cr_parser.CRMerger.
+
+    Args:
+        usernames (List[str]): Users whose lists to fetch
+        review_lists (tuple): Lists per user, keys of cr_parser.REVIEW_LISTS
+            (default: ("to-user",), CRs awaiting their review)
+        timeout (int): Timeout in seconds for each fetch (default: 30)
+        debug (bool): Enable debug logging (default: False)
+        pool (MCPSessionPool): Persistent builder-mcp workers to reuse
+        max_workers (int): Maximum concurrent fetches (default: one per page)
+        merger (CRMerger): Merger to add the rows to (default: a new one)
+
+    Yields:
+        Tuple: (username, fetch result, merged records that are new or gained
+            a role from this page) in completion order
+
+    Raises:
+        ValueError: If a review list is unknown
+
+    Example:
+        >>> merger = CRMerger()
+        >>> for user, result, records in iter_team_reviews(["alice", "bob"], merger=merger):
+        >>>     for record in records:
+        >>>         print(record["ID"], record["roles"])
+    """
+    merger = merger if merger is not None else CRMerger()
+    pages = [(username, review_list) for username in usernames for review_list in review_lists]
+    urls = [review_list_url(username, review_list) for username, review_list in pages]
+    if not urls:
+        return
+    for index, result in iter_internal_websites(urls, timeout, debug, pool=pool,
+                                                max_workers=max_workers or len(urls)):
+        username, review_list = pages[index]
+        records: List[Dict[str, Any]] = []
+        if is_success(result) and isinstance(result.get("content"), str):
+            records = merger.add(username, iter_cr_rows(result["content"], compact=True),
+                                 role=REVIEW_LISTS[review_list])
+        yield username, result, records
+
+
+def fetch_team_reviews(usernames: List[str], review_lists: Tuple[str, ...] = ("to-user",),
+                       timeout: int = 30, debug: bool = False, pool: Optional[MCPSessionPool] = None,
+                       max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    One deduplicated view of the CRs in several users' review lists.
+
+    Args:
+        usernames (List[str]): Users whose lists to fetch
+        review_lists (tuple): Lists per user, keys of cr_parser.REVIEW_LISTS (default: ("to-user",))
+        timeout (int): Timeout in seconds for each fetch (default: 30)
+        debug (bool): Enable debug logging (default: False)
+        pool (MCPSessionPool): Persistent builder-mcp workers to reuse
+        max_workers (int): Maximum concurrent fetches (default: one per page)
+
+    Returns:
+        dict: "crs" (one record per CR ID with "roles": {username: [role]}, in
+            the order first seen) and "errors" (failed fetch results, each
+            with "user" added)
+
+    Example:
+        >>> team = fetch_team_reviews(["alice", "bob", "carol"])
+        >>> blocked = [cr["ID"] for cr in team["crs"] if len(cr["roles"]) > 1]
+    """
+    merger = CRMerger()
+    errors = []
+    for username, result, _ in iter_team_reviews(usernames, review_lists, timeout, debug, pool=pool,
+                                                 max_workers=max_workers, merger=merger):
+        if not is_success(result):
+            errors.append(dict(result, user=username))
+    return {"crs": merger.records, "errors": errors}
 
 
 def is_success(result: Dict[str, Any]) -> bool:
@@ -453,6 +2442,98 @@ def has_warnings(result: Dict[str, Any]) -> bool:
     return len(result.get("warnings", [])) > 0
 
 
+class _JsonlWriter:
+    """
+    Write results as JSON Lines, one flushed record per result.
+
+    When writing to a file, the data is also fsync'ed at most every
+    `fsync_interval` seconds and once more on close, so a crash loses at
+    most that window of records. With `append`, an existing file is
+    extended instead of truncated.
+    """
+
+    def __init__(self, path: Optional[str] = None, fsync_interval: float = 5.0, append: bool = False):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        if path and append:
+            cut_torn_line(path)
+        self._stream = open(path, "a" if append else "w") if path else sys.stdout
+        self._last_sync = time.monotonic()
+        self.count = 0
+
+    def write(self, result: Dict[str, Any]) -> None:
+        self._stream.write(json.dumps(result) + "\n")
+        self._stream.flush()
+        self.count += 1
+        if self.path and time.monotonic() - self._last_sync >= self.fsync_interval:
+            self._sync()
+
+    def _sync(self) -> None:
+        os.fsync(self._stream.fileno())
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if self.path:
+            self._sync()
+            self._stream.close()
+
+    def __enter__(self) -> "_JsonlWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _drop_superseded_failures(path: str, latest: Dict[str, bool]) -> int:
+    """
+    Rewrite a resumed JSON Lines output without the failed records a retry replaced.
+
+    Only failed records are decoded. One is kept if it is the last failed
+    record for its URL and the URL's latest journal entry is still an error.
+
+    Args:
+        path (str): JSON Lines output of the resumed runs
+        latest (dict): BatchJournal.scan() of their journal
+
+    Returns:
+        int: Number of records dropped
+    """
+    failed: Dict[int, str] = {}
+    last_failed: Dict[str, int] = {}
+    with open(path, "rb") as f:
+        for number, line in enumerate(f):
+            # _JsonlWriter writes results as json.dumps() of dicts that start with "success"
+            if line.startswith(b'{"success": false'):
+                try:
+                    key = normalize_url(json.loads(line)["url"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                failed[number] = key
+                last_failed[key] = number
+    drop = {number for number, key in failed.items() if latest.get(key) or last_failed[key] != number}
+    if drop:
+        temp_path = path + ".tmp"
+        with open(path, "rb") as src, open(temp_path, "wb") as dst:
+            for number, line in enumerate(src):
+                if number not in drop:
+                    dst.write(line)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(temp_path, path)
+    return len(drop)
+
+
+def _write_metrics(path: str, fmt: str) -> None:
+    """Write the default metrics registry as OpenMetrics text or a JSON summary ('-' for stderr)."""
+    text = _default_metrics.to_json() + "\n" if fmt == "json" else _default_metrics.to_openmetrics()
+    if path == "-":
+        sys.stderr.write(text)
+        return
+    with open(path, "w") as f:
+        f.write(text)
+    print(f"📈 Metrics saved to {path}", file=sys.stderr)
+
+
 def main():
     """
     Command-line interface for the read_internal_website function.
@@ -461,6 +2542,8 @@ def main():
 
     import argparse
 
+    logging.basicConfig(level=logging.INFO)
+
     parser = argparse.ArgumentParser(
         description="Fetch data from ANY Amazon internal website using builder-mcp",
         epilog="""
@@ -471,6 +2554,16 @@ Examples:
   %(prog)s https://quip-amazon.com/DOCID
   %(prog)s https://board.amazon.com/boards/BOARD-ID
   %(prog)s --batch urls.txt --format json
+  %(prog)s --batch urls.txt --format jsonl --concurrency 8 | indexer
+  %(prog)s --batch urls.txt --concurrency 8 --per-host-limit 4
+  %(prog)s --batch urls.txt --concurrency 8 --retries 3 --circuit-breaker 5
+  %(prog)s --batch urls.txt --concurrency 16 --rate-limit code.amazon.com=2:4 --rate-limit 10
+  %(prog)s --batch urls.txt --format jsonl --output out.jsonl --resume run.journal
+  %(prog)s --batch urls.txt --concurrency 8 --metrics metrics.prom
+  %(prog)s --batch urls.txt --concurrency 16 --max-bytes 4194304
+  %(prog)s https://phonetool.amazon.com/users/username --extract --format content-only
+  %(prog)s --team-reviews alice,bob,carol --review-lists to-user,from-user --format jsonl
+  %(prog)s --batch urls.txt --cache-dir ~/.cache/riw --cache-ttl 600 --cache-ttl w.amazon.com=60
 
 Batch file format (one URL per line):
   https://phonetool.amazon.com/users/user1
@@ -482,18 +2575,178 @@ Batch file format (one URL per line):
     parser.add_argument("--debug", action="store_true", help="Enable debug output")
     parser.add_argument("--timeout", type=int, default=30, help="Timeout in seconds (default: 30)")
     parser.add_argument("--batch", help="File with URLs to fetch (one per line)")
-    parser.add_argument("--format", choices=["json", "text", "content-only"], default="json",
-                        help="Output format (default: json)")
+    parser.add_argument("--format", choices=["json", "jsonl", "text", "content-only"], default="json",
+                        help="Output format (default: json). jsonl streams one result per line as it completes")
     parser.add_argument("--output", help="Save output to file")
+    parser.add_argument("--fsync-interval", type=float, default=5.0,
+                        help="With --format jsonl --output, fsync the file at most every N seconds (default: 5)")
+    parser.add_argument("--pool-size", type=int, default=0,
+                        help="Keep N builder-mcp processes open and reuse them (default: 0, one process per URL)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Maximum concurrent fetches in batch mode (default: 1; every page at once "
+                             "with --team-reviews)")
+    parser.add_argument("--per-host-limit", type=int, default=None,
+                        help="Maximum concurrent fetches per hostname in batch mode (default: no limit)")
+    parser.add_argument("--chunk-size", type=int, default=1,
+                        help="URLs per builder-mcp request in batch mode (default: 1)")
+    parser.add_argument("--cache-dir",
+                        help="Cache successful results in this directory "
+                             "(default: $READ_INTERNAL_WEBSITE_CACHE_DIR, caching is off if unset)")
+    parser.add_argument("--cache-ttl", action="append", default=[], metavar="[DOMAIN=]SECONDS",
+                        help="Cache TTL, or a per-domain TTL; repeatable (default: 300). Enables the cache")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the response cache")
+    parser.add_argument("--retries", type=int, default=0,
+                        help="Retry TIMEOUT/SUBPROCESS_ERROR/PARSE_ERROR/MCP_ERROR failures up to N times "
+                             "with exponential backoff and jitter (default: 0)")
+    parser.add_argument("--retry-deadline", type=float, default=None,
+                        help="Do not start a retry later than N seconds after the first attempt")
+    parser.add_argument("--circuit-breaker", type=int, default=0, metavar="FAILURES",
+                        help="Fail fast for a host after N consecutive failures (default: 0, off)")
+    parser.add_argument("--circuit-reset", type=float, default=30,
+                        help="Seconds an open circuit waits before probing the host again (default: 30)")
+    parser.add_argument("--max-bytes", type=int, default=None, metavar="N",
+                        help="Stop reading a page after N bytes and return it truncated, with a warning; "
+                             "JSON pages are never cut and fail instead (default: no limit)")
+    parser.add_argument("--extract", action="store_true",
+                        help="Add structured data from the site's extractor as \"extracted\" "
+                             "(see extractors.py); content-only prints it instead of the content")
+    parser.add_argument("--resolve-links", action="store_true",
+                        help="Turn markdown reference links into inline links instead of stripping them")
+    parser.add_argument("--rate-limit", action="append", default=[], metavar="[DOMAIN=]RPS[:BURST]",
+                        help="Limit requests per second per host, or for one domain; repeatable (default: unlimited)")
+    parser.add_argument("--resume", metavar="JOURNAL",
+                        help="Record completed URLs in JOURNAL and skip those already recorded there (batch mode)")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="With --resume, fetch URLs again whose recorded result was an error")
+    parser.add_argument("--team-reviews", action="append", default=[], metavar="USER[,USER...]",
+                        help="Fetch these users' review lists concurrently and merge them into one set of "
+                             "CRs with each user's roles; repeatable")
+    parser.add_argument("--review-lists", default="to-user", metavar="LIST[,LIST...]",
+                        help=f"Review lists per user for --team-reviews: {', '.join(REVIEW_LISTS)} "
+                             f"(default: to-user)")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="Write per-host fetch metrics to FILE at the end of a batch run ('-' for stderr)")
+    parser.add_argument("--metrics-format", choices=["openmetrics", "json"], default="openmetrics",
+                        help="Format of --metrics (default: openmetrics)")
 
     args = parser.parse_args()
 
     # Validate arguments
-    if not args.url and not args.batch:
-        parser.error("Either url or --batch must be provided")
+    usernames = list(dict.fromkeys(user.strip() for value in args.team_reviews
+                                   for user in value.split(",") if user.strip()))
+    review_lists = tuple(dict.fromkeys(name.strip() for name in args.review_lists.split(",") if name.strip()))
+    if not args.url and not args.batch and not usernames:
+        parser.error("Either url, --batch or --team-reviews must be provided")
+    if usernames and (args.url or args.batch):
+        parser.error("--team-reviews cannot be combined with a url or --batch")
+    unknown_lists = [name for name in review_lists if name not in REVIEW_LISTS]
+    if unknown_lists or not review_lists:
+        parser.error(f"Invalid --review-lists value: {args.review_lists} (have: {', '.join(REVIEW_LISTS)})")
+    if args.resume and not args.batch:
+        parser.error("--resume requires --batch")
+    if args.metrics and not args.batch:
+        parser.error("--metrics requires --batch")
+    if args.max_bytes is not None and args.max_bytes < 1:
+        parser.error("--max-bytes must be at least 1")
+
+    if args.pool_size > 0:
+        enable_session_pool(size=args.pool_size)
+
+    if args.max_bytes:
+        enable_content_limit(args.max_bytes)
+
+    if args.resolve_links:
+        enable_link_resolution()
+
+    if args.metrics:
+        enable_metrics()
+
+    if args.retries > 0:
+        enable_retries(max_attempts=args.retries + 1, deadline=args.retry_deadline)
+    if args.circuit_breaker > 0:
+        enable_circuit_breaker(failure_threshold=args.circuit_breaker, reset_timeout=args.circuit_reset)
+
+    if args.rate_limit:
+        rates = {}
+        default_rate = None
+        for value in args.rate_limit:
+            domain, _, rate = value.rpartition("=")
+            rps, _, burst = rate.partition(":")
+            try:
+                parsed = (float(rps), float(burst or 1))
+            except ValueError:
+                parser.error(f"Invalid --rate-limit value: {value}")
+            if domain:
+                rates[domain] = parsed
+            else:
+                default_rate = parsed
+        try:
+            enable_rate_limit(rates, default=default_rate)
+        except ValueError as e:
+            parser.error(f"Invalid --rate-limit value: {e}")
+
+    cache_dir = args.cache_dir or os.environ.get("READ_INTERNAL_WEBSITE_CACHE_DIR")
+    if not args.no_cache and (cache_dir or args.cache_ttl):
+        ttl = 300.0
+        domain_ttls = {}
+        for value in args.cache_ttl:
+            domain, _, seconds = value.rpartition("=")
+            try:
+                if domain:
+                    domain_ttls[domain] = float(seconds)
+                else:
+                    ttl = float(seconds)
+            except ValueError:
+                parser.error(f"Invalid --cache-ttl value: {value}")
+        enable_cache(cache_dir, ttl=ttl, domain_ttls=domain_ttls)
 
     # Fetch the data
-    if args.batch:
+    if usernames:
+        # Team review mode - every user's review lists, merged by CR ID as pages arrive
+        page_count = len(usernames) * len(review_lists)
+        print(f"👥 Fetching {page_count} review lists for {len(usernames)} users", file=sys.stderr)
+        merger = CRMerger()
+        fetched = iter_team_reviews(usernames, review_lists, timeout=args.timeout, debug=args.debug,
+                                    max_workers=args.concurrency, merger=merger)
+        errors = []
+
+        def record_error(username: str, result: Dict[str, Any]) -> None:
+            errors.append(dict(result, user=username))
+            print(f"❌ {result['url']}: {result.get('error', 'Unknown error')}", file=sys.stderr)
+
+        if args.format == "jsonl":
+            # A CR is written when first seen and again whenever another list adds a role
+            with _JsonlWriter(args.output, fsync_interval=args.fsync_interval) as writer:
+                for username, result, records in fetched:
+                    if not is_success(result):
+                        record_error(username, result)
+                    for record in records:
+                        writer.write(record)
+        else:
+            for username, result, _ in fetched:
+                if not is_success(result):
+                    record_error(username, result)
+
+        print(f"✅ {page_count - len(errors)}/{page_count} review lists fetched, {len(merger)} unique CRs",
+              file=sys.stderr)
+        if args.format == "jsonl":
+            if args.output:
+                print(f"📁 JSON Lines saved to {args.output}", file=sys.stderr)
+        elif args.format == "text":
+            for record in merger.records:
+                roles = ", ".join(f"{user} ({'/'.join(user_roles)})" for user, user_roles in record["roles"].items())
+                print(f"{record['ID']}\t{record.get('Status', '')}\t{roles}\t{record.get('Summary', '')}")
+        else:
+            output = merger.records if args.format == "content-only" else {"crs": merger.records, "errors": errors}
+            output_json = json.dumps(output, indent=2)
+            if args.output:
+                with open(args.output, 'w') as f:
+                    f.write(output_json)
+                print(f"📁 JSON saved to {args.output}", file=sys.stderr)
+            else:
+                print(output_json)
+
+    elif args.batch:
         # Batch mode - read URLs from file
         try:
             with open(args.batch, 'r') as f:
@@ -502,8 +2755,77 @@ Batch file format (one URL per line):
             print(f"❌ Batch file not found: {args.batch}", file=sys.stderr)
             sys.exit(1)
 
-        print(f"📋 Fetching {len(urls)} URLs from {args.batch}", file=sys.stderr)
-        results = read_internal_websites(urls, timeout=args.timeout, debug=args.debug)
+        journal = None
+        results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+        pending = list(range(len(urls)))
+        # Only a run that continues an existing journal extends the output file
+        resuming = bool(args.resume) and os.path.exists(args.resume)
+        if args.resume:
+            # Skip URLs the journal already has; it holds keys, not result JSON
+            journal = BatchJournal(args.resume, fsync_interval=args.fsync_interval)
+            done = journal.scan()
+            keys = [normalize_url(url) for url in urls]
+            pending = [i for i, key in enumerate(keys)
+                       if key not in done or (args.retry_failed and not done[key])]
+            skipped = len(urls) - len(pending)
+            print(f"📒 Resuming from {args.resume}: {skipped} done, {len(pending)} to fetch", file=sys.stderr)
+            if skipped and args.format != "jsonl":
+                pending_set = set(pending)
+                previous = journal.load_results({keys[i] for i in range(len(urls)) if i not in pending_set})
+                for i, key in enumerate(keys):
+                    if i not in pending_set:
+                        if key in previous:
+                            results[i] = dict(previous[key], url=urls[i])
+                            if args.extract:
+                                apply_extractor(results[i])
+                        else:
+                            pending.append(i)  # recorded but unreadable: fetch it again
+                pending.sort()
+
+        print(f"📋 Fetching {len(pending)} URLs from {args.batch}", file=sys.stderr)
+
+        fetched = iter_internal_websites([urls[i] for i in pending], timeout=args.timeout, debug=args.debug,
+                                         max_workers=args.concurrency or 1, per_host_limit=args.per_host_limit,
+                                         chunk_size=args.chunk_size)
+
+        if args.format == "jsonl":
+            # Stream each result as soon as it completes instead of buffering the batch
+            success_count = 0
+            try:
+                # A resumed run appends to the output of the interrupted one
+                with _JsonlWriter(args.output, fsync_interval=args.fsync_interval, append=resuming) as writer:
+                    for index, result in fetched:
+                        if args.extract:
+                            apply_extractor(result)
+                        # Output first: a crash in between fetches the URL again rather than losing it
+                        writer.write(result)
+                        if journal is not None:
+                            journal.append(normalize_url(urls[pending[index]]), result)
+                        success_count += is_success(result)
+            finally:
+                if journal is not None:
+                    journal.close()
+            print(f"✅ {success_count}/{writer.count} succeeded", file=sys.stderr)
+            if args.output and args.retry_failed and resuming:
+                dropped = _drop_superseded_failures(args.output, journal.scan())
+                if dropped:
+                    print(f"🧹 Dropped {dropped} failed results replaced by retries", file=sys.stderr)
+            if args.output:
+                print(f"📁 JSON Lines saved to {args.output}", file=sys.stderr)
+            if args.metrics:
+                _write_metrics(args.metrics, args.metrics_format)
+            return
+
+        try:
+            for index, result in fetched:
+                if args.extract:
+                    apply_extractor(result)
+                if journal is not None:
+                    journal.append(normalize_url(urls[pending[index]]), result)
+                results[pending[index]] = result
+        finally:
+            if journal is not None:
+                journal.close()
 
         # Summary to stderr
         success_count = sum(1 for r in results if is_success(r))
@@ -514,7 +2836,9 @@ Batch file format (one URL per line):
             for result in results:
                 if is_success(result):
                     content = get_content(result)
-                    if result["content_type"] == "json":
+                    if "extracted" in result:
+                        print(json.dumps(result["extracted"], indent=2))
+                    elif result["content_type"] == "json":
                         print(json.dumps(content, indent=2))
                     else:
                         print(content)
@@ -528,9 +2852,14 @@ Batch file format (one URL per line):
             else:
                 print(output_json)
 
+        if args.metrics:
+            _write_metrics(args.metrics, args.metrics_format)
+
     else:
         # Single URL mode
         result = read_internal_website(args.url, timeout=args.timeout, debug=args.debug)
+        if args.extract:
+            apply_extractor(result)
 
         if is_success(result):
             # Print status to stderr so stdout can be piped
@@ -544,7 +2873,9 @@ Batch file format (one URL per line):
             if args.format == "content-only":
                 # Output just the content for piping to other tools
                 content = get_content(result)
-                if result["content_type"] == "json":
+                if "extracted" in result:
+                    print(json.dumps(result["extracted"], indent=2))
+                elif result["content_type"] == "json":
                     # For JSON content, output as formatted JSON string
                     print(json.dumps(content, indent=2))
                 else:
@@ -557,11 +2888,16 @@ Batch file format (one URL per line):
                 print(f"Content Type: {result['content_type']}")
                 print(f"Content Length: {result['content_length']} chars")
                 print(f"Fetch Duration: {result['metadata'].get('fetch_duration_ms', 'N/A')} ms")
+                timings = result["metadata"].get("timings_ms")
+                if timings:
+                    print(f"Timings: {', '.join(f'{phase} {ms} ms' for phase, ms in timings.items())}")
+                if "extracted" in result:
+                    print(f"Extractor: {result['metadata']['extractor']}")
                 if has_warnings(result):
                     print(f"Warnings: {', '.join(result['warnings'])}")
             else:
-                # Full JSON structure (default)
-                output_json = json.dumps(result, indent=2)
+                # Full JSON structure (default), one line for jsonl
+                output_json = json.dumps(result, indent=None if args.format == "jsonl" else 2)
 
                 if args.output:
                     with open(args.output, 'w') as f:
@@ -578,7 +2914,7 @@ Batch file format (one URL per line):
 
             # Still output the JSON for debugging unless content-only
             if args.format != "content-only":
-                print(json.dumps(result, indent=2))
+                print(json.dumps(result, indent=None if args.format == "jsonl" else 2))
 
             sys.exit(1)
 
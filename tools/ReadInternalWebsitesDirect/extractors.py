@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+
+"""
+extractors.py
+
+Structured extractors for pages fetched by read_internal_website.py.
+
+An extractor turns the content of one kind of page into plain data: a code
+review list into rows, a phonetool profile into fields, a wiki page into
+sections. Extractors are registered under a name with a regular expression
+for the URLs they handle. Patterns are folded into precompiled alternations
+of named groups, one per host named literally at the start of a pattern
+(plus the patterns that name no host), so finding the extractor for a URL
+is a dict lookup and a single match() whose lastgroup names the winner,
+however many extractors other hosts have registered.
+
+Patterns are matched from the start of "host/path?query" (no scheme, host
+lower-cased), e.g. r"phonetool\\.amazon\\.com/users/". Extractors registered
+later take precedence, so registering a built-in's name again replaces it.
+
+Built-in extractors:
+    code-reviews  code.amazon.com/reviews/<list>/...  rows of the CR table
+    code          other code.amazon.com pages         the JSON document
+    phonetool     phonetool.amazon.com/users/...      title, fields, tables
+    builderhub    builderhub.corp.amazon.com/...      title, sections
+    wiki          w.amazon.com/...                    title, sections
+    quip          quip-amazon.com/...                 title, sections
+    issues        issues.amazon.com, sim.amazon.com   the JSON document
+    apollo        apollo.amazon.com/...               the JSON document
+    pipelines     pipelines.amazon.com/...            the JSON document
+    board         board.amazon.com/...                the JSON document
+
+Usage:
+    from extractors import apply_extractor, register_extractor
+
+    data = read_internal_website("https://phonetool.amazon.com/users/username")
+    profile = apply_extractor(data)   # also stored as data["extracted"]
+
+    register_extractor("oncall", r"oncall\\.corp\\.amazon\\.com/", parse_oncall)
+"""
+
+import html.parser
+import logging
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import json_codec
+from cr_parser import parse_cr_table
+
+logger = logging.getLogger(__name__)
+
+# An extractor is called with a result's content and URL; None means "nothing found"
+ExtractorFunc = Callable[[Any, str], Any]
+
+_HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.+?)[ \t#]*$', re.MULTILINE)
+# "**Key:** value", "- Key: value" and "Key: value" lines
+_FIELD_RE = re.compile(r'^[ \t]*(?:[-*+][ \t]+)?(?:\*\*([^*\n]{1,60}?):?\*\*:?|([A-Za-z][\w /-]{0,39}):)[ \t]+(\S.*?)[ \t]*$',
+                       re.MULTILINE)
+_TABLE_RE = re.compile(r'^[ \t]*\|.*\|[ \t]*(?:\n[ \t]*\|.*\|[ \t]*)+', re.MULTILINE)
+_TABLE_RULE_RE = re.compile(r'^[\s|:-]+$')
+# A pattern that starts with a literal host followed by "/", e.g. r"w\.amazon\.com/"
+_LITERAL_HOST_RE = re.compile(r'((?:[a-z0-9-]|\\\.)+)/(?![?*+{])')
+
+# Compiled dispatch tables: host -> alternation, the alternation for other
+# hosts, and group name -> (name, function)
+_Matcher = Tuple[Dict[str, "re.Pattern[str]"], "re.Pattern[str]", Dict[str, Tuple[str, "ExtractorFunc"]]]
+
+
+class ExtractorRegistry:
+    """
+    Extractors keyed by URL pattern, dispatched through combined regexes.
+
+    Thread-safe: the matcher is rebuilt under a lock after a change and then
+    swapped in whole, so concurrent lookups never see a partial table.
+
+    Example:
+        >>> registry = ExtractorRegistry()
+        >>> registry.register("phonetool", r"phonetool\\.amazon\\.com/users/", parse_profile)
+        >>> registry.find("https://phonetool.amazon.com/users/jdoe")[0]
+        'phonetool'
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # name -> (pattern, function), in registration order
+        self._extractors: Dict[str, Tuple[str, ExtractorFunc]] = {}
+        self._matcher: Optional[_Matcher] = None
+
+    def register(self, name: str, pattern: str, func: ExtractorFunc) -> None:
+        """
+        Add an extractor, or replace the one registered under `name`.
+
+        Args:
+            name (str): Name reported in metadata["extractor"]
+            pattern (str): Regex matched from the start of "host/path?query";
+                it must not define named groups
+            func (callable): func(content, url) -> extracted data or None
+
+        Raises:
+            ValueError: If the pattern is invalid or has named groups
+        """
+        try:
+            compiled = re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern for extractor {name!r}: {e}")
+        if compiled.groupindex:
+            raise ValueError(f"Pattern for extractor {name!r} must not define named groups")
+        with self._lock:
+            self._extractors.pop(name, None)
+            self._extractors[name] = (pattern, func)
+            self._matcher = None
+
+    def unregister(self, name: str) -> None:
+        """Remove an extractor; unknown names are ignored."""
+        with self._lock:
+            if self._extractors.pop(name, None) is not None:
+                self._matcher = None
+
+    def names(self) -> List[str]:
+        """Registered names, in the order they are tried."""
+        with self._lock:
+            return list(reversed(self._extractors))
+
+    def _compiled(self) -> _Matcher:
+        matcher = self._matcher
+        if matcher is not None:
+            return matcher
+        with self._lock:
+            if self._matcher is None:
+                # In precedence order; group names are generated, so extractor names can be anything
+                entries = list(enumerate(reversed(self._extractors.values())))
+                by_host: Dict[str, list] = {}
+                anywhere = []
+                for entry in entries:
+                    host = _literal_host(entry[1][0])
+                    (by_host.setdefault(host, []) if host else anywhere).append(entry)
+
+                def combine(group: list) -> "re.Pattern[str]":
+                    alternatives = "|".join(f"(?P<x{i}>{pattern})" for i, (pattern, _) in sorted(group))
+                    return re.compile(alternatives or r"(?!)")
+
+                names = list(reversed(self._extractors))
+                self._matcher = ({host: combine(group + anywhere) for host, group in by_host.items()},
+                                 combine(anywhere),
+                                 {f"x{i}": (names[i], func) for i, (_, func) in entries})
+            return self._matcher
+
+    def find(self, url: str) -> Optional[Tuple[str, ExtractorFunc]]:
+        """
+        The extractor for a URL.
+
+        Returns:
+            Tuple: (name, function), or None if no pattern matches
+        """
+        by_host, anywhere, groups = self._compiled()
+        key = _match_key(url)
+        match = by_host.get(key[:key.index("/")], anywhere).match(key)
+        return groups[match.lastgroup] if match is not None else None
+
+    def apply(self, result: Dict[str, Any]) -> Any:
+        """
+        Run the matching extractor on a successful fetch result.
+
+        The data is stored as result["extracted"] and the extractor's name as
+        result["metadata"]["extractor"]. An extractor that raises adds a
+        warning to the result instead.
+
+        Args:
+            result (dict): Result from read_internal_website() or a batch function
+
+        Returns:
+            The extracted data, or None for failed results, URLs without an
+            extractor and pages it found nothing in
+        """
+        if not result.get("success"):
+            return None
+        found = self.find(result.get("url") or "")
+        if found is None:
+            return None
+        name, func = found
+        try:
+            data = func(result.get("content"), result["url"])
+        except Exception as e:
+            logger.warning(f"Extractor {name} failed for {result['url']}: {e}")
+            result.setdefault("warnings", []).append(f"Extractor {name} failed: {e}")
+            return None
+        if data is not None:
+            result["extracted"] = data
+            result.setdefault("metadata", {})["extractor"] = name
+        return data
+
+
+def _literal_host(pattern: str) -> Optional[str]:
+    """The host a pattern can only match, if it starts with it literally; else None."""
+    match = _LITERAL_HOST_RE.match(pattern)
+    # A top-level "|" later on could match other hosts too
+    if match is None or "|" in pattern:
+        return None
+    return match.group(1).replace("\\.", ".")
+
+
+def _match_key(url: str) -> str:
+    """The string patterns are matched against: "host/path?query"."""
+    parts = urlsplit(url)
+    key = (parts.hostname or "") + (parts.path or "/")
+    return f"{key}?{parts.query}" if parts.query else key
+
+
+def parse_json_page(content: Any, url: str) -> Any:
+    """The JSON document of a page, decoding it if it came back as text."""
+    if isinstance(content, (dict, list)):
+        return content
+    if isinstance(content, str):
+        try:
+            return json_codec.loads(content)
+        except ValueError:
+            return None
+    return None
+
+
+def parse_code_reviews(content: Any, url: str) -> Optional[List[Dict[str, str]]]:
+    """Rows of a code.amazon.com review list, see cr_parser.parse_cr_table()."""
+    if not isinstance(content, str):
+        return None
+    return parse_cr_table(content) or None
+
+
+def parse_markdown_tables(content: str) -> List[List[Dict[str, str]]]:
+    """
+    Every markdown table in a page, as rows keyed by the header cells.
+
+    Example:
+        >>> parse_markdown_tables("| A | B |\\n|---|---|\\n| 1 | 2 |")
+        [[{'A': '1', 'B': '2'}]]
+    """
+    tables = []
+    for match in _TABLE_RE.finditer(content):
+        lines = [line.strip() for line in match.group().splitlines()]
+        rows = [[cell.strip() for cell in line.strip("|").split("|")]
+                for line in lines if not _TABLE_RULE_RE.match(line)]
+        if len(rows) < 2:
+            continue
+        headers = rows[0]
+        tables.append([dict(zip(headers, row)) for row in rows[1:]])
+    return tables
+
+
+def parse_profile(content: Any, url: str) -> Optional[Dict[str, Any]]:
+    """
+    Fields of a phonetool profile page.
+
+    Returns:
+        dict: {"title": first heading or None, "fields": {label: value},
+            "tables": parse_markdown_tables()}, or None for non-text content
+    """
+    if not isinstance(content, str):
+        return None
+    heading = _HEADING_RE.search(content)
+    fields = {}
+    for match in _FIELD_RE.finditer(content):
+        label = (match.group(1) or match.group(2)).strip()
+        # The first occurrence wins, later ones are usually in free text
+        fields.setdefault(label, match.group(3))
+    return {
+        "title": heading.group(2) if heading else None,
+        "fields": fields,
+        "tables": parse_markdown_tables(content)
+    }
+
+
+def parse_sections(content: Any, url: str) -> Optional[Dict[str, Any]]:
+    """
+    A document page (wiki, quip, builderhub) split at its headings.
+
+    Markdown and HTML are both handled; builderhub's dict is read from its
+    processedContent.
+
+    Returns:
+        dict: {"title": first heading or None, "sections": [{"level": 2,
+            "heading": "...", "text": "..."}]}; text before the first
+            heading is a section with level 0 and heading None
+    """
+    if isinstance(content, dict):
+        content = content.get("processedContent")
+    if not isinstance(content, str):
+        return None
+    if content.lstrip()[:1] == "<":
+        sections = _html_sections(content)
+    else:
+        sections = _markdown_sections(content)
+    title = next((section["heading"] for section in sections if section["level"]), None)
+    return {"title": title, "sections": sections}
+
+
+def _markdown_sections(content: str) -> List[Dict[str, Any]]:
+    sections = []
+    level, heading, start = 0, None, 0
+    for match in _HEADING_RE.finditer(content):
+        text = content[start:match.start()].strip()
+        if heading is not None or text:
+            sections.append({"level": level, "heading": heading, "text": text})
+        level, heading, start = len(match.group(1)), match.group(2), match.end()
+    text = content[start:].strip()
+    if heading is not None or text:
+        sections.append({"level": level, "heading": heading, "text": text})
+    return sections
+
+
+class _SectionParser(html.parser.HTMLParser):
+    """Collects the text of an HTML page per h1-h6 heading."""
+
+    _HEADINGS = {f"h{n}": n for n in range(1, 7)}
+    _SKIPPED = frozenset({"script", "style", "noscript", "template"})
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.sections: List[Dict[str, Any]] = []
+        self._level = 0
+        self._heading: Optional[str] = None
+        self._text: List[str] = []
+        self._in_heading: Optional[int] = None
+        self._heading_text: List[str] = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIPPED:
+            self._skipping += 1
+        elif tag in self._HEADINGS:
+            self._flush()
+            self._in_heading = self._HEADINGS[tag]
+            self._heading_text = []
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIPPED:
+            self._skipping = max(0, self._skipping - 1)
+        elif tag in self._HEADINGS and self._in_heading is not None:
+            self._level, self._heading = self._in_heading, " ".join("".join(self._heading_text).split())
+            self._in_heading = None
+
+    def handle_data(self, data):
+        if self._skipping:
+            return
+        (self._heading_text if self._in_heading is not None else self._text).append(data)
+
+    def _flush(self):
+        text = " ".join("".join(self._text).split())
+        if self._heading is not None or text:
+            self.sections.append({"level": self._level, "heading": self._heading, "text": text})
+        self._text = []
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _html_sections(content: str) -> List[Dict[str, Any]]:
+    parser = _SectionParser()
+    parser.feed(content)
+    parser.close()
+    return parser.sections
+
+
+def _build_default_registry() -> ExtractorRegistry:
+    registry = ExtractorRegistry()
+    # Registered from general to specific: later entries are tried first
+    for name, pattern, func in (
+        ("code", r"code\.amazon\.com/", parse_json_page),
+        ("code-reviews", r"code\.amazon\.com/reviews/[\w-]+/", parse_code_reviews),
+        ("phonetool", r"phonetool\.amazon\.com/users/", parse_profile),
+        ("builderhub", r"builderhub\.corp\.amazon\.com/", parse_sections),
+        ("wiki", r"w\.amazon\.com/", parse_sections),
+        ("quip", r"quip-amazon\.com/", parse_sections),
+        ("issues", r"(?:issues|sim)\.amazon\.com/", parse_json_page),
+        ("apollo", r"apollo\.amazon\.com/", parse_json_page),
+        ("pipelines", r"pipelines\.amazon\.com/", parse_json_page),
+        ("board", r"board\.amazon\.com/", parse_json_page),
+    ):
+        registry.register(name, pattern, func)
+    return registry
+
+
+# Registry used by the module-level functions, with the built-in extractors
+default_registry = _build_default_registry()
+
+
+def register_extractor(name: str, pattern: str, func: ExtractorFunc) -> None:
+    """Add an extractor to the default registry, see ExtractorRegistry.register()."""
+    default_registry.register(name, pattern, func)
+
+
+def unregister_extractor(name: str) -> None:
+    """Remove an extractor from the default registry."""
+    default_registry.unregister(name)
+
+
+def find_extractor(url: str) -> Optional[Tuple[str, ExtractorFunc]]:
+    """The (name, function) of the default registry's extractor for a URL, or None."""
+    return default_registry.find(url)
+
+
+def apply_extractor(result: Dict[str, Any], registry: Optional[ExtractorRegistry] = None) -> Any:
+    """
+    Extract structured data from a fetch result, see ExtractorRegistry.apply().
+
+    Args:
+        result (dict): Result from read_internal_website() or a batch function
+        registry (ExtractorRegistry): Registry to use (default: default_registry)
+
+    Returns:
+        The extracted data (also stored as result["extracted"]), or None
+
+    Example:
+        >>> data = read_internal_website("https://code.amazon.com/reviews/to-user/username")
+        >>> for cr in apply_extractor(data) or []:
+        >>>     print(cr["ID"], cr.get("Summary"))
+    """
+    return (registry or default_registry).apply(result)
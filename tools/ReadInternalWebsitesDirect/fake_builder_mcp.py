@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+
+"""
+fake_builder_mcp.py
+
+A stand-in for builder-mcp that answers ReadInternalWebsites calls locally.
+Useful for exercising read_internal_website.py without network access, and
+for benchmark.py.
+
+It reads newline-delimited JSON-RPC requests on stdin and writes one response
+line per request, so it works both with the one-shot pipe and with the
+persistent MCPSessionPool.
+
+Usage:
+    export BUILDER_MCP_COMMAND="python3 /path/to/fake_builder_mcp.py"
+    python3 read_internal_website.py https://phonetool.amazon.com/users/username
+
+Environment:
+    FAKE_MCP_LATENCY_MS   Delay before each tools/call response (default: 0):
+                          "100" fixed, "50:200" uniform between the two,
+                          "lognormal:100:0.5" log-normal with that median and sigma
+    FAKE_MCP_PAYLOAD_KB   Approximate size of every page (default: a small page)
+    FAKE_MCP_CONTENT_MIX  Weighted page kinds, e.g. "markdown=3,json=1,cr-table=1"
+                          (kinds: markdown, json, html, text, builderhub,
+                          cr-table; default: markdown)
+    FAKE_MCP_ERRORS       Probability per URL of each failure, e.g.
+                          "mcp-error=0.05,hang=0.01" (kinds: mcp-error, garbage,
+                          crash, hang; default: none)
+    FAKE_MCP_SEED         Seed for the choices above (default: 0)
+
+Page kind and injected errors are derived from the seed and the URL, and the
+latency from the seed, the URL and the number of calls the process answered,
+so runs are reproducible. Injected garbage is a non-JSON line (PARSE_ERROR for
+a one-shot process, TIMEOUT for a pool worker, which skips it); crash exits
+without answering and hang never answers.
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+KINDS = ("markdown", "json", "html", "text", "builderhub", "cr-table")
+ERRORS = ("mcp-error", "garbage", "crash", "hang")
+
+
+def fake_page(url: str) -> str:
+    """Build a small markdown page for a URL."""
+    return f"# {url}\n\nFake content served by fake_builder_mcp for [{url}][1].\n\n[1]: {url}\n"
+
+
+def parse_weights(spec: Optional[str], names: Tuple[str, ...]) -> Dict[str, float]:
+    """
+    Parse "name=weight,..." into a dict.
+
+    Raises:
+        ValueError: On an unknown name or a weight that is not a number
+    """
+    weights = {}
+    for part in filter(None, (spec or "").split(",")):
+        name, _, weight = part.strip().partition("=")
+        if name not in names:
+            raise ValueError(f"Unknown kind {name!r} (expected one of: {', '.join(names)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def sample_latency(spec: str, rng: random.Random) -> float:
+    """Draw one latency in milliseconds from a FAKE_MCP_LATENCY_MS spec."""
+    if spec.startswith("lognormal:"):
+        _, median, sigma = spec.split(":")
+        return float(median) * math.exp(rng.gauss(0, float(sigma)))
+    low, _, high = spec.partition(":")
+    return rng.uniform(float(low), float(high)) if high else float(low)
+
+
+def _url_rng(url: str) -> random.Random:
+    seed = int(os.environ.get("FAKE_MCP_SEED", "0"))
+    return random.Random(seed * 1_000_003 + zlib.crc32(url.encode("utf-8")))
+
+
+def _pick(weights: Dict[str, float], rng: random.Random) -> str:
+    names = list(weights)
+    return rng.choices(names, weights=[weights[name] for name in names])[0]
+
+
+def _repeat_to(unit: str, size: int) -> str:
+    return unit * max(1, size // len(unit))
+
+
+def build_page(url: str, kind: str, size: int) -> Any:
+    """
+    Page text of the given kind, about `size` characters (0 for a small page).
+
+    Returns a dict for builderhub pages, which builder-mcp returns as structure.
+    """
+    if kind == "json":
+        rows = [{"id": i, "url": url, "title": f"Item {i}", "tags": ["a", "b"]} for i in range(3)]
+        row = json.dumps(rows[0]) + ","
+        body = ",".join(json.dumps(r) for r in rows) if not size else _repeat_to(row, size)[:-1]
+        return "[" + body + "]"
+    if kind == "html":
+        return "<!doctype html><html><body>" + _repeat_to("<div><p>Fake row</p></div>\n", size or 80) + \
+            "</body></html>"
+    if kind == "text":
+        return _repeat_to("Plain fake text without markup. ", size or 60)
+    if kind == "builderhub":
+        return {"url": url, "processedContent": _repeat_to("Fake builderhub documentation. ", size or 60)}
+    if kind == "cr-table":
+        header = "| ID | Author | Summary | Status | Approved by |\n|---|---|---|---|---|\n"
+        count = max(3, size // 80)
+        return header + "".join(
+            f"| CR-{i} | user{i % 7} | Change number {i} | Open | __ reviewer{i % 5} |\n" for i in range(count))
+    page = fake_page(url)
+    return page + _repeat_to(f"More fake content for [{url}][1].\n", size) if size else page
+
+
+def build_item(url: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    The result.content item for one URL and the failure to inject for it, if any.
+
+    Returns:
+        Tuple: (text item, one of ERRORS or None)
+    """
+    rng = _url_rng(url)
+    mix = parse_weights(os.environ.get("FAKE_MCP_CONTENT_MIX"), KINDS) or {"markdown": 1.0}
+    errors = parse_weights(os.environ.get("FAKE_MCP_ERRORS"), ERRORS)
+    kind = _pick(mix, rng)
+    error = None
+    roll = rng.random()
+    for name, probability in errors.items():
+        if roll < probability:
+            error = name
+            break
+        roll -= probability
+
+    if error == "mcp-error":
+        nested: Any = {"url": url, "content": {"status": "error", "error": f"Injected failure for {url}"}}
+    else:
+        page = build_page(url, kind, int(float(os.environ.get("FAKE_MCP_PAYLOAD_KB", "0")) * 1024))
+        nested = page if isinstance(page, dict) else {"url": url, "content": page}
+    return {"type": "text", "text": json.dumps(nested)}, error
+
+
+def handle(request: dict, call: int = 0) -> Optional[dict]:
+    """
+    Build the JSON-RPC response for one request.
+
+    Args:
+        request (dict): JSON-RPC request
+        call (int): Number of tools/call requests this process answered before
+
+    Returns:
+        dict, or None to answer with a line that is not JSON (injected garbage)
+    """
+    method = request.get("method")
+    response = {"jsonrpc": "2.0", "id": request.get("id")}
+
+    if method == "initialize":
+        response["result"] = {
+            "protocolVersion": request.get("params", {}).get("protocolVersion", "2024-11-05"),
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "fake-builder-mcp", "version": "0.0.0"}
+        }
+    elif method == "tools/call":
+        inputs = request.get("params", {}).get("arguments", {}).get("inputs", [])
+        rng = _url_rng(f"{call}:{inputs[0] if inputs else ''}")
+        latency_ms = sample_latency(os.environ.get("FAKE_MCP_LATENCY_MS", "0"), rng)
+        if latency_ms > 0:
+            time.sleep(latency_ms / 1000.0)
+        items: List[Dict[str, Any]] = []
+        for url in inputs:
+            item, error = build_item(url)
+            if error == "crash":
+                sys.exit(1)
+            if error == "hang":
+                time.sleep(3600)
+            if error == "garbage":
+                return None
+            items.append(item)
+        response["result"] = {"content": items}
+    else:
+        response["error"] = {"code": -32601, "message": f"Method not found: {method}"}
+
+    return response
+
+
+def main():
+    calls = 0
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        request = json.loads(line)
+        if "id" not in request:
+            # Notifications (e.g. notifications/initialized) get no reply
+            continue
+        response = handle(request, calls)
+        calls += request.get("method") == "tools/call"
+        if response is None:
+            sys.stdout.write("Traceback (most recent call last): injected garbage\n")
+        else:
+            sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
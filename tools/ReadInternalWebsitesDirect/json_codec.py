@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""
+json_codec.py
+
+JSON decoding backend for read_internal_website.py.
+
+Uses orjson or msgspec when one of them is installed and falls back to the
+standard library otherwise. A document the fast backend rejects (e.g. NaN
+literals or integers wider than 64 bits, which the stdlib accepts) is
+decoded again with the stdlib, so results never depend on which backend is
+installed.
+
+Usage:
+    import json_codec
+
+    data = json_codec.loads(text)
+    print(json_codec.backend())          # "orjson", "msgspec" or "json"
+    json_codec.use_backend("json")       # force the stdlib, e.g. to compare
+
+string_prefix() decodes a JSON string that may be cut off, which is what is
+left of a page when a response is truncated.
+"""
+
+import json
+from json.decoder import scanstring
+from typing import Any, Callable, Dict, Tuple, Union
+
+_BACKENDS: Dict[str, Callable[[Union[str, bytes]], Any]] = {"json": json.loads}
+
+try:
+    import orjson
+    _BACKENDS["orjson"] = orjson.loads
+except ImportError:
+    pass
+
+try:
+    import msgspec
+    _BACKENDS["msgspec"] = msgspec.json.decode
+except ImportError:
+    pass
+
+_name = next(name for name in ("orjson", "msgspec", "json") if name in _BACKENDS)
+_loads = _BACKENDS[_name]
+
+
+def backend() -> str:
+    """Name of the decoder in use: "orjson", "msgspec" or "json"."""
+    return _name
+
+
+def available_backends() -> list:
+    """Names of the decoders that can be selected with use_backend()."""
+    return list(_BACKENDS)
+
+
+def use_backend(name: str) -> None:
+    """
+    Select the decoder.
+
+    Args:
+        name (str): "orjson", "msgspec" or "json"
+
+    Raises:
+        ValueError: If that backend is not installed
+    """
+    global _name, _loads
+    if name not in _BACKENDS:
+        raise ValueError(f"JSON backend not available: {name} (have: {', '.join(_BACKENDS)})")
+    _name, _loads = name, _BACKENDS[name]
+
+
+def loads(text: Union[str, bytes]) -> Any:
+    """
+    Decode a JSON document.
+
+    Args:
+        text (str or bytes): JSON text
+
+    Returns:
+        The decoded object
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON
+    """
+    if _loads is json.loads:
+        return json.loads(text)
+    try:
+        return _loads(text)
+    except ValueError:
+        # Stdlib-only syntax, or really invalid: let the stdlib decide and raise
+        return json.loads(text)
+
+
+def string_prefix(text: str, start: int) -> Tuple[str, bool]:
+    """
+    Decode the JSON string whose opening quote is at text[start], even if
+    the text ends before the string does.
+
+    An escape sequence or surrogate pair cut in half at the end is dropped.
+
+    Args:
+        text (str): JSON text, possibly truncated
+        start (int): Index of the opening quote
+
+    Returns:
+        Tuple[str, bool]: (the decoded string or its prefix, whether the
+            closing quote was found)
+
+    Raises:
+        json.JSONDecodeError: If the string is invalid before the end of the text
+
+    Example:
+        >>> string_prefix('{"content": "Line 1\\nLine', 12)
+        ('Line 1\nLine', False)
+    """
+    try:
+        return scanstring(text, start + 1)[0], True
+    except json.JSONDecodeError:
+        pass
+    # Unterminated: decode what there is, as if it were closed
+    value = scanstring(text[start + 1:_cut_escape(text)] + '"', 0)[0]
+    if value and "\ud800" <= value[-1] <= "\udbff":
+        value = value[:-1]
+    return value, False
+
+
+def _cut_escape(text: str) -> int:
+    """Index of an escape sequence cut in half at the end of `text`, or len(text)."""
+    # The longest partial escape is a backslash and four characters ("\\u123")
+    backslash = text.rfind("\\", max(0, len(text) - 5))
+    if backslash < 0:
+        return len(text)
+    run = backslash
+    while run > 0 and text[run - 1] == "\\":
+        run -= 1
+    if (backslash - run) % 2:
+        # The last backslash is itself escaped
+        return len(text)
+    escape = text[backslash + 1:]
+    if escape and escape[0] != "u":
+        return len(text)
+    return backslash
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+
+"""
+mcp_session.py
+
+Long-lived builder-mcp client used by read_internal_website.py.
+
+Spawning builder-mcp for every URL pays shell startup, process start and MCP
+initialization on each fetch. This module keeps one or more builder-mcp
+processes open over stdio instead and talks newline-delimited JSON-RPC to them,
+so those costs are paid once per worker rather than once per URL.
+
+Usage:
+    from mcp_session import MCPSessionPool
+
+    pool = MCPSessionPool(size=4)
+    response = pool.call("tools/call", {
+        "name": "ReadInternalWebsites",
+        "arguments": {"inputs": ["https://phonetool.amazon.com/users/username"]}
+    }, timeout=30)
+    pool.close()
+
+The builder-mcp command defaults to ``builder-mcp`` and can be overridden with
+the BUILDER_MCP_COMMAND environment variable (e.g. to point at a fake server
+such as fake_builder_mcp.py for local testing).
+"""
+
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import shlex
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import json_codec
+
+logger = logging.getLogger(__name__)
+
+MCP_PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "read_internal_website", "version": "1.0"}
+
+# Sentinel pushed by the reader thread when builder-mcp closes stdout
+_EOF = object()
+
+# Most bytes of a line read at a time, so the line limit is checked as it arrives
+_READ_CHUNK = 64 * 1024
+
+
+class MCPSessionError(Exception):
+    """Raised when a builder-mcp worker dies or returns an unusable response."""
+
+
+class MCPTimeoutError(MCPSessionError):
+    """Raised when builder-mcp does not answer within the call timeout."""
+
+
+class _LongLine:
+    """Pushed by the reader thread instead of a line longer than the caller's limit."""
+
+    __slots__ = ("head",)
+
+    def __init__(self, head: bytes):
+        self.head = head
+
+
+class MCPResponseTooLargeError(MCPSessionError):
+    """
+    Raised when a builder-mcp response is larger than the caller's limit.
+
+    Attributes:
+        partial (bytes): The start of the response, as far as it was read
+        limit (int): The limit that was exceeded
+    """
+
+    def __init__(self, message: str, partial: bytes = b"", limit: Optional[int] = None):
+        super().__init__(message)
+        self.partial = partial
+        self.limit = limit
+
+
+def default_command() -> List[str]:
+    """
+    Resolve the builder-mcp command line.
+
+    Returns:
+        List[str]: argv for builder-mcp, from BUILDER_MCP_COMMAND if set
+    """
+    return shlex.split(os.environ.get("BUILDER_MCP_COMMAND", "builder-mcp"))
+
+
+class MCPSession:
+    """
+    A single builder-mcp process speaking JSON-RPC over stdin/stdout.
+
+    Requests are numbered with increasing ids and responses are matched by id;
+    notifications and stale responses from earlier (timed out) calls are
+    skipped. A session is not safe for concurrent callers - use MCPSessionPool
+    to share workers between threads.
+    """
+
+    def __init__(self, command: Optional[List[str]] = None, init_timeout: float = 30):
+        self.command = list(command) if command else default_command()
+        self.init_timeout = init_timeout
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Any]" = queue.Queue()
+        self._ids = itertools.count(1)
+        # Longest line the reader thread keeps, from the current call's max_bytes
+        self._line_limit: Optional[int] = None
+        self.calls = 0
+
+    @property
+    def alive(self) -> bool:
+        """True if the builder-mcp process is running."""
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self) -> None:
+        """
+        Spawn builder-mcp and perform the MCP initialize handshake.
+
+        Raises:
+            FileNotFoundError: If the builder-mcp executable does not exist
+            MCPSessionError: If the handshake fails
+        """
+        self._proc = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self._lines = queue.Queue()
+        reader = threading.Thread(
+            target=self._read_lines,
+            args=(self._proc.stdout, self._lines),
+            name=f"builder-mcp-reader-{self._proc.pid}",
+            daemon=True
+        )
+        reader.start()
+        logger.debug(f"Started builder-mcp pid={self._proc.pid}: {self.command}")
+
+        try:
+            self.call("initialize", {
+                "protocolVersion": MCP_PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": CLIENT_INFO
+            }, timeout=self.init_timeout)
+            self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        except MCPSessionError:
+            self.close()
+            raise
+
+    def _read_lines(self, stream, lines: "queue.Queue[Any]") -> None:
+        # Runs on a daemon thread so call() can wait with a timeout
+        parts: List[bytes] = []
+        size = 0
+        skipping = False
+        try:
+            for chunk in iter(lambda: stream.readline(_READ_CHUNK), b""):
+                complete = chunk.endswith(b"\n")
+                if skipping:
+                    skipping = not complete
+                    continue
+                parts.append(chunk)
+                size += len(chunk)
+                # Looked up per chunk: call() sets it while this thread is already waiting
+                limit = self._line_limit
+                if limit is not None and size > limit:
+                    # Keep only the head of an over-long line and skip the rest as it arrives
+                    lines.put(_LongLine(b"".join(parts)[:limit + 1]))
+                    parts, size, skipping = [], 0, not complete
+                elif complete:
+                    lines.put(b"".join(parts))
+                    parts, size = [], 0
+            if parts:
+                lines.put(b"".join(parts))
+        except (OSError, ValueError):
+            pass
+        finally:
+            lines.put(_EOF)
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        if not self.alive:
+            raise MCPSessionError("builder-mcp is not running")
+        try:
+            self._proc.stdin.write(json.dumps(message).encode("utf-8") + b"\n")
+            self._proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise MCPSessionError(f"Failed to write to builder-mcp: {e}")
+
+    def call(self, method: str, params: Dict[str, Any], timeout: float = 30,
+             timer: Optional[Any] = None, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Send a JSON-RPC request and wait for the matching response.
+
+        Args:
+            method (str): JSON-RPC method, e.g. "tools/call"
+            params (dict): JSON-RPC params
+            timeout (float): Seconds to wait for the response
+            timer: Object with a mark(phase) method, e.g. metrics.PhaseTimer;
+                marks "read" and "decode" (default: no timing)
+            max_bytes (int): Reject a response line longer than this. Only its
+                first max_bytes bytes are kept, for the error; the rest is
+                read and dropped as it arrives (default: no limit)
+
+        Returns:
+            dict: The full JSON-RPC response envelope
+
+        Raises:
+            MCPTimeoutError: If no response arrives in time
+            MCPResponseTooLargeError: If a response line is longer than max_bytes
+            MCPSessionError: If builder-mcp exits or sends invalid JSON
+        """
+        request_id = next(self._ids)
+        self._line_limit = max_bytes
+        self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        self.calls += 1
+
+        while True:
+            try:
+                line = self._lines.get(timeout=timeout)
+            except queue.Empty:
+                raise MCPTimeoutError(f"No response from builder-mcp after {timeout} seconds")
+            if timer is not None:
+                timer.mark("read")
+            if line is _EOF:
+                # The process may not have exited yet; without this the next
+                # caller could be handed the same dead worker
+                self.close()
+                raise MCPSessionError("builder-mcp exited unexpectedly")
+            if isinstance(line, _LongLine):
+                # Could be a notification, but one this large is the answer in practice
+                limit = len(line.head) - 1
+                raise MCPResponseTooLargeError(f"builder-mcp sent a response over {limit} bytes",
+                                               line.head[:limit], limit)
+            try:
+                message = json_codec.loads(line)
+            except json.JSONDecodeError:
+                logger.debug(f"Skipping non-JSON output from builder-mcp: {line[:200]!r}")
+                continue
+            finally:
+                if timer is not None:
+                    timer.mark("decode")
+            if isinstance(message, dict) and message.get("id") == request_id:
+                return message
+            # Notification or a late answer to a call that already timed out
+
+    def close(self, timeout: float = 5) -> None:
+        """Close stdin so builder-mcp exits, killing it if it does not."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        logger.debug(f"Stopped builder-mcp pid={proc.pid}")
+
+
+class MCPSessionPool:
+    """
+    A fixed-size pool of MCPSession workers shared between threads.
+
+    Workers are started lazily, handed out one caller at a time and restarted
+    transparently if their process has died. All workers are shut down at
+    interpreter exit.
+
+    Example:
+        >>> pool = MCPSessionPool(size=4)
+        >>> with pool.session() as session:
+        >>>     response = session.call("tools/list", {})
+        >>> pool.close()
+    """
+
+    def __init__(self, size: int = 1, command: Optional[List[str]] = None, init_timeout: float = 30):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.command = list(command) if command else default_command()
+        self.init_timeout = init_timeout
+        self.restarts = 0
+        self._closed = False
+        self._idle: "queue.LifoQueue[MCPSession]" = queue.LifoQueue()
+        self._sessions: List[MCPSession] = []
+        for _ in range(size):
+            session = MCPSession(self.command, init_timeout)
+            self._sessions.append(session)
+            self._idle.put(session)
+        atexit.register(self.close)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None, timer: Optional[Any] = None) -> Iterator[MCPSession]:
+        """
+        Check out a running worker for exclusive use.
+
+        Args:
+            timeout (float): Seconds to wait for a free worker (default: forever)
+            timer: Object with a mark(phase) method; marks "queue", and "spawn"
+                if the worker had to be started (default: no timing)
+
+        Raises:
+            MCPTimeoutError: If no worker becomes free in time
+        """
+        if self._closed:
+            raise MCPSessionError("Session pool is closed")
+        try:
+            session = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise MCPTimeoutError(f"No idle builder-mcp worker after {timeout} seconds")
+        if timer is not None:
+            timer.mark("queue")
+
+        try:
+            if not session.alive:
+                if session.calls:
+                    self.restarts += 1
+                    logger.warning("builder-mcp worker died, restarting")
+                session.close()
+                session.start()
+                if timer is not None:
+                    timer.mark("spawn")
+            yield session
+        except MCPTimeoutError:
+            # A hung worker would poison the next caller, so replace it; kill it
+            # rather than wait for a graceful exit while the caller is blocked
+            session.close(timeout=0)
+            raise
+        finally:
+            self._idle.put(session)
+
+    def call(self, method: str, params: Dict[str, Any], timeout: float = 30,
+             timer: Optional[Any] = None, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run one JSON-RPC call on any free worker.
+
+        Args:
+            method (str): JSON-RPC method
+            params (dict): JSON-RPC params
+            timeout (float): Seconds for the whole call, including waiting for a
+                free worker and starting it
+            timer: Object with a mark(phase) method, e.g. metrics.PhaseTimer
+                (default: no timing)
+            max_bytes (int): Largest acceptable response line (default: no limit)
+
+        Returns:
+            dict: The JSON-RPC response envelope
+
+        Raises:
+            MCPTimeoutError: If no worker is free or no response arrives in time
+        """
+        deadline = time.monotonic() + timeout
+        with self.session(timeout=timeout, timer=timer) as session:
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                return session.call(method, params, timeout=remaining, timer=timer, max_bytes=max_bytes)
+        # Out of time before the request was sent, so the worker is still usable
+        raise MCPTimeoutError(f"No builder-mcp response after {timeout} seconds")
+
+    def close(self) -> None:
+        """Shut down every worker. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        for session in self._sessions:
+            session.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "MCPSessionPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
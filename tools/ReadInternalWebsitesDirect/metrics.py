@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+
+"""
+metrics.py
+
+Fetch instrumentation for read_internal_website.py.
+
+A PhaseTimer splits the time of one builder-mcp request into phases; every
+result gets them as metadata["timings_ms"]:
+
+    queue       waiting for an idle session pool worker
+    spawn       starting builder-mcp (and a pool worker's MCP handshake)
+    first_byte  from sending the request to the first byte of output
+    read        reading the rest of the response
+    decode      parsing the JSON-RPC envelope
+    extract     pulling each URL's content out of the envelope
+    detect      content type detection (and decoding JSON pages)
+    total       wall time from the start of the request until the result was ready
+
+Phases a request did not go through are left out. When a fetch fails, the
+time of the phase it failed in (e.g. a first_byte that never came) is only
+part of the total. A session pool worker
+delivers its response as a single line, so with a pool the whole wait is
+reported as read and there is no first_byte. Lazy results stop at decode;
+their content is extracted when it is first accessed. A MetricsRegistry
+aggregates finished results per host: counts, error_code counts, latency
+percentiles and per-phase totals, exported as OpenMetrics text or a JSON
+summary.
+
+Usage:
+    from metrics import MetricsRegistry
+
+    registry = MetricsRegistry()
+    for result in results:
+        registry.observe(result)
+    print(registry.to_openmetrics())
+"""
+
+import json
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+PHASES = ("queue", "spawn", "first_byte", "read", "decode", "extract", "detect")
+QUANTILES = (0.5, 0.95, 0.99)
+
+_PREFIX = "read_internal_website"
+
+
+class PhaseTimer:
+    """
+    Accumulates elapsed time per phase of one request.
+
+    Each mark() charges the time since the previous mark (or since the timer
+    was created) to the named phase.
+
+    Example:
+        >>> timer = PhaseTimer()
+        >>> proc = spawn()
+        >>> timer.mark("spawn")
+        >>> timer.as_ms()  # {"spawn": 2.1, "total": 2.2}
+    """
+
+    def __init__(self):
+        self.started = self._last = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        """Charge the time since the previous mark to `phase`."""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._last)
+        self._last = now
+
+    def fork(self) -> "PhaseTimer":
+        """
+        Independent timer with the phases so far whose next mark() starts now.
+
+        Used to time the per-URL phases of a batched request separately; the
+        total of a fork still counts from the start of the request.
+        """
+        timer = PhaseTimer.__new__(PhaseTimer)
+        timer.started, timer._last, timer.phases = self.started, time.perf_counter(), dict(self.phases)
+        return timer
+
+    def as_ms(self) -> Dict[str, float]:
+        """Phases in milliseconds, in pipeline order, plus the total up to now."""
+        timings = {phase: round(self.phases[phase] * 1000, 3) for phase in _ordered(self.phases)}
+        timings["total"] = round((time.perf_counter() - self.started) * 1000, 3)
+        return timings
+
+
+class _HostStats:
+    def __init__(self):
+        self.fetches = 0
+        self.succeeded = 0
+        self.retries = 0
+        self.error_codes: Dict[str, int] = {}
+        self.latencies: List[float] = []
+        self.phases: Dict[str, float] = {}
+
+    def add(self, other: "_HostStats") -> None:
+        self.fetches += other.fetches
+        self.succeeded += other.succeeded
+        self.retries += other.retries
+        for code, count in other.error_codes.items():
+            self.error_codes[code] = self.error_codes.get(code, 0) + count
+        self.latencies.extend(other.latencies)
+        for phase, seconds in other.phases.items():
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+
+class MetricsRegistry:
+    """
+    Per-host aggregate of fetch results (thread-safe).
+
+    Every result passed to observe() counts as one fetch of its URL's host.
+    Latency is the result's timings_ms total, so results that never reached
+    builder-mcp (e.g. CIRCUIT_OPEN) are counted but have no latency sample.
+
+    Example:
+        >>> registry = MetricsRegistry()
+        >>> registry.observe(read_internal_website(url))
+        >>> registry.summary()["hosts"]["code.amazon.com"]["latency_ms"]["p95"]
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostStats] = {}
+
+    def observe(self, result: Dict[str, Any]) -> None:
+        """
+        Record one finished result.
+
+        Args:
+            result (dict): Result from read_internal_website() or a batch function
+        """
+        host = (urlsplit(result.get("url") or "").hostname or "").lower()
+        metadata = result.get("metadata") or {}
+        timings = metadata.get("timings_ms") or {}
+        with self._lock:
+            stats = self._hosts.setdefault(host, _HostStats())
+            stats.fetches += 1
+            stats.retries += max(0, metadata.get("attempts", 1) - 1)
+            if result.get("success"):
+                stats.succeeded += 1
+            else:
+                code = result.get("error_code") or "UNKNOWN"
+                stats.error_codes[code] = stats.error_codes.get(code, 0) + 1
+            if "total" in timings:
+                stats.latencies.append(timings["total"] / 1000)
+            for phase, ms in timings.items():
+                if phase != "total":
+                    stats.phases[phase] = stats.phases.get(phase, 0.0) + ms / 1000
+
+    def _snapshot(self) -> Dict[str, _HostStats]:
+        with self._lock:
+            snapshot = {}
+            for host, stats in self._hosts.items():
+                copy = _HostStats()
+                copy.add(stats)
+                snapshot[host] = copy
+            return snapshot
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        JSON-serializable summary, per host and over all hosts.
+
+        Returns:
+            dict: {"hosts": {host: stats}, "total": stats}, where stats has
+                fetches, succeeded, failed, retries, error_codes, latency_ms
+                (p50/p95/p99/mean/max) and phases_ms (mean per fetch)
+        """
+        hosts = self._snapshot()
+        total = _HostStats()
+        for stats in hosts.values():
+            total.add(stats)
+        return {
+            "hosts": {host: _summarize(stats) for host, stats in sorted(hosts.items())},
+            "total": _summarize(total)
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """summary() as JSON text."""
+        return json.dumps(self.summary(), indent=indent)
+
+    def to_openmetrics(self) -> str:
+        """
+        OpenMetrics text exposition of the per-host metrics.
+
+        Returns:
+            str: Counters for fetches by outcome, errors by error_code and
+                retries, a summary of fetch latency with p50/p95/p99 and
+                per-phase time totals, terminated by "# EOF"
+        """
+        hosts = sorted(self._snapshot().items())
+        lines = [
+            f"# TYPE {_PREFIX}_fetches counter",
+            f"# HELP {_PREFIX}_fetches Fetched URLs by host and outcome.",
+        ]
+        for host, stats in hosts:
+            lines.append(f"{_PREFIX}_fetches_total{_labels(host=host, outcome='success')} {stats.succeeded}")
+            lines.append(f"{_PREFIX}_fetches_total{_labels(host=host, outcome='error')} "
+                         f"{stats.fetches - stats.succeeded}")
+
+        lines += [f"# TYPE {_PREFIX}_errors counter",
+                  f"# HELP {_PREFIX}_errors Failed fetches by host and error_code."]
+        for host, stats in hosts:
+            for code, count in sorted(stats.error_codes.items()):
+                lines.append(f"{_PREFIX}_errors_total{_labels(host=host, error_code=code)} {count}")
+
+        lines += [f"# TYPE {_PREFIX}_retries counter",
+                  f"# HELP {_PREFIX}_retries Attempts beyond the first, by host."]
+        for host, stats in hosts:
+            lines.append(f"{_PREFIX}_retries_total{_labels(host=host)} {stats.retries}")
+
+        lines += [f"# TYPE {_PREFIX}_fetch_duration_seconds summary",
+                  f"# UNIT {_PREFIX}_fetch_duration_seconds seconds",
+                  f"# HELP {_PREFIX}_fetch_duration_seconds Time from the start of a fetch to its result."]
+        for host, stats in hosts:
+            samples = sorted(stats.latencies)
+            for q in QUANTILES:
+                if samples:
+                    lines.append(f"{_PREFIX}_fetch_duration_seconds{_labels(host=host, quantile=str(q))} "
+                                 f"{_number(_percentile(samples, q))}")
+            lines.append(f"{_PREFIX}_fetch_duration_seconds_sum{_labels(host=host)} {_number(sum(samples))}")
+            lines.append(f"{_PREFIX}_fetch_duration_seconds_count{_labels(host=host)} {len(samples)}")
+
+        lines += [f"# TYPE {_PREFIX}_phase_seconds counter",
+                  f"# UNIT {_PREFIX}_phase_seconds seconds",
+                  f"# HELP {_PREFIX}_phase_seconds Time spent per fetch phase, by host."]
+        for host, stats in hosts:
+            for phase in _ordered(stats.phases):
+                lines.append(f"{_PREFIX}_phase_seconds_total{_labels(host=host, phase=phase)} "
+                             f"{_number(stats.phases[phase])}")
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Forget everything observed so far."""
+        with self._lock:
+            self._hosts.clear()
+
+
+def _summarize(stats: _HostStats) -> Dict[str, Any]:
+    samples = sorted(stats.latencies)
+    latency: Dict[str, Any] = {}
+    if samples:
+        latency = {f"p{round(q * 100)}": round(_percentile(samples, q) * 1000, 3) for q in QUANTILES}
+        latency["mean"] = round(sum(samples) / len(samples) * 1000, 3)
+        latency["max"] = round(samples[-1] * 1000, 3)
+    return {
+        "fetches": stats.fetches,
+        "succeeded": stats.succeeded,
+        "failed": stats.fetches - stats.succeeded,
+        "retries": stats.retries,
+        "error_codes": dict(sorted(stats.error_codes.items())),
+        "latency_ms": latency,
+        "phases_ms": {phase: round(stats.phases[phase] / stats.fetches * 1000, 3)
+                      for phase in _ordered(stats.phases)}
+    }
+
+
+def _ordered(phases: Dict[str, Any]) -> List[str]:
+    """Phase names in pipeline order, unknown ones last."""
+    return [phase for phase in PHASES if phase in phases] + sorted(set(phases) - set(PHASES))
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted, non-empty samples."""
+    return samples[max(0, math.ceil(q * len(samples)) - 1)]
+
+
+def _labels(**labels: str) -> str:
+    escaped = (f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(round(value, 6))
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""
+rate_limit.py
+
+Client-side token-bucket rate limiting per host for read_internal_website.py.
+
+Each hostname gets its own bucket that refills at `rps` tokens per second up
+to `burst` tokens; every builder-mcp request for the host takes one token.
+Rates are configured per domain, and a domain rule also covers its
+subdomains. Hosts without a matching rule use the default rate, or are not
+limited at all if there is none.
+
+A token is reserved under a lock and the caller then sleeps outside it for
+as long as the bucket is in debt, so the same limiter can be shared by
+worker threads (acquire) and asyncio tasks (aacquire) without blocking
+either on the other.
+
+Usage:
+    from rate_limit import RateLimiter
+
+    limiter = RateLimiter({"code.amazon.com": (2, 4)}, default=(10, 20))
+    waited = limiter.acquire("code.amazon.com")
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+Rate = Tuple[float, float]
+
+
+class RateLimiter:
+    """
+    Per-host token buckets.
+
+    Args:
+        rates (dict): Domain -> (requests per second, burst)
+        default (tuple): (requests per second, burst) for other hosts (default: unlimited)
+
+    Example:
+        >>> limiter = RateLimiter({"issues.amazon.com": (1, 2)})
+        >>> limiter.acquire("issues.amazon.com")  # 0.0, the bucket starts full
+    """
+
+    def __init__(self, rates: Optional[Dict[str, Rate]] = None, default: Optional[Rate] = None):
+        self.rates = {domain.lower(): self._check(rate) for domain, rate in (rates or {}).items()}
+        self.default = self._check(default) if default is not None else None
+        self._lock = threading.Lock()
+        # host -> (tokens, last refill); tokens go negative while callers wait
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    @staticmethod
+    def _check(rate: Rate) -> Rate:
+        rps, burst = rate
+        if rps <= 0 or burst < 1:
+            raise ValueError(f"Invalid rate {rate}: need rps > 0 and burst >= 1")
+        return float(rps), float(burst)
+
+    def rate_for(self, host: str) -> Optional[Rate]:
+        """
+        Rate for a host: the most specific matching domain rule, else the default.
+
+        Args:
+            host (str): Hostname
+
+        Returns:
+            Tuple[float, float] or None: (rps, burst), or None if unlimited
+        """
+        domain = host.lower()
+        while domain:
+            if domain in self.rates:
+                return self.rates[domain]
+            domain = domain.partition(".")[2]
+        return self.default
+
+    def reserve(self, host: str) -> float:
+        """
+        Take a token for `host` without waiting.
+
+        Args:
+            host (str): Hostname
+
+        Returns:
+            float: Seconds the caller must wait before sending the request
+        """
+        rate = self.rate_for(host)
+        if rate is None:
+            return 0.0
+        rps, burst = rate
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(host, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rps) - 1
+            self._buckets[host] = (tokens, now)
+        return -tokens / rps if tokens < 0 else 0.0
+
+    def acquire(self, host: str) -> float:
+        """
+        Block the calling thread until a request for `host` may be sent.
+
+        Returns:
+            float: Seconds waited
+        """
+        wait = self.reserve(host)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, host: str) -> float:
+        """
+        Asyncio version of acquire(); only the calling task waits.
+
+        Returns:
+            float: Seconds waited
+        """
+        wait = self.reserve(host)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+"""
+resilience.py
+
+Retry policy and per-host circuit breaker for read_internal_website.py.
+
+A RetryPolicy decides which failed results are worth fetching again (by
+error_code), how many attempts are allowed, how long to back off between them
+(exponential, with full jitter) and the overall deadline after which no new
+attempt is started.
+
+A CircuitBreaker counts consecutive failures per hostname. Once a host
+reaches the threshold its circuit opens and fetches for it fail immediately
+with error_code CIRCUIT_OPEN instead of tying up a worker; after
+`reset_timeout` seconds a single probe fetch is let through and its outcome
+closes or re-opens the circuit.
+
+Usage:
+    from resilience import CircuitBreaker, RetryPolicy
+
+    policy = RetryPolicy(max_attempts=4, base_delay=0.5, deadline=60)
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+"""
+
+import random
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+# Failures of the transport or of builder-mcp itself, as opposed to a bad URL
+DEFAULT_RETRYABLE: FrozenSet[str] = frozenset({"TIMEOUT", "SUBPROCESS_ERROR", "PARSE_ERROR", "MCP_ERROR"})
+
+
+class RetryPolicy:
+    """
+    Which failures to retry, how often and how long to wait in between.
+
+    Args:
+        max_attempts (int): Total attempts per URL, including the first (default: 3)
+        retry_on (Iterable[str]): Retryable error codes (default: TIMEOUT,
+            SUBPROCESS_ERROR, PARSE_ERROR, MCP_ERROR)
+        base_delay (float): Backoff ceiling after the first attempt in seconds (default: 0.5)
+        max_delay (float): Upper bound for the backoff ceiling in seconds (default: 10)
+        deadline (float): No attempt is started later than this many seconds
+            after the first one (default: no deadline)
+
+    Example:
+        >>> policy = RetryPolicy(max_attempts=5, retry_on={"TIMEOUT"}, deadline=120)
+        >>> policy.backoff(2)  # random delay in [0, 1.0]
+    """
+
+    def __init__(self, max_attempts: int = 3, retry_on: Optional[Iterable[str]] = None,
+                 base_delay: float = 0.5, max_delay: float = 10.0, deadline: Optional[float] = None):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.retry_on = frozenset(retry_on) if retry_on is not None else DEFAULT_RETRYABLE
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def should_retry(self, result: Dict[str, Any], attempts: int) -> bool:
+        """
+        Whether a result warrants another attempt.
+
+        Args:
+            result (dict): Result of the latest attempt
+            attempts (int): Attempts made so far
+
+        Returns:
+            bool: True if the result failed with a retryable code and attempts remain
+        """
+        return (not result.get("success") and result.get("error_code") in self.retry_on
+                and attempts < self.max_attempts)
+
+    def backoff(self, attempts: int) -> float:
+        """
+        Delay before the next attempt: full jitter over an exponential ceiling.
+
+        Args:
+            attempts (int): Attempts made so far (>= 1)
+
+        Returns:
+            float: Seconds to sleep
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        return random.uniform(0, ceiling)
+
+    def allows(self, elapsed: float, delay: float) -> bool:
+        """
+        Whether an attempt starting after `delay` more seconds is within the deadline.
+
+        Args:
+            elapsed (float): Seconds since the first attempt started
+            delay (float): Backoff about to be slept
+
+        Returns:
+            bool: False if the deadline would be passed
+        """
+        return self.deadline is None or elapsed + delay < self.deadline
+
+
+class CircuitBreaker:
+    """
+    Per-hostname circuit breaker shared by all fetches (thread-safe).
+
+    Args:
+        failure_threshold (int): Consecutive failures that open a host's circuit (default: 5)
+        reset_timeout (float): Seconds an open circuit waits before letting a probe through (default: 30)
+        failure_codes (Iterable[str]): Error codes counted as host failures
+            (default: the retryable codes)
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 failure_codes: Optional[Iterable[str]] = None):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_codes = frozenset(failure_codes) if failure_codes is not None else DEFAULT_RETRYABLE
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        # Hosts with a probe in flight -> when it was let through
+        self._probing: Dict[str, float] = {}
+
+    def allow(self, host: str) -> bool:
+        """
+        Whether a fetch for `host` may go ahead.
+
+        Once the reset timeout has passed, the first caller is let through as a
+        probe and the circuit stays open for everyone else until it reports.
+
+        Args:
+            host (str): Hostname
+
+        Returns:
+            bool: False if the circuit is open
+        """
+        now = time.monotonic()
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if now - max(opened_at, self._probing.get(host, opened_at)) < self.reset_timeout:
+                # Still cooling down, or a probe is in flight (one that never
+                # reported, e.g. cancelled, is given up after reset_timeout)
+                return False
+            self._probing[host] = now
+            return True
+
+    def record(self, host: str, result: Dict[str, Any]) -> None:
+        """
+        Report the outcome of a fetch for `host`.
+
+        Args:
+            host (str): Hostname
+            result (dict): Result of the fetch
+        """
+        failed = not result.get("success") and result.get("error_code") in self.failure_codes
+        with self._lock:
+            probe = self._probing.pop(host, None) is not None
+            if not failed:
+                self._failures.pop(host, None)
+                self._opened_at.pop(host, None)
+                return
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if probe or self._failures[host] >= self.failure_threshold:
+                self._opened_at[host] = time.monotonic()
+
+    def retry_after(self, host: str) -> float:
+        """Seconds until an open circuit for `host` admits a probe (0 if closed)."""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+        if opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - opened_at))
+
+    def state(self, host: str) -> str:
+        """Circuit state for `host`: "closed", "open" or "half-open"."""
+        with self._lock:
+            if host not in self._opened_at:
+                return "closed"
+            if host in self._probing or time.monotonic() - self._opened_at[host] >= self.reset_timeout:
+                return "half-open"
+            return "open"
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+"""
+response_cache.py
+
+Opt-in response cache for read_internal_website.py.
+
+Results are cached by normalized URL in two tiers: a small in-process LRU
+dictionary in front of a size-bounded sqlite database on disk. Entries expire
+after a per-domain TTL. An expired entry is kept until it is refetched: if the
+new content has the same digest, only its timestamp is refreshed (the
+builder-mcp equivalent of an ETag revalidation), otherwise it is replaced.
+When the database grows past its byte budget, least recently used entries
+are evicted.
+
+Usage:
+    from response_cache import ResponseCache
+
+    cache = ResponseCache("~/.cache/read_internal_website", ttl=300,
+                          domain_ttls={"phonetool.amazon.com": 3600})
+    hit = cache.get(key)
+    if hit is None:
+        cache.put(key, result)
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "read_internal_website")
+DEFAULT_TTL = 300
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MEMORY_ENTRIES = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+
+def _digest(result: Dict[str, Any]) -> str:
+    """Fingerprint the parts of a result that change when the page changes."""
+    if "lazy_items" in result:
+        # Undecoded entry from a lazy fetch: the raw builder-mcp items are the page
+        payload = json.dumps(["raw", result["lazy_items"]], sort_keys=True)
+    else:
+        payload = json.dumps([result.get("content_type"), result.get("content")], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier (memory + sqlite) cache of successful fetch results.
+
+    Args:
+        cache_dir (str): Directory holding cache.sqlite3 (default: ~/.cache/read_internal_website)
+        ttl (float): Seconds an entry stays fresh (default: 300)
+        domain_ttls (dict): Per-domain TTL overrides; a key also matches its subdomains
+        max_bytes (int): Disk tier budget before LRU eviction (default: 256 MiB)
+        memory_entries (int): Entries kept in the in-process tier (default: 256)
+
+    Thread-safe: one instance can be shared by concurrent batch workers.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 domain_ttls: Optional[Dict[str, float]] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.cache_dir = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
+        self.ttl = ttl
+        self.domain_ttls = {domain.lower(): value for domain, value in (domain_ttls or {}).items()}
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        # Access times not yet written to disk; flushed with the next write
+        self._touched: Dict[str, float] = {}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(self.cache_dir, "cache.sqlite3"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def ttl_for(self, key: str) -> float:
+        """
+        TTL for a URL: the most specific matching domain override, else the default.
+
+        Args:
+            key (str): Normalized URL
+
+        Returns:
+            float: TTL in seconds
+        """
+        host = (urlsplit(key).hostname or "").lower()
+        while host:
+            if host in self.domain_ttls:
+                return self.domain_ttls[host]
+            host = host.partition(".")[2]
+        return self.ttl
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float, str]]:
+        """
+        Look up a fresh entry.
+
+        Args:
+            key (str): Normalized URL
+
+        Returns:
+            Tuple[dict, float, str] or None: (copy of the cached result, age in
+                seconds, "memory" or "disk"), or None if missing or expired
+        """
+        now = time.time()
+        ttl = self.ttl_for(key)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, _, result = entry
+                if now - stored_at <= ttl:
+                    self._memory.move_to_end(key)
+                    self._touched[key] = now
+                    return copy.deepcopy(result), now - stored_at, "memory"
+                return None
+
+            row = self._db.execute(
+                "SELECT stored_at, digest, body FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            stored_at, digest, body = row
+            if now - stored_at > ttl:
+                return None
+            result = json.loads(body)
+            self._touched[key] = now
+            self._remember(key, stored_at, digest, result)
+            return copy.deepcopy(result), now - stored_at, "disk"
+
+    def put(self, key: str, result: Dict[str, Any]) -> bool:
+        """
+        Store a successful result, revalidating an existing entry if unchanged.
+
+        Args:
+            key (str): Normalized URL
+            result (dict): Result from read_internal_website()
+
+        Returns:
+            bool: True if an existing entry had identical content and was only refreshed
+        """
+        now = time.time()
+        digest = _digest(result)
+        with self._lock:
+            self._flush_touched()
+            row = self._db.execute("SELECT digest FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[0] == digest:
+                self._db.execute(
+                    "UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+                )
+                self._db.commit()
+                self._remember(key, now, digest, copy.deepcopy(result))
+                return True
+
+            body = json.dumps(result).encode("utf-8")
+            old_size = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, stored_at, accessed_at, size, digest, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, now, now, len(body), digest, body)
+            )
+            self._total_bytes += len(body) - (old_size[0] if old_size else 0)
+            self._evict()
+            self._db.commit()
+            self._remember(key, now, digest, copy.deepcopy(result))
+            return False
+
+    def _remember(self, key: str, stored_at: float, digest: str, result: Dict[str, Any]) -> None:
+        # Caller holds self._lock
+        self._memory[key] = (stored_at, digest, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _flush_touched(self) -> None:
+        # Caller holds self._lock
+        if self._touched:
+            self._db.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        # Caller holds self._lock; drop least recently used rows until under budget
+        while self._total_bytes > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._memory.pop(key, None)
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
+            logger.debug(f"Cache evicted down to {self._total_bytes} bytes")
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        """Flush and close the disk tier."""
+        with self._lock:
+            self._flush_touched()
+            self._db.commit()
+            self._db.close()
@@ -0,0 +1,63 @@
+"""
+Shared fixtures for the read_internal_website.py tests.
+
+The tests import the modules next to this directory and talk to
+fake_builder_mcp.py instead of the real builder-mcp, so they need neither
+builder-mcp nor network access:
+
+    python3 -m pytest tests
+"""
+
+import importlib.util
+import os
+import shlex
+import sys
+from pathlib import Path
+
+import pytest
+
+HERE = Path(__file__).resolve().parent.parent
+FAKE_SERVER = HERE / "fake_builder_mcp.py"
+
+sys.path.insert(0, str(HERE))
+
+
+def _load_client():
+    """Import read_internal_website.py, stored as executable_read_internal_website.py in the dotfiles tree."""
+    if "read_internal_website" in sys.modules:
+        return sys.modules["read_internal_website"]
+    for name in ("read_internal_website.py", "executable_read_internal_website.py"):
+        path = HERE / name
+        if path.exists():
+            spec = importlib.util.spec_from_file_location("read_internal_website", path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules["read_internal_website"] = module
+            spec.loader.exec_module(module)
+            return module
+    raise RuntimeError("read_internal_website.py not found")
+
+
+@pytest.fixture(scope="session")
+def client():
+    """The read_internal_website module."""
+    return _load_client()
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    """
+    Point the client at fake_builder_mcp.py; call the fixture to configure it.
+
+    Example:
+        >>> fake_server(latency_ms=50, errors="mcp-error=1")
+    """
+    def configure(latency_ms=0, page_kb=0, content_mix="", errors="", seed=0):
+        monkeypatch.setenv("BUILDER_MCP_COMMAND", f"{shlex.quote(sys.executable)} {shlex.quote(str(FAKE_SERVER))}")
+        monkeypatch.setenv("FAKE_MCP_LATENCY_MS", str(latency_ms))
+        monkeypatch.setenv("FAKE_MCP_PAYLOAD_KB", str(page_kb))
+        monkeypatch.setenv("FAKE_MCP_CONTENT_MIX", content_mix)
+        monkeypatch.setenv("FAKE_MCP_ERRORS", errors)
+        monkeypatch.setenv("FAKE_MCP_SEED", str(seed))
+
+    configure()
+    return configure
@@ -0,0 +1,106 @@
+"""Tests for the asyncio API: session pool use and per-host limits."""
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+URLS = [f"https://w.amazon.com/bin/view/Page{i}" for i in range(4)]
+
+
+@pytest.fixture
+def pool(client, fake_server):
+    pool = client.enable_session_pool(size=2)
+    yield pool
+    client.disable_session_pool()
+
+
+def test_default_pool_is_used(client, pool, monkeypatch):
+    async def spawn(*args, **kwargs):
+        raise AssertionError("spawned builder-mcp instead of using the pool")
+    monkeypatch.setattr(client, "_arun_builder_mcp", spawn)
+
+    results = asyncio.run(client.aread_internal_websites(URLS, max_concurrency=4))
+    assert all(client.is_success(result) for result in results)
+    assert [result["url"] for result in results] == URLS
+    assert client.is_success(asyncio.run(client.aread_internal_website(URLS[0] + "?single")))
+    # Each started worker made one initialize call, the rest are fetches
+    started = [session for session in pool._sessions if session.calls]
+    assert sum(session.calls for session in started) - len(started) == len(URLS) + 1
+
+
+def test_without_pool_spawns_per_call(client, fake_server):
+    assert client._default_pool is None
+    results = asyncio.run(client.aread_internal_websites(URLS[:2]))
+    assert all(client.is_success(result) for result in results)
+
+
+def test_per_host_limit(client, fake_server, monkeypatch):
+    fake_server(latency_ms=50)
+    urls = [f"https://a.amazon.com/p{i}" for i in range(6)] + [f"https://b.amazon.com/p{i}" for i in range(3)]
+    in_flight, peak = Counter(), Counter()
+    fetch_chunk = client._afetch_chunk
+
+    async def counting(chunk_urls, *args):
+        host = client.url_host(chunk_urls[0])
+        in_flight[host] += 1
+        in_flight["all"] += 1
+        peak[host] = max(peak[host], in_flight[host])
+        peak["all"] = max(peak["all"], in_flight["all"])
+        try:
+            return await fetch_chunk(chunk_urls, *args)
+        finally:
+            in_flight[host] -= 1
+            in_flight["all"] -= 1
+    monkeypatch.setattr(client, "_afetch_chunk", counting)
+
+    results = asyncio.run(client.aread_internal_websites(urls, max_concurrency=4, per_host_limit=2))
+    assert all(client.is_success(result) for result in results)
+    assert peak["a.amazon.com"] == 2 and peak["b.amazon.com"] == 2
+    # Waiting a.amazon.com requests did not hold the other two slots
+    assert peak["all"] == 4
+
+
+class _NoReaderLoop(asyncio.SelectorEventLoop):
+    """A loop without add_reader(), like the Windows proactor loop."""
+
+    def add_reader(self, *args):
+        raise NotImplementedError
+
+
+def _spawned(client, monkeypatch):
+    """Record the builder-mcp processes _arun_builder_mcp() starts."""
+    procs = []
+    create = asyncio.create_subprocess_exec
+
+    async def recording(*args, **kwargs):
+        procs.append(await create(*args, **kwargs))
+        return procs[-1]
+    monkeypatch.setattr(client.asyncio, "create_subprocess_exec", recording)
+    return procs
+
+
+def test_spawn_uses_asyncio_subprocess_streams(client, fake_server):
+    loop = _NoReaderLoop()
+    try:
+        result = loop.run_until_complete(client.aread_internal_website(URLS[0]))
+    finally:
+        loop.close()
+    assert client.is_success(result)
+    assert set(result["metadata"]["timings_ms"]) >= {"spawn", "first_byte", "read"}
+
+
+def test_timeout_and_cancel_kill_the_process(client, fake_server, monkeypatch):
+    fake_server(errors="hang=1")
+    procs = _spawned(client, monkeypatch)
+    result = asyncio.run(client.aread_internal_website(URLS[0], timeout=0.5))
+    assert result["error_code"] == "TIMEOUT"
+
+    async def cancelled():
+        task = asyncio.ensure_future(client.aread_internal_website(URLS[1], timeout=30))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    asyncio.run(cancelled())
+    assert len(procs) == 2 and all(proc.returncode is not None for proc in procs)
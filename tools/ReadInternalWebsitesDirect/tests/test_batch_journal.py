@@ -0,0 +1,152 @@
+"""Tests for batch_journal.py."""
+
+import json
+
+from batch_journal import BatchJournal
+
+
+def _write(journal_path, records, tail=b""):
+    """Write (status, key, result) records; a result of None leaves its offset pointing at nothing."""
+    with open(journal_path, "wb") as journal, open(journal_path + ".results", "wb") as results:
+        for status, key, result in records:
+            offset = results.tell()
+            if result is not None:
+                results.write(f"{json.dumps(result)}\n".encode() if isinstance(result, dict) else result)
+            journal.write(f"{status}\t{key}\t{offset}\n".encode())
+        journal.write(tail)
+
+
+def test_scan_and_load_latest_result(tmp_path):
+    path = str(tmp_path / "run.journal")
+    with BatchJournal(path) as journal:
+        journal.append("https://a", {"success": False, "error_code": "TIMEOUT"})
+        journal.append("https://b", {"success": True, "content": "b"})
+        journal.append("https://a", {"success": True, "content": "a"})
+
+    journal = BatchJournal(path)
+    assert journal.scan() == {"https://a": True, "https://b": True}
+    assert journal.load_results(["https://a"]) == {"https://a": {"success": True, "content": "a"}}
+
+
+def test_journal_lines_hold_no_result_json(tmp_path):
+    path = str(tmp_path / "run.journal")
+    page = {"success": True, "content": "x" * 10000}
+    with BatchJournal(path) as journal:
+        journal.append("https://a", page)
+        journal.append("https://b", {"success": False, "error": "tab\there"})
+    with open(path, "rb") as f:
+        assert f.read() == f"ok\thttps://a\t0\nerr\thttps://b\t{len(json.dumps(page)) + 1}\n".encode()
+    assert BatchJournal(path).load_results(["https://b"]) == {"https://b": {"success": False, "error": "tab\there"}}
+
+
+def test_torn_tail_is_ignored_and_cut_before_appending(tmp_path):
+    path = str(tmp_path / "run.journal")
+    _write(path, [("ok", "https://b", {"success": True})], tail=b"ok\thttps://a\t1")
+
+    journal = BatchJournal(path)
+    assert journal.scan() == {"https://b": True}
+
+    # A resumed run appends after the last complete record, not after the torn one
+    with journal:
+        journal.append("https://c", {"success": True, "content": "c"})
+    journal = BatchJournal(path)
+    assert journal.scan() == {"https://b": True, "https://c": True}
+    assert journal.load_results(["https://b", "https://c"]) == {
+        "https://b": {"success": True},
+        "https://c": {"success": True, "content": "c"},
+    }
+    with open(path, "rb") as f:
+        assert b"\t1\n" not in f.read()
+
+
+def test_torn_only_record_leaves_empty_journal(tmp_path):
+    path = str(tmp_path / "run.journal")
+    _write(path, [], tail=b"ok\thttps://a")
+    with BatchJournal(path) as journal:
+        journal.append("https://a", {"success": False})
+    assert BatchJournal(path).scan() == {"https://a": False}
+
+
+def test_unreadable_record_falls_back_to_earlier_one(tmp_path):
+    path = str(tmp_path / "run.journal")
+    _write(path, [("err", "https://a", {"success": False}), ("ok", "https://a", b'{"success": tr\n'),
+                  ("ok", "https://b", None)])
+    journal = BatchJournal(path)
+    assert journal.scan() == {"https://a": True, "https://b": True}
+    assert journal.load_results(["https://a", "https://b"]) == {"https://a": {"success": False}}
+
+
+def test_resume_refetches_unreadable_records(client, fake_server, tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "run.journal")
+    batch = tmp_path / "urls.txt"
+    batch.write_text("https://w.amazon.com/bin/view/A\nhttps://w.amazon.com/bin/view/B\n")
+    key = client.normalize_url("https://w.amazon.com/bin/view/A")
+    # Recorded, so scan() counts it as done, but its result does not decode
+    _write(path, [("ok", key, b'{"success": tr\n')])
+
+    monkeypatch.setattr("sys.argv", ["read_internal_website.py", "--batch", str(batch), "--resume", path])
+    client.main()
+    output = json.loads(capsys.readouterr().out)
+    assert [result["success"] for result in output] == [True, True]
+
+
+def _run(client, monkeypatch, *args):
+    monkeypatch.setattr("sys.argv", ["read_internal_website.py", *args])
+    client.main()
+
+
+def _urls(tmp_path, count=3):
+    batch = tmp_path / "urls.txt"
+    batch.write_text("".join(f"https://w.amazon.com/bin/view/P{i}\n" for i in range(count)))
+    return str(batch)
+
+
+def _lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_first_resume_run_overwrites_unrelated_output(client, fake_server, tmp_path, monkeypatch):
+    output = tmp_path / "out.jsonl"
+    output.write_text("not from this run\n")
+    _run(client, monkeypatch, "--batch", _urls(tmp_path), "--format", "jsonl", "--output", str(output),
+         "--resume", str(tmp_path / "run.journal"))
+    assert len(_lines(output)) == 3
+
+
+def test_resumed_output_cuts_a_torn_line_and_appends(client, fake_server, tmp_path, monkeypatch):
+    output, journal = str(tmp_path / "out.jsonl"), str(tmp_path / "run.journal")
+    _run(client, monkeypatch, "--batch", _urls(tmp_path, 2), "--format", "jsonl", "--output", output,
+         "--resume", journal)
+    with open(output, "a") as f:
+        f.write('{"success": true, "url": "https://w.amazon.com/bin/view/P2", "cont')
+    _run(client, monkeypatch, "--batch", _urls(tmp_path, 3), "--format", "jsonl", "--output", output,
+         "--resume", journal)
+    assert [line["url"] for line in _lines(output)] == [f"https://w.amazon.com/bin/view/P{i}" for i in range(3)]
+
+
+def test_retry_failed_replaces_failed_lines(client, fake_server, tmp_path, monkeypatch, capsys):
+    output, journal, batch = str(tmp_path / "out.jsonl"), str(tmp_path / "run.journal"), _urls(tmp_path)
+    args = ["--batch", batch, "--format", "jsonl", "--output", output, "--resume", journal, "--retry-failed"]
+    fake_server(errors="mcp-error=1")
+    _run(client, monkeypatch, *args)
+    # Still failing: one failed line per URL, not one per attempt
+    _run(client, monkeypatch, *args)
+    assert [line["success"] for line in _lines(output)] == [False] * 3
+    assert "Dropped 3 failed results" in capsys.readouterr().err
+
+    fake_server()
+    _run(client, monkeypatch, *args)
+    lines = _lines(output)
+    assert [line["success"] for line in lines] == [True] * 3
+    assert sorted(line["url"] for line in lines) == [f"https://w.amazon.com/bin/view/P{i}" for i in range(3)]
+
+
+def test_replayed_results_get_extracted(client, fake_server, tmp_path, monkeypatch, capsys):
+    journal = str(tmp_path / "run.journal")
+    _run(client, monkeypatch, "--batch", _urls(tmp_path, 2), "--resume", journal)
+    capsys.readouterr()
+    _run(client, monkeypatch, "--batch", _urls(tmp_path, 3), "--resume", journal, "--extract")
+    output = json.loads(capsys.readouterr().out)
+    assert [result["success"] for result in output] == [True] * 3
+    assert all("extracted" in result for result in output)
@@ -0,0 +1,57 @@
+"""Accuracy of detect_content_type() against the implementation it replaced."""
+
+import json
+
+import pytest
+
+from benchmark import _detect_corpus, _legacy_detect_content_type
+
+CORPUS = _detect_corpus()
+
+# Pages where bounded-window detection knowingly differs from the full scan,
+# as (legacy label, current label)
+KNOWN_DIVERGENCES = {
+    # HTML markers only in the middle of a page larger than the windows are not seen
+    "large-markdown-html-in-middle": ("html", "markdown"),
+    # Text larger than the window that is shaped like JSON at both ends is not
+    # decoded by detect_content_type(); the fetch pipeline decodes it and gets "text"
+    "large-json-shaped-text": ("text", "json"),
+}
+
+
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_labels_match_legacy_detection(client, name):
+    page = CORPUS[name]
+    labels = (_legacy_detect_content_type(page), client.detect_content_type(page))
+    if name in KNOWN_DIVERGENCES:
+        assert labels == KNOWN_DIVERGENCES[name]
+    else:
+        assert labels[1] == labels[0]
+
+
+def test_known_divergences_are_in_the_corpus():
+    assert set(KNOWN_DIVERGENCES) <= set(CORPUS)
+
+
+def test_fetch_pipeline_validates_large_json_shaped_text(client):
+    page = CORPUS["large-json-shaped-text"]
+    assert client._decode_content(page) == ("text", page)
+    large_json = CORPUS["large-json"]
+    assert client._decode_content(large_json) == ("json", json.loads(large_json))
+
+
+@pytest.mark.parametrize("page", [
+    "[1] meeting notes\n" + "- item\n" * 20000 + "[end of notes]",
+    "{note: see below}\n" + "text\n" * 20000 + "{ok}",
+    "[" + "x" * 100000 + "]",
+])
+def test_large_bracketed_text_is_not_json(client, page):
+    assert client.detect_content_type(page) != "json"
+
+
+@pytest.mark.parametrize("page", ['[true]', '[false ]', '{"a": null}', '[1.5e3]', '[-2]', '["a"]',
+                                  '[{}]', '[[]]', '{}', '[]', '{"a": {"b": [1]}}\n'])
+def test_every_json_value_ending_passes_the_shape_check(client, page):
+    assert client.detect_content_type(page) == "json"
+    # Larger than the windows, so judged by shape alone
+    assert client.detect_content_type(page[0] + " " * 100000 + page[1:]) == "json"
@@ -0,0 +1,92 @@
+"""Tests for enable_content_limit() and --max-bytes: text is cut, structured pages never are."""
+
+import json
+
+import pytest
+
+URL = "https://w.amazon.com/bin/view/Huge"
+
+
+@pytest.fixture(params=["one-shot", "pool"])
+def limited(request, client, fake_server):
+    if request.param == "pool":
+        client.enable_session_pool(size=1)
+    client.enable_content_limit(1000)
+    yield client
+    client.disable_content_limit()
+    client.disable_session_pool()
+
+
+@pytest.mark.parametrize("kind", ["text", "markdown"])
+def test_text_page_is_truncated(limited, fake_server, kind):
+    fake_server(page_kb=256, content_mix=kind)
+    result = limited.read_internal_website(URL)
+    assert limited.is_success(result) and result["content_type"] == kind
+    assert len(result["content"].encode("utf-8")) <= 1000 and result["content_length"] <= 1000
+    assert result["metadata"]["truncated"] is True
+    assert any("truncated" in warning for warning in result["warnings"])
+
+
+@pytest.mark.parametrize("kind", ["builderhub", "json"])
+def test_structured_page_cut_off_while_reading_fails(limited, fake_server, kind):
+    fake_server(page_kb=256, content_mix=kind)
+    result = limited.read_internal_website(URL)
+    assert not limited.is_success(result)
+    assert result["error_code"] == "CONTENT_TOO_LARGE"
+    assert result["content_type"] == "json" and result["content"] is None
+    assert result["metadata"]["truncated"] is True
+
+
+@pytest.mark.parametrize("kind, content_type", [("builderhub", dict), ("json", list)])
+def test_structured_page_read_whole_is_kept_whole(limited, fake_server, kind, content_type):
+    # Over the limit, but inside the envelope allowance, so it is read whole
+    fake_server(page_kb=16, content_mix=kind)
+    result = limited.read_internal_website(URL)
+    assert limited.is_success(result) and result["content_type"] == "json"
+    assert isinstance(result["content"], content_type) and result["content_length"] > 16000
+    assert "truncated" not in result["metadata"]
+
+
+@pytest.mark.parametrize("kind, page_kb", [("text", 16), ("json", 16)])
+def test_lazy_result_matches_eager(limited, fake_server, kind, page_kb):
+    fake_server(page_kb=page_kb, content_mix=kind)
+    eager = limited.read_internal_website(URL)
+    lazy = limited.read_internal_website(URL, lazy=True)
+    assert lazy["content_type"] == eager["content_type"] and lazy["content"] == eager["content"]
+    assert lazy["metadata"].get("truncated") == eager["metadata"].get("truncated")
+    assert eager["metadata"].get("truncated") is (True if kind == "text" else None)
+
+
+def test_opens_like_json(client):
+    assert client._opens_like_json('[{"id": 1, "title": "cut here')
+    assert client._opens_like_json('  {"url": "https://x", "rows": [1, 2')
+    assert client._opens_like_json('["a very long string that was cut')
+    assert client._opens_like_json('[1, 2, 3')
+    assert client._opens_like_json('[]')
+    assert not client._opens_like_json('[1] meeting notes\n- item')
+    assert not client._opens_like_json('{{template}} text')
+    assert not client._opens_like_json('[link text](https://x) and more')
+    assert not client._opens_like_json('# Heading [1, 2')
+
+
+def test_max_bytes_cli(client, fake_server, monkeypatch, capsys):
+    fake_server(page_kb=256, content_mix="text")
+    monkeypatch.setattr("sys.argv", ["read_internal_website.py", URL, "--max-bytes", "1000", "--format", "json"])
+    try:
+        client.main()
+    except SystemExit as e:
+        assert not e.code
+    finally:
+        client.disable_content_limit()
+    output = json.loads(capsys.readouterr().out)
+    assert output["success"] and output["metadata"]["truncated"] is True
+    assert len(output["content"].encode("utf-8")) <= 1000
+
+    fake_server(page_kb=256, content_mix="builderhub")
+    try:
+        with pytest.raises(SystemExit):
+            client.main()
+    finally:
+        client.disable_content_limit()
+    output = json.loads(capsys.readouterr().out)
+    assert output["error_code"] == "CONTENT_TOO_LARGE" and output["content_type"] == "json"
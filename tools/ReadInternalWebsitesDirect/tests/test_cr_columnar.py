@@ -0,0 +1,102 @@
+"""Tests for cr_columnar.py."""
+
+import csv
+import json
+
+import pytest
+
+import cr_columnar
+from cr_columnar import CRColumns
+from cr_parser import parse_cr_table
+
+PAGE = """| ID | Author | Summary | Status | Approved by |
+|---|---|---|---|---|
+| CR-1 | alice | fix, "quoted" | Open | __ bob |
+| CR-2 | bob | x \\| y | Merged | ✓ alice |
+"""
+LATER = """| ID | Author | Status | Extra |
+|---|---|---|---|
+| CR-1 | alice | Merged | e |
+"""
+
+
+@pytest.fixture
+def columns():
+    columns = CRColumns()
+    columns.extend_table(PAGE, snapshot="s1")
+    columns.extend_table(LATER.splitlines(True), snapshot="s2")
+    return columns
+
+
+def test_columns_and_missing_values(columns):
+    assert len(columns) == 3
+    assert columns.names == ["snapshot", "ID", "Author", "Summary", "Status", "Approved by", "Extra"]
+    assert columns.column("Extra") == [None, None, "e"]
+    assert columns.column("URL") == ["https://code.amazon.com/reviews/CR-1", "https://code.amazon.com/reviews/CR-2",
+                                     "https://code.amazon.com/reviews/CR-1"]
+    assert columns.value_counts("Author") == {"alice": 2, "bob": 1}
+    with pytest.raises(KeyError):
+        columns.column("Nope")
+
+
+def test_compact_rows_dicts_and_append_agree():
+    fast, slow, dicts = CRColumns(), CRColumns(), CRColumns()
+    fast.extend(parse_cr_table(PAGE, compact=True), "s")
+    dicts.extend(parse_cr_table(PAGE), "s")
+    for row in parse_cr_table(PAGE):
+        slow.append(row, "s")
+    assert list(fast.rows()) == list(slow.rows()) == list(dicts.rows())
+    assert list(fast.rows(url=False))[0] == {"snapshot": "s", **{k: v for k, v in parse_cr_table(PAGE)[0].items()
+                                                                  if k != "URL"}}
+
+
+def test_ndjson_is_one_object_per_row(columns, tmp_path):
+    path = tmp_path / "out.ndjson"
+    assert columns.write(str(path)) == "ndjson"
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == list(columns.rows())
+    assert lines == [json.dumps(row) for row in columns.rows()]
+
+
+def test_csv_round_trips(columns, tmp_path):
+    path = tmp_path / "out.csv"
+    columns.write(str(path))
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    expected = [{name: row.get(name, "") for name in columns.names + ["URL"]} for row in columns.rows()]
+    assert rows == expected
+
+
+def test_unknown_extension_uses_default_format(columns, tmp_path):
+    assert columns.write(str(tmp_path / "out.bin")) == cr_columnar.default_format()
+    with pytest.raises(ValueError):
+        columns.write(str(tmp_path / "out.x"), fmt="xml")
+
+
+@pytest.mark.skipif(cr_columnar.arrow_available(), reason="pyarrow is installed")
+def test_arrow_formats_need_pyarrow(columns, tmp_path):
+    with pytest.raises(ImportError):
+        columns.write(str(tmp_path / "out.parquet"))
+
+
+@pytest.mark.skipif(not cr_columnar.arrow_available(), reason="pyarrow is not installed")
+def test_arrow_table_round_trips_and_leaves_columns_appendable(columns, tmp_path):
+    import pyarrow.parquet
+
+    table = columns.to_arrow()
+    assert table.to_pylist() == [{name: row.get(name) for name in table.column_names} for row in columns.rows()]
+    extra = table.column("Extra").chunk(0)
+    assert extra.null_count == 2
+    assert extra.dictionary.to_pylist() == ["e"]
+
+    # The table holds a copy of the codes, so the columns still grow
+    columns.append({"ID": "CR-3", "Extra": ""}, snapshot="s3")
+    columns.extend_table(LATER, snapshot="s4")
+    assert len(columns) == 5 and table.num_rows == 3
+
+    path = tmp_path / "out.parquet"
+    columns.write(str(path))
+    extra = pyarrow.parquet.read_table(str(path)).column("Extra")
+    # A real empty value is not the same as a missing one
+    assert extra.to_pylist() == [None, None, "e", "", "e"]
+    assert extra.null_count == 2
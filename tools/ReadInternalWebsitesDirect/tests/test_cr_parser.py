@@ -0,0 +1,130 @@
+"""Tests for cr_parser.py."""
+
+import io
+
+import pytest
+
+from cr_parser import (CRIndex, CRMerger, CRTracker, count_pending_approvals, iter_cr_rows, parse_approvals,
+                       parse_cr_table, review_list_url)
+
+TABLE = """# Reviews
+
+Some text | with a pipe that is not a table.
+
+| ID | Author | Summary | Status | Approved by |
+|----|:------:|---------|--------|-------------|
+| CR-1 | jdoe | Fix the build | Open | __ alice, bob |
+| CR-2 | alice | Pipe \\| in summary | Merged | ✓ carol<br>✗ dave |
+|  |  |  |  |  |
+| CR-3 | jdoe | Short row |
+| CR-4 | bob | Extra cells | Open | __ alice | overflow |
+"""
+
+
+def _table(*rows):
+    header = "| ID | Author | Status | Approved by |\n|---|---|---|---|\n"
+    return header + "".join(f"| {' | '.join(row)} |\n" for row in rows)
+
+
+def test_parse_cr_table():
+    rows = parse_cr_table(TABLE)
+    assert [row["ID"] for row in rows] == ["CR-1", "CR-2", "CR-3", "CR-4"]
+    assert rows[0] == {"ID": "CR-1", "Author": "jdoe", "Summary": "Fix the build", "Status": "Open",
+                       "Approved by": "__ alice, bob", "URL": "https://code.amazon.com/reviews/CR-1"}
+    assert rows[1]["Summary"] == "Pipe | in summary"
+    assert rows[2] == {"ID": "CR-3", "Author": "jdoe", "Summary": "Short row",
+                       "URL": "https://code.amazon.com/reviews/CR-3"}
+    assert rows[3]["Approved by"] == "__ alice" and len(rows[3]) == 6
+    assert parse_cr_table("") == [] and parse_cr_table("no table here") == []
+
+
+def test_compact_rows_equal_dicts_and_lines_input():
+    rows = parse_cr_table(TABLE)
+    assert parse_cr_table(TABLE, compact=True) == rows
+    assert list(iter_cr_rows(io.StringIO(TABLE), compact=True)) == rows
+    assert list(iter_cr_rows(TABLE.replace("\n", "\r\n").splitlines(keepends=True))) == rows
+    compact = next(iter_cr_rows(TABLE, compact=True))
+    assert compact.cells == ("CR-1", "jdoe", "Fix the build", "Open", "__ alice, bob")
+    assert compact.get("Missing") is None
+    with pytest.raises(KeyError):
+        compact["Missing"]
+
+
+def test_large_page_is_scanned_in_blocks(monkeypatch):
+    monkeypatch.setattr("cr_parser._BLOCK_CHARS", 64)
+    page = "intro\n" * 50 + _table(*[(f"CR-{i}", "jdoe", "Open", "__ alice") for i in range(200)])
+    assert [row["ID"] for row in parse_cr_table(page)] == [f"CR-{i}" for i in range(200)]
+
+
+def test_approvals():
+    assert parse_approvals("__ alice, bob") == [("alice", "pending"), ("bob", "approved")]
+    assert parse_approvals("✓ carol<br>✗ dave<br/>? erin") == [
+        ("carol", "approved"), ("dave", "rejected"), ("erin", "unknown")]
+    assert parse_approvals("") == []
+    for placeholder in ("N/A", " n/a ", "-", "\u2014"):
+        assert parse_approvals(placeholder) == []
+    rows = parse_cr_table(TABLE)
+    assert count_pending_approvals(rows, "alice") == 2
+
+
+def test_index_queries_and_replacement():
+    index = CRIndex(parse_cr_table(TABLE, compact=True))
+    assert len(index) == 4 and "CR-2" in index and index.get("CR-9") is None
+    assert index.pending_counts(["alice", "bob", "zed"]) == {"alice": 2, "bob": 0, "zed": 0}
+    assert index.pending_counts() == {"alice": 2}
+    assert index.blocking("CR-1") == ["alice"]
+    assert [cr["ID"] for cr in index.queue("alice")] == ["CR-1", "CR-4"]
+    assert [cr["ID"] for cr in index.queue("carol", "approved")] == ["CR-2"]
+    assert [cr["ID"] for cr in index.authored_by("jdoe")] == ["CR-1", "CR-3"]
+    assert [cr["ID"] for cr in index.with_status("Open")] == ["CR-1", "CR-4"]
+
+    # Whole usernames only, unlike count_pending_approvals()
+    assert index.pending_count("ali") == 0
+    index.add({"ID": "CR-1", "Author": "jdoe", "Status": "Merged", "Approved by": "alice"})
+    assert index.pending_counts() == {"alice": 1}
+    assert [cr["ID"] for cr in index.with_status("Merged")] == ["CR-2", "CR-1"]
+    index.remove("CR-4")
+    index.remove("CR-404")
+    assert index.pending_counts() == {} and len(index) == 3
+    index.add({"Author": "nobody"})
+    assert len(index) == 3
+
+
+def test_tracker_diffs_polls_and_keeps_index_in_sync():
+    tracker = CRTracker(index=CRIndex())
+    first = _table(("CR-1", "jdoe", "Open", "__ alice"), ("CR-2", "bob", "Open", "__ alice"))
+    assert tracker.update(first) == {"added": ["CR-1", "CR-2"], "removed": [], "changed": {}, "unchanged": 0}
+    assert tracker.index.pending_count("alice") == 2
+    assert tracker.update(first) == {"added": [], "removed": [], "changed": {}, "unchanged": 2}
+
+    second = _table(("CR-1", "jdoe", "Merged", "alice"), ("CR-3", "carol", "Open", "__ bob"))
+    assert tracker.update(second) == {
+        "added": ["CR-3"], "removed": ["CR-2"], "unchanged": 0,
+        "changed": {"CR-1": {"Status": ("Open", "Merged"), "Approved by": ("__ alice", "alice")}}}
+    assert list(tracker.rows) == ["CR-1", "CR-3"] and len(tracker) == 2
+    assert tracker.get("CR-1")["Status"] == "Merged"
+    assert tracker.index.pending_counts() == {"bob": 1}
+
+    # The same lines under different columns are reparsed
+    swapped = second.replace("| ID | Author | Status |", "| ID | Status | Author |")
+    diff = tracker.update(swapped)
+    assert diff["changed"]["CR-1"] == {"Author": ("jdoe", "Merged"), "Status": ("Merged", "jdoe")}
+    assert tracker.update("") == {"added": [], "removed": ["CR-1", "CR-3"], "changed": {}, "unchanged": 0}
+    assert len(tracker.index) == 0
+
+
+def test_merger_and_review_list_urls():
+    merger = CRMerger()
+    alice = parse_cr_table(_table(("CR-1", "jdoe", "Open", "__ alice"), ("CR-2", "bob", "Open", "__ alice")))
+    bob = parse_cr_table(_table(("CR-2", "bob", "Open", "__ alice")))
+    assert [r["ID"] for r in merger.add("alice", alice)] == ["CR-1", "CR-2"]
+    assert [r["ID"] for r in merger.add("bob", bob, role="author")] == ["CR-2"]
+    assert merger.add("bob", bob, role="author") == []
+    assert len(merger) == 2
+    assert merger.get("CR-2")["roles"] == {"alice": ["reviewer"], "bob": ["author"]}
+    assert [r["ID"] for r in merger.records] == ["CR-1", "CR-2"]
+
+    assert review_list_url("alice") == "https://code.amazon.com/reviews/to-user/alice"
+    assert review_list_url("alice", "from-user") == "https://code.amazon.com/reviews/from-user/alice"
+    with pytest.raises(ValueError):
+        review_list_url("alice", "cc-user")
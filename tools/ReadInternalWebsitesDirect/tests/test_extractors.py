@@ -0,0 +1,84 @@
+"""Tests for extractors.py's registry dispatch and built-in extractors."""
+
+import pytest
+
+from extractors import ExtractorRegistry, apply_extractor, default_registry, find_extractor
+
+
+def _named(name):
+    return lambda content, url: name
+
+
+def _result(url, content, success=True):
+    return {"success": success, "url": url, "content": content, "metadata": {}, "warnings": []}
+
+
+@pytest.mark.parametrize("url, name", [
+    ("https://code.amazon.com/reviews/to-user/jdoe", "code-reviews"),
+    ("https://code.amazon.com/packages/Foo", "code"),
+    ("https://phonetool.amazon.com/users/jdoe", "phonetool"),
+    ("https://phonetool.amazon.com/teams/x", None),
+    ("https://W.Amazon.com/bin/view/Main", "wiki"),
+    ("https://sim.amazon.com/issues/P1", "issues"),
+    ("https://example.org/", None),
+])
+def test_builtin_dispatch(url, name):
+    found = find_extractor(url)
+    assert (found[0] if found else None) == name
+
+
+def test_later_registrations_take_precedence():
+    registry = ExtractorRegistry()
+    registry.register("any", r"[^/]+/", _named("any"))
+    registry.register("site", r"a\.example\.com/", _named("site"))
+    registry.register("page", r"a\.example\.com/page", _named("page"))
+    assert registry.names() == ["page", "site", "any"]
+    assert registry.find("https://a.example.com/page/1")[0] == "page"
+    assert registry.find("https://a.example.com/other")[0] == "site"
+    assert registry.find("https://b.example.com/other")[0] == "any"
+
+    # Registering a name again moves it to the front; hostless patterns are tried on every host
+    registry.register("any", r"[^/]+/", _named("any"))
+    assert registry.find("https://a.example.com/page/1")[0] == "any"
+    registry.unregister("any")
+    registry.unregister("unknown")
+    assert registry.find("https://a.example.com/page/1")[0] == "page"
+    assert registry.find("https://b.example.com/other") is None
+
+
+def test_invalid_patterns_are_rejected():
+    registry = ExtractorRegistry()
+    with pytest.raises(ValueError):
+        registry.register("bad", r"(", _named("bad"))
+    with pytest.raises(ValueError):
+        registry.register("named", r"(?P<host>x)/", _named("named"))
+
+
+def test_apply_stores_data_and_reports_failures():
+    registry = ExtractorRegistry()
+    registry.register("ok", r"ok\.com/", lambda content, url: {"length": len(content)})
+    registry.register("broken", r"broken\.com/", lambda content, url: 1 / 0)
+
+    result = _result("https://ok.com/x", "abc")
+    assert apply_extractor(result, registry) == {"length": 3}
+    assert result["extracted"] == {"length": 3} and result["metadata"]["extractor"] == "ok"
+
+    result = _result("https://broken.com/x", "abc")
+    assert apply_extractor(result, registry) is None
+    assert "extracted" not in result and "Extractor broken failed" in result["warnings"][0]
+
+    assert apply_extractor(_result("https://ok.com/x", "abc", success=False), registry) is None
+
+
+def test_builtin_extractors():
+    table = "| ID | Author |\n|---|---|\n| CR-1 | jdoe |\n"
+    rows = apply_extractor(_result("https://code.amazon.com/reviews/to-user/jdoe", table))
+    assert rows == [{"ID": "CR-1", "Author": "jdoe", "URL": "https://code.amazon.com/reviews/CR-1"}]
+
+    page = "# Main\n\nIntro\n\n## Setup\n\nSteps\n"
+    wiki = apply_extractor(_result("https://w.amazon.com/bin/view/Main", page))
+    assert wiki["title"] == "Main"
+    assert [section["heading"] for section in wiki["sections"]] == ["Main", "Setup"]
+
+    assert apply_extractor(_result("https://issues.amazon.com/P1", '{"id": "P1"}')) == {"id": "P1"}
+    assert "code" in default_registry.names()
@@ -0,0 +1,93 @@
+"""End-to-end fetch paths against fake_builder_mcp.py, one-shot and pooled."""
+
+import asyncio
+
+import pytest
+
+URL = "https://w.amazon.com/bin/view/Main"
+
+
+@pytest.fixture(params=["one-shot", "pool"])
+def mode(request, client, fake_server):
+    if request.param == "pool":
+        client.enable_session_pool(size=1)
+    yield request.param
+    client.disable_session_pool()
+
+
+def test_success(client, mode):
+    result = client.read_internal_website(URL)
+    assert client.is_success(result) and result["content_type"] == "markdown"
+    assert URL in client.get_content(result)
+    assert result["metadata"]["fetch_duration_ms"] >= 0
+
+
+@pytest.mark.parametrize("error, one_shot, pooled", [
+    ("mcp-error=1", "MCP_ERROR", "MCP_ERROR"),
+    # A pool worker skips a non-JSON line and waits for the answer that never comes
+    ("garbage=1", "PARSE_ERROR", "TIMEOUT"),
+    ("hang=1", "TIMEOUT", "TIMEOUT"),
+    # A one-shot process that exits silently is "No response" without a code
+    ("crash=1", None, "SUBPROCESS_ERROR"),
+])
+def test_injected_failures(client, fake_server, mode, error, one_shot, pooled):
+    fake_server(errors=error)
+    result = client.read_internal_website(URL, timeout=1)
+    assert not client.is_success(result)
+    assert result.get("error_code") == (one_shot if mode == "one-shot" else pooled)
+    assert result["error"]
+
+
+def test_pool_recovers_from_a_crashed_worker(client, fake_server):
+    pool = client.enable_session_pool(size=1)
+    try:
+        fake_server(errors="crash=1")
+        assert not client.is_success(client.read_internal_website(URL, timeout=1))
+        fake_server()
+        assert client.is_success(client.read_internal_website(URL, timeout=5))
+        assert pool.restarts == 1
+    finally:
+        client.disable_session_pool()
+
+
+def test_batch_keeps_input_order_under_per_host_limit(client, mode):
+    urls = [f"https://w.amazon.com/bin/view/Page{i}" for i in range(5)] + ["https://phonetool.amazon.com/users/jdoe"]
+    results = client.read_internal_websites(urls, max_workers=3, per_host_limit=1)
+    assert [result["url"] for result in results] == urls
+    assert all(client.is_success(result) for result in results)
+
+
+def test_iter_yields_every_index_once(client, mode):
+    urls = [f"https://w.amazon.com/bin/view/Page{i}" for i in range(6)]
+    indices = [index for index, _ in client.iter_internal_websites(urls, max_workers=4)]
+    assert sorted(indices) == list(range(len(urls)))
+
+
+def test_chunks_share_one_request(client, mode):
+    urls = [f"https://w.amazon.com/bin/view/Page{i}" for i in range(5)] + ["https://phonetool.amazon.com/users/jdoe"]
+    results = client.read_internal_websites(urls, max_workers=3, chunk_size=2)
+    assert [result["url"] for result in results] == urls
+    assert all(client.is_success(result) for result in results)
+    assert [result["metadata"].get("batch_size") for result in results] == [2, 2, 2, 2, None, None]
+
+
+def test_duplicates_are_fetched_once(client, mode):
+    urls = ["https://w.amazon.com/bin/view/Page0", "https://w.amazon.com/bin/view/Page1",
+            "https://w.amazon.com/bin/view/Page0#top"]
+    results = client.read_internal_websites(urls, max_workers=2)
+    assert [result["url"] for result in results] == urls
+    assert all(client.is_success(result) for result in results)
+    assert results[2]["metadata"].get("coalesced") is True
+    assert "coalesced" not in results[0]["metadata"]
+    assert results[2]["content"] == results[0]["content"] and results[2] is not results[0]
+
+
+@pytest.mark.parametrize("suffix", ["it's", 'say "hi"', "$(touch {marker})", "`touch {marker}`", "a b; touch {marker}"])
+def test_urls_reach_builder_mcp_unchanged(client, fake_server, tmp_path, monkeypatch, suffix):
+    # builder-mcp gets the URL inside the JSON request, never through a shell
+    marker = tmp_path / "marker"
+    url = URL + "?q=" + suffix.format(marker=marker)
+    assert client.read_internal_website(url)["content"].startswith(f"# {url}\n")
+    assert client._run_builder_mcp(client._build_request([url]), 10).returncode == 0
+    assert asyncio.run(client.aread_internal_website(url))["content"].startswith(f"# {url}\n")
+    assert not marker.exists()
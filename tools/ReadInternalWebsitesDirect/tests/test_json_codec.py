@@ -0,0 +1,73 @@
+"""Tests for json_codec.py's backend selection, fallback and string_prefix()."""
+
+import json
+
+import pytest
+
+import json_codec
+
+
+@pytest.fixture
+def strict_backend(monkeypatch):
+    """A fast backend that, like orjson, rejects NaN and integers wider than 64 bits."""
+    def strict_loads(text):
+        return json.loads(text, parse_constant=_reject, parse_int=_int64)
+    monkeypatch.setitem(json_codec._BACKENDS, "strict", strict_loads)
+    previous = json_codec.backend()
+    json_codec.use_backend("strict")
+    yield strict_loads
+    json_codec.use_backend(previous)
+
+
+def _reject(name):
+    raise ValueError(f"unsupported constant {name}")
+
+
+def _int64(text):
+    value = int(text)
+    if not -2 ** 63 <= value < 2 ** 64:
+        raise ValueError("integer out of range")
+    return value
+
+
+def test_backends():
+    assert "json" in json_codec.available_backends()
+    assert json_codec.backend() in json_codec.available_backends()
+    with pytest.raises(ValueError):
+        json_codec.use_backend("no-such-backend")
+
+
+@pytest.mark.parametrize("name", json_codec.available_backends())
+def test_every_backend_decodes_the_same(name):
+    previous = json_codec.backend()
+    json_codec.use_backend(name)
+    try:
+        text = '{"a": [1, 2.5, "é\\u00e9", null, true], "b": {"c": "line\\nbreak"}}'
+        assert json_codec.loads(text) == json.loads(text)
+        assert json_codec.loads(text.encode("utf-8")) == json.loads(text)
+        with pytest.raises(json.JSONDecodeError):
+            json_codec.loads('{"a": ')
+    finally:
+        json_codec.use_backend(previous)
+
+
+def test_stdlib_only_syntax_falls_back(strict_backend):
+    assert json_codec.backend() == "strict"
+    assert json_codec.loads('{"n": 1}') == {"n": 1}
+    assert json_codec.loads(str(2 ** 70)) == 2 ** 70
+    assert json_codec.loads('[NaN]')[0] != json_codec.loads('[NaN]')[0]
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.loads("not json")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"content": "Line 1\\nLine 2"}', ("Line 1\nLine 2", True)),
+    ('{"content": "Line 1\\nLine', ("Line 1\nLine", False)),
+    ('{"content": "cut \\', ("cut ", False)),
+    ('{"content": "cut \\u00', ("cut ", False)),
+    ('{"content": "escaped \\\\', ("escaped \\", False)),
+    ('{"content": "pair \\ud83d', ("pair ", False)),
+    ('{"content": "pair \\ud83d\\ude00 done', ("pair \U0001f600 done", False)),
+])
+def test_string_prefix(text, expected):
+    assert json_codec.string_prefix(text, text.index('"', 11)) == expected
@@ -0,0 +1,82 @@
+"""Tests for --format jsonl streaming and its --fsync-interval cadence."""
+
+import json
+
+import pytest
+
+URLS = [f"https://w.amazon.com/bin/view/Page{i}" for i in range(4)]
+
+
+@pytest.fixture
+def batch(tmp_path):
+    path = tmp_path / "urls.txt"
+    path.write_text("\n".join(URLS) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def fsyncs(client, monkeypatch):
+    """Count fsync calls made by the client."""
+    calls = []
+    monkeypatch.setattr(client.os, "fsync", lambda fd: calls.append(fd))
+    return calls
+
+
+def _run(client, monkeypatch, *args):
+    monkeypatch.setattr("sys.argv", ["read_internal_website.py", *args])
+    client.main()
+
+
+def test_stdout_gets_one_record_per_url(client, fake_server, batch, monkeypatch, capsys, fsyncs):
+    _run(client, monkeypatch, "--batch", batch, "--format", "jsonl")
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(json.loads(line)["url"] for line in lines) == URLS
+    assert all(json.loads(line)["success"] for line in lines)
+    # stdout is flushed, never fsync'ed
+    assert fsyncs == []
+
+
+def test_each_record_is_on_disk_before_the_next_fetch(client, fake_server, batch, tmp_path, monkeypatch):
+    output = tmp_path / "out.jsonl"
+    seen = []
+    fetch = client.iter_internal_websites
+
+    def watching(*args, **kwargs):
+        for item in fetch(*args, **kwargs):
+            seen.append(len(output.read_text().splitlines()) if output.exists() else 0)
+            yield item
+    monkeypatch.setattr(client, "iter_internal_websites", watching)
+
+    _run(client, monkeypatch, "--batch", batch, "--format", "jsonl", "--output", str(output))
+    # Every earlier record was flushed by the time the next one arrived
+    assert seen == [0, 1, 2, 3]
+    assert len(output.read_text().splitlines()) == len(URLS)
+
+
+@pytest.mark.parametrize("interval, expected", [(0, len(URLS) + 1), (3600, 1)])
+def test_fsync_interval(client, fake_server, batch, tmp_path, monkeypatch, fsyncs, interval, expected):
+    output = str(tmp_path / "out.jsonl")
+    _run(client, monkeypatch, "--batch", batch, "--format", "jsonl", "--output", output,
+         "--fsync-interval", str(interval))
+    # Once per record when due, and once more on close
+    assert len(fsyncs) == expected
+
+
+def test_interrupted_run_leaves_complete_records(client, fake_server, batch, tmp_path, monkeypatch, fsyncs):
+    output = tmp_path / "out.jsonl"
+    fetch = client.iter_internal_websites
+
+    def interrupted(*args, **kwargs):
+        for count, item in enumerate(fetch(*args, **kwargs)):
+            if count == 2:
+                raise KeyboardInterrupt
+            yield item
+    monkeypatch.setattr(client, "iter_internal_websites", interrupted)
+
+    with pytest.raises(KeyboardInterrupt):
+        _run(client, monkeypatch, "--batch", batch, "--format", "jsonl", "--output", str(output),
+             "--fsync-interval", "3600")
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(records) == 2 and all(record["success"] for record in records)
+    # The file is still synced on the way out
+    assert len(fsyncs) == 1
@@ -0,0 +1,86 @@
+"""Tests for LazyResult, the lazy=True fetch result."""
+
+import copy
+import json
+import pickle
+
+import pytest
+
+URL = "https://w.amazon.com/bin/view/Lazy"
+KINDS = ["markdown", "json", "html", "builderhub"]
+
+
+def _stable(result):
+    """json.dumps() of a result with the fields that differ between two fetches blanked, order kept."""
+    data = json.loads(json.dumps(result))
+    data["timestamp"] = None
+    for key in ("fetch_duration_ms", "timings_ms"):
+        data["metadata"].pop(key, None)
+    return json.dumps(data)
+
+
+@pytest.fixture
+def decodes(client, monkeypatch):
+    """Count calls of the content decoding stage."""
+    calls = []
+    set_content = client._set_content
+
+    def counting(*args, **kwargs):
+        calls.append(args[1])
+        return set_content(*args, **kwargs)
+    monkeypatch.setattr(client, "_set_content", counting)
+    return calls
+
+
+def test_content_is_decoded_on_first_access_only(client, fake_server, decodes):
+    lazy = client.read_internal_website(URL, lazy=True)
+    assert isinstance(lazy, client.LazyResult)
+    assert client.is_success(lazy) and "content" in lazy and lazy.raw
+    assert decodes == []
+
+    assert lazy["content"].startswith("# " + URL)
+    assert lazy["content_type"] == "markdown" and lazy["content_length"] > 0
+    assert len(decodes) == 1
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_serializes_like_the_eager_result(client, fake_server, kind):
+    fake_server(content_mix=kind)
+    eager = client.read_internal_website(URL)
+    lazy = client.read_internal_website(URL, lazy=True)
+    assert _stable(lazy) == _stable(eager)
+
+
+def test_failed_result_serializes_like_the_eager_result(client, fake_server):
+    fake_server(errors="mcp-error=1")
+    eager = client.read_internal_website(URL)
+    lazy = client.read_internal_website(URL, lazy=True)
+    assert not client.is_success(lazy)
+    assert _stable(lazy) == _stable(eager)
+
+
+def test_dict_views_copies_and_equality_decode(client, fake_server):
+    lazy = client.read_internal_website(URL, lazy=True)
+    plain = dict(lazy)
+    assert plain["content"] == lazy["content"] and set(plain) == set(lazy.keys())
+    assert dict(lazy.items()) == plain and list(lazy.values()) == list(plain.values())
+
+    duplicate = lazy.copy()
+    assert type(duplicate) is dict and duplicate == plain
+    assert lazy == plain and plain == lazy
+    other = client.read_internal_website(URL, lazy=True)
+    assert other != lazy  # timestamps differ
+    assert other == dict(other, timestamp=other["timestamp"])
+
+
+@pytest.mark.parametrize("clone", [pickle.loads, copy.deepcopy], ids=["pickle", "deepcopy"])
+def test_copies_stay_lazy(client, fake_server, decodes, clone):
+    lazy = client.read_internal_website(URL, lazy=True)
+    copied = clone(pickle.dumps(lazy)) if clone is pickle.loads else clone(lazy)
+    assert isinstance(copied, client.LazyResult) and copied.raw == lazy.raw
+    assert decodes == []
+
+    assert copied == lazy
+    assert len(decodes) == 2
+    decoded = pickle.loads(pickle.dumps(lazy))
+    assert decoded == lazy and len(decodes) == 2
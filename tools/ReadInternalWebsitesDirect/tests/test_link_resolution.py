@@ -0,0 +1,60 @@
+"""Tests for reference link stripping and --resolve-links."""
+
+import json
+
+import pytest
+
+PAGE = "See [docs][1] and [the wiki][2].\n\n[1]: https://w.amazon.com/docs\n[2]: <https://w.amazon.com/wiki>\n"
+
+
+@pytest.fixture
+def clean(client):
+    return client.clean_markdown_links
+
+
+def test_references_are_stripped_by_default(clean):
+    assert clean(PAGE).startswith("See docs and the wiki.\n")
+    assert clean("no links [here] (at all)") == "no links [here] (at all)"
+
+
+def test_resolved_to_inline_links(clean):
+    assert clean(PAGE, resolve=True).startswith(
+        "See [docs](https://w.amazon.com/docs) and [the wiki](https://w.amazon.com/wiki).\n")
+
+
+def test_undefined_reference_is_stripped(clean):
+    assert clean("See [docs][1] and [gone][7].\n\n[1]: https://a\n", resolve=True) == \
+        "See [docs](https://a) and gone.\n\n[1]: https://a\n"
+
+
+def test_first_duplicate_definition_wins(clean):
+    page = "[a][1]\n\n[1]: https://first\n[1]: https://second\n"
+    assert clean(page, resolve=True).startswith("[a](https://first)\n")
+
+
+@pytest.mark.parametrize("fence", ["```", "~~~~"])
+def test_definitions_inside_code_blocks_are_ignored(clean, fence):
+    page = f"[a][1] [b][2]\n\n{fence}\n[1]: https://in-code\n{fence}\n\n[2]: https://b\n"
+    assert clean(page, resolve=True).startswith("a [b](https://b)\n")
+    # After the block closes, definitions count again
+    page = f"[a][1]\n\n{fence}text\n[1]: https://in-code\n{fence}\n[1]: https://after\n"
+    assert clean(page, resolve=True).startswith("[a](https://after)\n")
+
+
+def test_unclosed_code_block_runs_to_the_end(clean):
+    page = "[a][1]\n\n```\n[1]: https://in-code\n"
+    assert clean(page, resolve=True).startswith("a\n")
+
+
+def test_resolve_links_cli(client, fake_server, monkeypatch, capsys):
+    url = "https://w.amazon.com/bin/view/Linked"
+    monkeypatch.setattr("sys.argv", ["read_internal_website.py", url, "--resolve-links"])
+    try:
+        client.main()
+    finally:
+        client.disable_link_resolution()
+    result = json.loads(capsys.readouterr().out)
+    # fake_builder_mcp links the page to itself as "[url][1]"
+    assert f"[{url}]({url})" in result["content"]
+
+    assert f"[{url}]({url})" not in client.read_internal_website(url)["content"]
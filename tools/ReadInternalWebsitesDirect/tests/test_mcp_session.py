@@ -0,0 +1,59 @@
+"""Tests for mcp_session.py against fake_builder_mcp.py."""
+
+import threading
+import time
+
+import pytest
+
+from mcp_session import MCPSessionPool, MCPTimeoutError
+
+
+def _params(url="https://w.amazon.com/bin/view/Page"):
+    return {"name": "ReadInternalWebsites", "arguments": {"inputs": [url]}}
+
+
+def test_call_returns_response(fake_server):
+    with MCPSessionPool(size=1) as pool:
+        response = pool.call("tools/call", _params(), timeout=10)
+    assert response["result"]["content"]
+
+
+def test_hung_worker_is_killed_without_graceful_wait(fake_server):
+    fake_server(errors="hang=1")
+    with MCPSessionPool(size=1) as pool:
+        pool.call("initialize", {}, timeout=10)  # start the worker outside the timed part
+        start = time.monotonic()
+        with pytest.raises(MCPTimeoutError):
+            pool.call("tools/call", _params(), timeout=0.5)
+        # 0.5 s for the call; closing the hung worker used to add a 5 s graceful wait
+        assert time.monotonic() - start < 2
+        assert not pool._sessions[0].alive
+
+
+def test_wait_for_a_free_worker_counts_against_timeout(fake_server):
+    fake_server(latency_ms=2000)
+    with MCPSessionPool(size=1) as pool:
+        pool.call("initialize", {}, timeout=10)
+        busy = threading.Thread(target=lambda: pool.call("tools/call", _params(), timeout=10))
+        busy.start()
+        time.sleep(0.2)
+        start = time.monotonic()
+        # The only worker is busy for 2 s; this call used to wait for it with no limit
+        with pytest.raises(MCPTimeoutError):
+            pool.call("tools/call", _params("https://w.amazon.com/bin/view/Other"), timeout=0.5)
+        assert time.monotonic() - start < 1.5
+        busy.join()
+
+
+def test_worker_survives_a_call_that_timed_out_in_the_queue(fake_server):
+    fake_server(latency_ms=1000)
+    with MCPSessionPool(size=1) as pool:
+        pool.call("initialize", {}, timeout=10)
+        busy = threading.Thread(target=lambda: pool.call("tools/call", _params(), timeout=10))
+        busy.start()
+        time.sleep(0.1)
+        with pytest.raises(MCPTimeoutError):
+            pool.call("tools/call", _params(), timeout=0.3)
+        busy.join()
+        assert pool.restarts == 0
+        assert pool.call("tools/call", _params(), timeout=10)["result"]["content"]
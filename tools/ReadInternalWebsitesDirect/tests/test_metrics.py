@@ -0,0 +1,155 @@
+"""Tests for metrics.py and the --metrics CLI option."""
+
+import json
+import re
+
+import pytest
+
+import metrics
+from metrics import MetricsRegistry, PhaseTimer
+
+URLS = [f"https://w.amazon.com/bin/view/Page{i}" for i in range(3)]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A perf_counter that only moves when told to."""
+    now = [100.0]
+    monkeypatch.setattr(metrics.time, "perf_counter", lambda: now[0])
+    return now
+
+
+def _result(url, success=True, total_ms=100.0, error_code=None, attempts=1, **phases):
+    result = {"url": url, "success": success, "metadata": {"timings_ms": dict(phases, total=total_ms)}}
+    if attempts > 1:
+        result["metadata"]["attempts"] = attempts
+    if error_code:
+        result["error_code"] = error_code
+    return result
+
+
+def test_phase_marks_accumulate_in_pipeline_order(clock):
+    timer = PhaseTimer()
+    clock[0] += 0.5
+    timer.mark("read")
+    clock[0] += 0.25
+    timer.mark("spawn")
+    clock[0] += 0.25
+    timer.mark("read")
+    fork = timer.fork()
+    clock[0] += 1
+    fork.mark("detect")
+    assert list(timer.as_ms()) == ["spawn", "read", "total"]
+    assert timer.as_ms() == {"spawn": 250.0, "read": 750.0, "total": 2000.0}
+    # A fork keeps the phases so far and the request's start
+    assert fork.as_ms() == {"spawn": 250.0, "read": 750.0, "detect": 1000.0, "total": 2000.0}
+
+
+def test_summary_and_json_export():
+    registry = MetricsRegistry()
+    for ms in (10, 20, 30, 40):
+        registry.observe(_result("https://A.amazon.com/x", total_ms=ms, read=ms / 2))
+    registry.observe(_result("https://b.amazon.com/y", success=False, error_code="TIMEOUT", attempts=3))
+    registry.observe({"url": "https://b.amazon.com/z", "success": False, "error_code": "CIRCUIT_OPEN"})
+
+    summary = registry.summary()
+    a = summary["hosts"]["a.amazon.com"]
+    assert (a["fetches"], a["succeeded"], a["failed"]) == (4, 4, 0)
+    assert a["latency_ms"] == {"p50": 20.0, "p95": 40.0, "p99": 40.0, "mean": 25.0, "max": 40.0}
+    assert a["phases_ms"] == {"read": 12.5}
+    b = summary["hosts"]["b.amazon.com"]
+    assert b["error_codes"] == {"CIRCUIT_OPEN": 1, "TIMEOUT": 1} and b["retries"] == 2
+    # The circuit-open result never reached builder-mcp, so it has no latency sample
+    assert b["latency_ms"]["max"] == 100.0 and b["latency_ms"]["mean"] == 100.0
+    assert summary["total"]["fetches"] == 6 and summary["total"]["failed"] == 2
+    assert json.loads(registry.to_json()) == summary
+
+    registry.reset()
+    assert registry.summary()["hosts"] == {}
+
+
+def _families(text):
+    """{family: type} from the TYPE lines, and the sample lines, of OpenMetrics text."""
+    families, samples = {}, []
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            families[name] = kind
+        elif not line.startswith("#"):
+            samples.append(line)
+    return families, samples
+
+
+def test_openmetrics_text():
+    registry = MetricsRegistry()
+    registry.observe(_result("https://a.amazon.com/x", total_ms=250, read=200, spawn=50))
+    registry.observe(_result('https://b.amazon.com/"y"', success=False, error_code='BAD "CODE"'))
+    text = registry.to_openmetrics()
+    assert text.endswith("\n# EOF\n") and text.count("# EOF") == 1
+
+    families, samples = _families(text)
+    assert families == {
+        "read_internal_website_fetches": "counter",
+        "read_internal_website_errors": "counter",
+        "read_internal_website_retries": "counter",
+        "read_internal_website_fetch_duration_seconds": "summary",
+        "read_internal_website_phase_seconds": "counter",
+    }
+    sample_re = re.compile(r'^([a-z_]+)\{([a-z_]+="(?:[^"\\]|\\.)*"(?:,[a-z_]+="(?:[^"\\]|\\.)*")*)\} (\S+)$')
+    for sample in samples:
+        name, _, value = sample_re.match(sample).groups()
+        float(value)
+        family = next(family for family in families if name.startswith(family))
+        # Counter samples end in _total; the family names never do
+        if families[family] == "counter":
+            assert name == family + "_total"
+        else:
+            assert name in (family, family + "_sum", family + "_count")
+    for family in families:
+        assert not family.endswith("_total")
+        if f"# UNIT {family} seconds" in text:
+            assert family.endswith("_seconds")
+
+    assert 'read_internal_website_fetch_duration_seconds{host="a.amazon.com",quantile="0.5"} 0.25' in samples
+    assert 'read_internal_website_phase_seconds_total{host="a.amazon.com",phase="spawn"} 0.05' in samples
+    assert 'read_internal_website_errors_total{host="b.amazon.com",error_code="BAD \\"CODE\\""} 1' in samples
+
+
+def test_fetch_marks_phases(client, fake_server):
+    timings = client.read_internal_website(URLS[0])["metadata"]["timings_ms"]
+    assert list(timings) == ["spawn", "first_byte", "read", "decode", "extract", "detect", "total"]
+    with client.MCPSessionPool(size=1) as pool:
+        timings = client.read_internal_website(URLS[0], pool=pool)["metadata"]["timings_ms"]
+    # A pool worker answers with one line, so there is no first_byte
+    assert "first_byte" not in timings and {"queue", "read", "total"} <= set(timings)
+
+
+@pytest.mark.parametrize("fmt", ["openmetrics", "json"])
+def test_metrics_cli(client, fake_server, tmp_path, monkeypatch, capsys, fmt):
+    fake_server(errors="mcp-error=0.5", seed=3)  # Page0 and Page1 fail
+    batch = tmp_path / "urls.txt"
+    batch.write_text("\n".join(URLS) + "\n")
+    path = tmp_path / "metrics.out"
+    monkeypatch.setattr("sys.argv", ["read_internal_website.py", "--batch", str(batch),
+                                     "--metrics", str(path), "--metrics-format", fmt])
+    try:
+        client.main()
+    finally:
+        client.disable_metrics()
+    results = json.loads(capsys.readouterr().out)
+    failed = sum(not result["success"] for result in results)
+    assert failed == 2
+
+    text = path.read_text()
+    if fmt == "json":
+        host = json.loads(text)["hosts"]["w.amazon.com"]
+        assert host["fetches"] == len(URLS) and host["failed"] == failed
+    else:
+        assert text.endswith("# EOF\n")
+        assert f'read_internal_website_fetches_total{{host="w.amazon.com",outcome="error"}} {failed}' in text
+
+
+def test_metrics_cli_needs_batch(client, monkeypatch):
+    monkeypatch.setattr("sys.argv", ["read_internal_website.py", URLS[0], "--metrics", "-"])
+    with pytest.raises(SystemExit):
+        client.main()
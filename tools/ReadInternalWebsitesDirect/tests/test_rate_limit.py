@@ -0,0 +1,57 @@
+"""Tests for rate_limit.py."""
+
+import asyncio
+
+import pytest
+
+from rate_limit import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("rate_limit.time.monotonic", lambda: now[0])
+    return now
+
+
+def test_rules_match_most_specific_domain():
+    limiter = RateLimiter({"amazon.com": (10, 10), "code.amazon.com": (2, 4)}, default=(1, 1))
+    assert limiter.rate_for("code.amazon.com") == (2.0, 4.0)
+    assert limiter.rate_for("CR.Code.Amazon.com") == (2.0, 4.0)
+    assert limiter.rate_for("w.amazon.com") == (10.0, 10.0)
+    assert limiter.rate_for("example.org") == (1.0, 1.0)
+    assert RateLimiter().rate_for("example.org") is None
+    with pytest.raises(ValueError):
+        RateLimiter({"a": (0, 1)})
+    with pytest.raises(ValueError):
+        RateLimiter(default=(1, 0.5))
+
+
+def test_burst_then_refill(clock):
+    limiter = RateLimiter({"a.com": (2, 3)})
+    assert [limiter.reserve("a.com") for _ in range(3)] == [0, 0, 0]
+    # The bucket goes into debt: each caller waits for its own token
+    assert limiter.reserve("a.com") == pytest.approx(0.5)
+    assert limiter.reserve("a.com") == pytest.approx(1.0)
+    clock[0] += 10
+    # Refilled, but never beyond the burst
+    assert [limiter.reserve("a.com") for _ in range(3)] == [0, 0, 0]
+    assert limiter.reserve("a.com") == pytest.approx(0.5)
+    assert limiter.reserve("b.com") == 0     # unlimited host
+
+
+def test_buckets_are_per_host(clock):
+    limiter = RateLimiter(default=(1, 1))
+    assert limiter.reserve("a.com") == 0
+    assert limiter.reserve("b.com") == 0
+    assert limiter.reserve("a.com") == pytest.approx(1.0)
+
+
+def test_acquire_and_aacquire_sleep_for_the_debt(monkeypatch):
+    slept = []
+    monkeypatch.setattr("rate_limit.time.sleep", slept.append)
+    limiter = RateLimiter(default=(100, 1))
+    assert limiter.acquire("a.com") == 0
+    assert limiter.acquire("a.com") > 0 and len(slept) == 1
+    waited = asyncio.run(limiter.aacquire("a.com"))
+    assert 0 < waited <= 0.03
@@ -0,0 +1,102 @@
+"""Tests for resilience.py and the client's retry and circuit breaker paths."""
+
+import pytest
+
+from resilience import CircuitBreaker, RetryPolicy
+
+FAILED = {"success": False, "error_code": "TIMEOUT"}
+NOT_FOUND = {"success": False, "error_code": "NOT_FOUND"}
+OK = {"success": True}
+
+
+@pytest.fixture
+def resilient(client, fake_server):
+    yield client
+    client.disable_retries()
+    client.disable_circuit_breaker()
+
+
+def test_should_retry_only_retryable_codes_within_attempts():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.should_retry(FAILED, 1) and policy.should_retry(FAILED, 2)
+    assert not policy.should_retry(FAILED, 3)
+    assert not policy.should_retry(NOT_FOUND, 1)
+    assert not policy.should_retry(OK, 1)
+    assert RetryPolicy(retry_on={"NOT_FOUND"}).should_retry(NOT_FOUND, 1)
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+def test_backoff_is_jittered_under_a_capped_ceiling():
+    policy = RetryPolicy(base_delay=0.5, max_delay=2)
+    for attempts, ceiling in ((1, 0.5), (2, 1.0), (3, 2.0), (10, 2.0)):
+        delays = [policy.backoff(attempts) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert max(delays) > ceiling / 2
+    assert RetryPolicy(deadline=1).allows(0.5, 0.4)
+    assert not RetryPolicy(deadline=1).allows(0.5, 0.6)
+    assert RetryPolicy().allows(1e9, 1e9)
+
+
+def test_circuit_opens_after_threshold_and_success_resets():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record("a", FAILED)
+    breaker.record("a", OK)                 # a success resets the count
+    breaker.record("a", FAILED)
+    breaker.record("a", NOT_FOUND)          # so does any answer that is not a host failure
+    breaker.record("a", FAILED)
+    assert breaker.allow("a") and breaker.state("a") == "closed"
+    breaker.record("a", FAILED)
+    assert not breaker.allow("a") and breaker.state("a") == "open"
+    assert 59 < breaker.retry_after("a") <= 60
+    assert breaker.allow("b") and breaker.retry_after("b") == 0
+
+
+def test_half_open_admits_one_probe(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("resilience.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record("a", FAILED)
+    now[0] += 30
+    assert breaker.state("a") == "half-open"
+    assert breaker.allow("a")               # the probe
+    assert not breaker.allow("a")           # everyone else waits for it
+    breaker.record("a", FAILED)             # a failed probe re-opens at once
+    assert breaker.state("a") == "open"
+    now[0] += 30
+    assert breaker.allow("a")
+    breaker.record("a", OK)
+    assert breaker.state("a") == "closed" and breaker.allow("a")
+
+
+def test_unreported_probe_is_given_up(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("resilience.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record("a", FAILED)
+    now[0] += 30
+    assert breaker.allow("a")               # probe cancelled, never records
+    now[0] += 29
+    assert not breaker.allow("a")
+    now[0] += 1
+    assert breaker.allow("a")
+
+
+def test_client_retries_until_attempts_run_out(resilient, fake_server):
+    fake_server(errors="mcp-error=1")
+    resilient.enable_retries(max_attempts=3, base_delay=0.01)
+    result = resilient.read_internal_website("https://w.amazon.com/bin/view/Broken")
+    assert result["error_code"] == "MCP_ERROR"
+    assert result["metadata"]["attempts"] == 3
+    assert result["metadata"]["backoff_ms"] <= 30
+
+
+def test_client_fails_fast_with_circuit_open(resilient, fake_server):
+    fake_server(errors="mcp-error=1")
+    resilient.enable_circuit_breaker(failure_threshold=2, reset_timeout=60)
+    urls = [f"https://w.amazon.com/bin/view/Broken{i}" for i in range(4)]
+    codes = [resilient.read_internal_website(url)["error_code"] for url in urls]
+    assert codes == ["MCP_ERROR", "MCP_ERROR", "CIRCUIT_OPEN", "CIRCUIT_OPEN"]
+    # Other hosts are unaffected
+    fake_server()
+    assert resilient.is_success(resilient.read_internal_website("https://phonetool.amazon.com/users/someone"))
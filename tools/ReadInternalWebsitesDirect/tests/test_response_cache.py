@@ -0,0 +1,87 @@
+"""Tests for response_cache.py and the client's use of it."""
+
+import time
+
+import pytest
+
+from response_cache import ResponseCache
+
+URLS = [f"https://w.amazon.com/bin/view/Page{i}" for i in range(3)]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60, domain_ttls={"amazon.com": 120, "w.amazon.com": 1})
+    yield cache
+    cache.close()
+
+
+def _result(content):
+    return {"success": True, "url": "u", "content": content, "content_type": "text", "metadata": {}}
+
+
+def test_put_get_and_revalidate(cache):
+    assert cache.get("k") is None
+    assert cache.put("k", _result("a")) is False
+    result, age, tier = cache.get("k")
+    assert result["content"] == "a" and tier == "memory" and age >= 0
+    assert cache.put("k", _result("a")) is True     # unchanged content only refreshes the entry
+    assert cache.put("k", _result("b")) is False
+
+
+def test_disk_tier_and_copies(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    cache.put("k", _result({"rows": [1]}))
+    cache.get("k")[0]["content"]["rows"].append(2)  # callers get copies
+    cache.close()
+    reopened = ResponseCache(str(tmp_path), ttl=60)
+    result, _, tier = reopened.get("k")
+    assert tier == "disk" and result["content"] == {"rows": [1]}
+    reopened.close()
+
+
+def test_domain_ttls_match_most_specific_suffix(cache):
+    assert cache.ttl_for("https://w.amazon.com/x") == 1
+    assert cache.ttl_for("https://phonetool.amazon.com/x") == 120
+    assert cache.ttl_for("https://example.org/x") == 60
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=0.05)
+    cache.put("k", _result("a"))
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    cache.close()
+
+
+def test_eviction_keeps_disk_tier_under_budget(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60, max_bytes=4096, memory_entries=1)
+    for i in range(20):
+        cache.put(f"k{i}", _result("x" * 1000))
+    assert cache._total_bytes <= 4096
+    assert cache.get("k19") is not None and cache.get("k0") is None
+    cache.close()
+
+
+def test_lazy_results_are_cached_without_decoding(client, fake_server, cache):
+    results = client.read_internal_websites(URLS, cache=cache, lazy=True)
+    assert all(isinstance(result, client.LazyResult) for result in results)
+    # Caching checked success only; the content is still undecoded
+    assert all(result._stage < 2 for result in results)
+
+    hit = client.read_internal_website(URLS[0], cache=cache, lazy=True)
+    assert isinstance(hit, client.LazyResult) and hit["metadata"]["cache"]["hit"]
+    assert hit._stage < 2
+
+    eager = client.read_internal_website(URLS[1], cache=cache)
+    assert type(eager) is dict and eager["metadata"]["cache"]["hit"]
+    fresh = client.read_internal_website(URLS[1])
+    assert eager["content"] == fresh["content"] and eager["content_type"] == fresh["content_type"]
+    assert hit["content"] == client.read_internal_website(URLS[0])["content"]
+
+
+def test_failures_are_not_cached(client, fake_server, cache):
+    fake_server(errors="mcp-error=1")
+    result = client.read_internal_website(URLS[0], cache=cache)
+    assert not client.is_success(result)
+    assert cache.get(client.normalize_url(URLS[0])) is None
@@ -0,0 +1,76 @@
+"""Tests for the team review fetch paths against fake_builder_mcp.py."""
+
+import json
+
+import pytest
+
+USERS = ["alice", "bob"]
+LISTS = ("to-user", "from-user")
+FAILED_URL = "https://code.amazon.com/reviews/from-user/bob"
+
+
+@pytest.fixture
+def reviews(fake_server):
+    # Every page is the same three-CR table; with this seed only bob's from-user list fails
+    fake_server(content_mix="cr-table", errors="mcp-error=0.3", seed=2)
+
+
+def _roles(records):
+    return {record["ID"]: {user: sorted(roles) for user, roles in record["roles"].items()} for record in records}
+
+
+EXPECTED_ROLES = {f"CR-{i}": {"alice": ["author", "reviewer"], "bob": ["reviewer"]} for i in range(3)}
+
+
+def test_iter_team_reviews_merges_as_pages_arrive(client, reviews):
+    merger = client.CRMerger()
+    pages = list(client.iter_team_reviews(USERS, LISTS, merger=merger))
+    assert len(pages) == 4
+    failed = [(user, result) for user, result, _ in pages if not client.is_success(result)]
+    assert [(user, result["url"], result["error_code"]) for user, result in failed] == [
+        ("bob", FAILED_URL, "MCP_ERROR")]
+    # The first page adds all three CRs; each later page gives each of them a role
+    assert [len(records) for _, result, records in pages if client.is_success(result)] == [3, 3, 3]
+    assert _roles(merger.records) == EXPECTED_ROLES
+    assert merger.records[0]["Author"] == "user0"
+
+
+def test_fetch_team_reviews_reports_failed_lists(client, reviews):
+    team = client.fetch_team_reviews(USERS, LISTS, max_workers=2)
+    assert _roles(team["crs"]) == EXPECTED_ROLES
+    assert [(error["user"], error["url"]) for error in team["errors"]] == [("bob", FAILED_URL)]
+
+
+def _main(client, monkeypatch, *args):
+    monkeypatch.setattr("sys.argv", ["read_internal_website.py", "--team-reviews", "alice",
+                                     "--team-reviews", "bob", "--review-lists", ",".join(LISTS), *args])
+    client.main()
+
+
+def test_team_reviews_cli_json(client, reviews, monkeypatch, capsys):
+    _main(client, monkeypatch)
+    captured = capsys.readouterr()
+    output = json.loads(captured.out)
+    assert _roles(output["crs"]) == EXPECTED_ROLES
+    assert [error["url"] for error in output["errors"]] == [FAILED_URL]
+    assert "3/4 review lists fetched, 3 unique CRs" in captured.err
+
+
+def test_team_reviews_cli_jsonl_and_text(client, reviews, monkeypatch, capsys):
+    _main(client, monkeypatch, "--format", "jsonl")
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    # A CR is written again whenever another list adds a role; the last line per CR is complete
+    assert len(records) == 9
+    assert _roles({record["ID"]: record for record in records}.values()) == EXPECTED_ROLES
+
+    _main(client, monkeypatch, "--format", "text")
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split("\t")[0] for line in lines] == ["CR-0", "CR-1", "CR-2"]
+    assert "alice (" in lines[0] and "bob (reviewer)" in lines[0]
+
+
+def test_team_reviews_cli_rejects_unknown_list(client, monkeypatch):
+    monkeypatch.setattr("sys.argv", ["read_internal_website.py", "--team-reviews", "alice",
+                                     "--review-lists", "cc-user"])
+    with pytest.raises(SystemExit):
+        client.main()